@@ -0,0 +1,64 @@
+"""add sync updated_at and tombstones
+
+Revision ID: 3a6c8e0f5b12
+Revises: 7d2f4a91c6b8
+Create Date: 2026-10-17 15:11:52.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a6c8e0f5b12'
+down_revision: Union[str, Sequence[str], None] = '7d2f4a91c6b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNC_TABLES = ('issues', 'comments', 'activities', 'notifications')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in SYNC_TABLES:
+        # server_default sirf existing rows ke liye, phir created_at se backfill
+        op.add_column(
+            table,
+            sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+        op.execute(f"UPDATE {table} SET updated_at = created_at WHERE created_at IS NOT NULL")
+        op.alter_column(table, 'updated_at', server_default=None)
+        op.create_index(op.f(f'ix_{table}_updated_at'), table, ['updated_at'], unique=False)
+
+    op.create_table(
+        'sync_tombstones',
+        sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.UUID(), nullable=False),
+        sa.Column('topics', postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_sync_tombstones_deleted_at'), 'sync_tombstones', ['deleted_at'], unique=False
+    )
+    op.create_index(
+        'ix_sync_tombstones_topics',
+        'sync_tombstones',
+        ['topics'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sync_tombstones_topics', table_name='sync_tombstones')
+    op.drop_index(op.f('ix_sync_tombstones_deleted_at'), table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+    for table in reversed(SYNC_TABLES):
+        op.drop_index(op.f(f'ix_{table}_updated_at'), table_name=table)
+        op.drop_column(table, 'updated_at')
@@ -0,0 +1,59 @@
+"""add issue full text search
+
+Revision ID: 4b7e2c9d1a3f
+Revises: 29039e1d5c5c
+Create Date: 2026-10-17 10:12:41.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2c9d1a3f'
+down_revision: Union[str, Sequence[str], None] = '29039e1d5c5c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Generated tsvector: title (A) ranks above description (B)
+    op.add_column(
+        'issues',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_issues_search_vector',
+        'issues',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+    # Expression index for optional comment search
+    op.create_index(
+        'ix_comments_content_fts',
+        'comments',
+        [sa.text("to_tsvector('english'::regconfig, content)")],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comments_content_fts', table_name='comments')
+    op.drop_index('ix_issues_search_vector', table_name='issues')
+    op.drop_column('issues', 'search_vector')
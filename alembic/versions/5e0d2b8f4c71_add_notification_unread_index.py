@@ -0,0 +1,34 @@
+"""add notification unread index
+
+Revision ID: 5e0d2b8f4c71
+Revises: b4e19c7a2d60
+Create Date: 2026-10-17 17:05:33.472019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0d2b8f4c71'
+down_revision: Union[str, Sequence[str], None] = 'b4e19c7a2d60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_notifications_user_unread',
+        'notifications',
+        ['user_id'],
+        unique=False,
+        postgresql_where=sa.text('read = false'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_user_unread', table_name='notifications')
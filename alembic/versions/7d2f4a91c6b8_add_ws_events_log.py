@@ -0,0 +1,48 @@
+"""add ws events log
+
+Revision ID: 7d2f4a91c6b8
+Revises: e5a9d3b7f210
+Create Date: 2026-10-17 14:02:41.318274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2f4a91c6b8'
+down_revision: Union[str, Sequence[str], None] = 'e5a9d3b7f210'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'ws_events',
+        sa.Column('seq', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+        sa.Column('topics', postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('seq'),
+    )
+    op.create_index(
+        op.f('ix_ws_events_created_at'), 'ws_events', ['created_at'], unique=False
+    )
+    op.create_index(
+        'ix_ws_events_topics',
+        'ws_events',
+        ['topics'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ws_events_topics', table_name='ws_events')
+    op.drop_index(op.f('ix_ws_events_created_at'), table_name='ws_events')
+    op.drop_table('ws_events')
@@ -0,0 +1,65 @@
+"""notification retention indexes and archive
+
+Revision ID: 9c3f7e21ab45
+Revises: 5e0d2b8f4c71
+Create Date: 2026-10-17 17:48:19.226830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3f7e21ab45'
+down_revision: Union[str, Sequence[str], None] = '5e0d2b8f4c71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_notifications_user_created',
+        'notifications',
+        ['user_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_notifications_read_created',
+        'notifications',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text('read = true'),
+    )
+    op.create_table(
+        'notifications_archive',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('message', sa.String(length=1000), nullable=False),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('issue_id', sa.UUID(), nullable=True),
+        sa.Column('read', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_notifications_archive_user_id'),
+        'notifications_archive',
+        ['user_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f('ix_notifications_archive_user_id'), table_name='notifications_archive'
+    )
+    op.drop_table('notifications_archive')
+    op.drop_index('ix_notifications_read_created', table_name='notifications')
+    op.drop_index('ix_notifications_user_created', table_name='notifications')
@@ -0,0 +1,57 @@
+"""add foreign key and filter indexes
+
+Revision ID: a7c4e9b2d318
+Revises: f1a8c3d5e9b7
+Create Date: 2026-10-17 18:41:07.662914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e9b2d318'
+down_revision: Union[str, Sequence[str], None] = 'f1a8c3d5e9b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial WHERE)
+# notifications.user_id: ix_notifications_user_created (9c3f7e21ab45) already leads with it
+INDEXES = [
+    ('ix_issues_team_created', 'issues', ['team_id', 'created_at', 'id'], None),
+    ('ix_issues_project_created', 'issues', ['project_id', 'created_at', 'id'], None),
+    ('ix_issues_assignee_created', 'issues', ['assignee_id', 'created_at', 'id'], None),
+    ('ix_issues_creator_created', 'issues', ['creator_id', 'created_at', 'id'], None),
+    ('ix_issues_cycle_id', 'issues', ['cycle_id'], 'cycle_id IS NOT NULL'),
+    ('ix_issues_parent_id', 'issues', ['parent_id'], 'parent_id IS NOT NULL'),
+    ('ix_comments_issue_created', 'comments', ['issue_id', 'created_at'], None),
+    ('ix_activities_issue_created', 'activities', ['issue_id', 'created_at'], None),
+    ('ix_attachments_issue_id', 'attachments', ['issue_id'], None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY: live tables pe writes block nahi hote (transaction ke bahar chalta hai)
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,55 @@
+"""spread issue stats counters across slots
+
+Revision ID: b6e2d8f1c943
+Revises: a7c4e9b2d318
+Create Date: 2026-10-17 21:05:32.184926
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2d8f1c943'
+down_revision: Union[str, Sequence[str], None] = 'a7c4e9b2d318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing counters slot 0 mein rehte hain
+    op.add_column(
+        'issue_stats',
+        sa.Column('slot', sa.SmallInteger(), server_default='0', nullable=False),
+    )
+    op.drop_constraint('issue_stats_pkey', 'issue_stats', type_='primary')
+    op.create_primary_key(
+        'issue_stats_pkey', 'issue_stats', ['scope', 'dimension', 'value', 'slot']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Slots ko wapas ek row per counter mein sum karo
+    op.execute(
+        """
+        CREATE TEMP TABLE issue_stats_summed AS
+        SELECT scope, dimension, value, sum(count)::bigint AS count
+        FROM issue_stats
+        GROUP BY scope, dimension, value
+        """
+    )
+    op.execute("DELETE FROM issue_stats")
+    op.drop_constraint('issue_stats_pkey', 'issue_stats', type_='primary')
+    op.drop_column('issue_stats', 'slot')
+    op.create_primary_key(
+        'issue_stats_pkey', 'issue_stats', ['scope', 'dimension', 'value']
+    )
+    op.execute(
+        "INSERT INTO issue_stats (scope, dimension, value, count) "
+        "SELECT scope, dimension, value, count FROM issue_stats_summed"
+    )
+    op.execute("DROP TABLE issue_stats_summed")
@@ -0,0 +1,36 @@
+"""add issue title trigram index
+
+Revision ID: c81f5a06e2d4
+Revises: 4b7e2c9d1a3f
+Create Date: 2026-10-17 11:03:27.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f5a06e2d4'
+down_revision: Union[str, Sequence[str], None] = '4b7e2c9d1a3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_issues_title_trgm',
+        'issues',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_issues_title_trgm', table_name='issues')
+    # Extension ko chhod do - dusre objects use kar sakte hain
@@ -0,0 +1,32 @@
+"""add user token version
+
+Revision ID: e5a9d3b7f210
+Revises: c81f5a06e2d4
+Create Date: 2026-10-17 12:20:09.664815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9d3b7f210'
+down_revision: Union[str, Sequence[str], None] = 'c81f5a06e2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # server_default='0' existing rows ke liye
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
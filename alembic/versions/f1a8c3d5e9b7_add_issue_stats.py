@@ -0,0 +1,58 @@
+"""add issue stats counters
+
+Revision ID: f1a8c3d5e9b7
+Revises: 9c3f7e21ab45
+Create Date: 2026-10-17 18:12:40.518377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a8c3d5e9b7'
+down_revision: Union[str, Sequence[str], None] = '9c3f7e21ab45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'issue_stats',
+        sa.Column('scope', sa.String(length=80), nullable=False),
+        sa.Column('dimension', sa.String(length=20), nullable=False),
+        sa.Column('value', sa.String(length=50), nullable=False),
+        sa.Column('count', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'dimension', 'value'),
+    )
+    # Backfill - same aggregates as crud.issue_stats.rebuild
+    op.execute(
+        """
+        INSERT INTO issue_stats (scope, dimension, value, count)
+        SELECT scope, dimension, value, count(*)
+        FROM (
+            SELECT s.scope, d.dimension, d.value
+            FROM issues i
+            CROSS JOIN LATERAL (VALUES
+                ('all'),
+                ('team:' || i.team_id::text),
+                ('creator:' || i.creator_id::text)
+            ) AS s(scope)
+            CROSS JOIN LATERAL (VALUES
+                ('total', ''),
+                ('status', i.status),
+                ('priority', i.priority::text)
+            ) AS d(dimension, value)
+            WHERE s.scope IS NOT NULL AND d.value IS NOT NULL
+        ) AS keys
+        GROUP BY scope, dimension, value
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('issue_stats')
@@ -17,6 +17,7 @@ from app.routers import (
     websocket,
     cycle,
     notification,
+    sync,
 )
 
 # Create V1 API router
@@ -34,3 +35,4 @@ api_router.include_router(dashboard.router, tags=["V1 - Dashboard"])
 api_router.include_router(cycle.router, tags=["V1 - Cycles"])
 api_router.include_router(websocket.router, tags=["V1 - WebSocket"])
 api_router.include_router(notification.router, prefix="/notifications", tags=["V1 - Notifications"])
+api_router.include_router(sync.router, tags=["V1 - Sync"])
@@ -1,91 +1,363 @@
-from typing import Dict, List, Optional
+import asyncio
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 
+from dotenv import load_dotenv
 from fastapi import WebSocket
 
+from app.lib.event_bus import event_bus
+from app.lib.event_log import ALL_TOPICS, LoggedEvent, event_log
+from app.lib.ws_frames import OutboundMessage, encode_counts
+
+load_dotenv()
+
+# Per-connection send queue (slow clients broadcaster ko block nahi karte)
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "100"))
+# Queue full hone pe kya karein: drop_oldest | drop_newest | disconnect
+WS_SLOW_CONSUMER_POLICY = os.getenv("WS_SLOW_CONSUMER_POLICY", "drop_oldest")
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "5"))  # seconds per send
+
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "drop_newest", "disconnect")
+if WS_SLOW_CONSUMER_POLICY not in SLOW_CONSUMER_POLICIES:
+    raise ValueError(
+        f"WS_SLOW_CONSUMER_POLICY must be one of {SLOW_CONSUMER_POLICIES}"
+    )
+
+# Policy se disconnect hone pe close code (1013 = Try Again Later)
+WS_CLOSE_SLOW_CONSUMER = 1013
+
+
+class ClientConnection:
+    """
+    One socket + its bounded send queue, drained by a dedicated task.
+    enqueue() never awaits, so broadcasting costs O(1) per socket for the caller.
+    Queue mein shared OutboundMessage jaata hai; frame client ke `encoding`
+    ke hisaab se ek hi baar encode hota hai aur sab recipients reuse karte hain.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        on_close: Callable[["ClientConnection"], None],
+        max_queue: int = WS_SEND_QUEUE_SIZE,
+        policy: str = WS_SLOW_CONSUMER_POLICY,
+        encoding: str = "json",
+    ):
+        self.websocket = websocket
+        self.policy = policy
+        self.encoding = encoding
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.closed = False
+        self.topics: Set[str] = set()
+        self._on_close = on_close
+        self._task = asyncio.create_task(self._drain())
+
+    def enqueue(self, message: OutboundMessage) -> bool:
+        """Returns False agar message drop hua ya connection band ho gaya"""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        if self.policy == "drop_oldest":
+            self.queue.get_nowait()
+            self.queue.put_nowait(message)
+            self.dropped += 1
+            return True
+
+        self.dropped += 1
+        if self.policy == "disconnect":
+            print(f"⚠️ Slow WS consumer disconnected ({self.dropped} dropped)")
+            self.close(code=WS_CLOSE_SLOW_CONSUMER)
+        return False
+
+    async def _drain(self):
+        try:
+            while True:
+                message = await self.queue.get()
+                frame = message.frame(self.encoding)
+                if isinstance(frame, str):
+                    send = self.websocket.send_text(frame)
+                else:
+                    send = self.websocket.send_bytes(frame)
+                await asyncio.wait_for(send, timeout=WS_SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            pass
+        except asyncio.TimeoutError:
+            print("❌ WS send timed out, closing slow client")
+            asyncio.create_task(self._close_socket(WS_CLOSE_SLOW_CONSUMER))
+        except Exception as e:
+            print(f"❌ Failed to send to client: {e}")
+        finally:
+            self.closed = True
+            self._on_close(self)
+
+    def close(self, code: Optional[int] = None):
+        """Drain task band karo; code diya hai toh socket bhi close karo"""
+        if self.closed:
+            return
+        self.closed = True
+        self._task.cancel()
+        if code is not None:
+            asyncio.create_task(self._close_socket(code))
+
+    async def _close_socket(self, code: int):
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass  # Already closed
+
+
+def team_topic(team_id) -> str:
+    return f"team:{team_id}"
+
+
+def project_topic(project_id) -> str:
+    return f"project:{project_id}"
+
+
+def issue_topic(issue_id) -> str:
+    return f"issue:{issue_id}"
+
+
+def user_topic(user_id) -> str:
+    return f"user:{user_id}"
+
+
+TOPIC_KINDS = ("team", "project", "issue", "user")
+
+
+def topics_for_issue(issue) -> List[str]:
+    """Issue event kin topics pe jayega: team, project, issue, creator/assignee inbox"""
+    topics = [issue_topic(issue.id)]
+    if issue.team_id:
+        topics.append(team_topic(issue.team_id))
+    if issue.project_id:
+        topics.append(project_topic(issue.project_id))
+    if issue.creator_id:
+        topics.append(user_topic(issue.creator_id))
+    if issue.assignee_id:
+        topics.append(user_topic(issue.assignee_id))
+    return topics
+
 
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[UUID, List[WebSocket]] = {}
-        self.admin_connections: List[WebSocket] = []
+    """
+    Topic-based fan-out. Har socket kuch topics subscribe karta hai
+    (team:<id>, project:<id>, issue:<id>, user:<id>) aur event sirf un
+    topics ke subscribers ko jaata hai. Global admins sab kuch receive karte hain.
+    """
 
-    async def connect(self, team_id: UUID, websocket: WebSocket):
-        await websocket.accept()
-        self.register(team_id, websocket)
+    def __init__(self):
+        # topic -> {websocket: ClientConnection}
+        self.subscriptions: Dict[str, Dict[WebSocket, ClientConnection]] = {}
+        # websocket -> ClientConnection (non-admin)
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+        self.admin_connections: Dict[WebSocket, ClientConnection] = {}
 
-    def register(self, team_id: UUID, websocket: WebSocket):
+    def register(
+        self, websocket: WebSocket, topics: Iterable[str] = (), encoding: str = "json"
+    ) -> ClientConnection:
         """Register a connection without accepting (assumes already accepted)"""
-        self.active_connections.setdefault(team_id, []).append(websocket)
-
-    def register_admin(self, websocket: WebSocket):
-        """Register a global admin connection"""
-        self.admin_connections.append(websocket)
-
-    def disconnect(self, team_id: UUID, websocket: WebSocket):
-        # Use simple get, then remove. guarding against non-existence
-        connections = self.active_connections.get(team_id)
-        if connections and websocket in connections:
-            connections.remove(websocket)
-            # Cleanup Refactor: Remove key if empty (Pro Standard)
-            if not connections:
-                del self.active_connections[team_id]
-
-    def disconnect_admin(self, websocket: WebSocket):
-        if websocket in self.admin_connections:
-            self.admin_connections.remove(websocket)
-
-    async def broadcast(self, team_id: UUID, message: str):
-        team_count = 0
-        admin_count = 0
-
-        # 1. Send to Team Members
-        if team_id in self.active_connections:
-            # Iterate copy to allow modification if needed
-            for connection in list(self.active_connections[team_id]):
-                try:
-                    await connection.send_text(message)
-                    team_count += 1
-                except Exception as e:
-                    print(f"❌ Failed to send to team member: {e}")
-                    self.disconnect(team_id, connection)
-
-        # 2. Send to Global Admins
-        for connection in list(self.admin_connections):
-            try:
-                await connection.send_text(message)
-                admin_count += 1
-            except Exception as e:
-                print(f"❌ Failed to send to admin: {e}")
-                self.disconnect_admin(connection)
+        client = ClientConnection(
+            websocket, on_close=lambda c: self.disconnect(c.websocket), encoding=encoding
+        )
+        self.clients[websocket] = client
+        self.subscribe(websocket, topics)
+        return client
+
+    def register_admin(
+        self, websocket: WebSocket, encoding: str = "json"
+    ) -> ClientConnection:
+        """Register a global admin connection (receives every topic)"""
+        client = ClientConnection(
+            websocket, on_close=lambda c: self.disconnect(c.websocket), encoding=encoding
+        )
+        self.admin_connections[websocket] = client
+        return client
+
+    def subscribe(self, websocket: WebSocket, topics: Iterable[str]) -> None:
+        client = self.clients.get(websocket)
+        if not client:
+            return
+        for topic in topics:
+            self.subscriptions.setdefault(topic, {})[websocket] = client
+            client.topics.add(topic)
+
+    def unsubscribe(self, websocket: WebSocket, topics: Iterable[str]) -> None:
+        client = self.clients.get(websocket)
+        if not client:
+            return
+        for topic in topics:
+            subscribers = self.subscriptions.get(topic)
+            if subscribers:
+                subscribers.pop(websocket, None)
+                # Cleanup Refactor: Remove key if empty (Pro Standard)
+                if not subscribers:
+                    del self.subscriptions[topic]
+            client.topics.discard(topic)
+
+    def disconnect(self, websocket: WebSocket):
+        # Idempotent: endpoint ka finally aur drain task dono call kar sakte hain
+        client = self.clients.get(websocket)
+        if client:
+            self.unsubscribe(websocket, list(client.topics))
+            del self.clients[websocket]
+            client.close()
+            return
+        admin = self.admin_connections.pop(websocket, None)
+        if admin:
+            admin.close()
+
+    def send_personal(self, websocket: WebSocket, data: dict) -> bool:
+        """Ek socket ko reply (same queue se, taaki sends concurrent na hon)"""
+        client = self.clients.get(websocket) or self.admin_connections.get(websocket)
+        return bool(client and client.enqueue(OutboundMessage(data)))
+
+    @staticmethod
+    def _fan_out(clients: Iterable[ClientConnection], message: OutboundMessage) -> int:
+        # Sirf enqueue - actual send har client ka drain task karta hai
+        return sum(1 for client in clients if client.enqueue(message))
+
+    # ------------------------------------------------------------------
+    # Cross-worker bus: local delivery turant, baaki workers bus se
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """App startup pe call karo - doosre workers ke events receive karo"""
+        await event_bus.start(self._on_bus_event)
+
+    async def stop(self):
+        await event_bus.stop()
+
+    def _on_bus_event(self, event: dict):
+        # Bus pe message already JSON text hai - dobara encode nahi karna
+        message = OutboundMessage.from_text(event["message"])
+        if event.get("seq") is not None:
+            event_log.record(event["seq"], event.get("topics", [ALL_TOPICS]), message)
+        if event.get("kind") == "topics":
+            self._deliver_topics(event["topics"], message)
+        elif event.get("kind") == "all":
+            self._deliver_all(message)
+
+    def _deliver_topics(
+        self, topics: Iterable[str], message: OutboundMessage
+    ) -> Tuple[int, int]:
+        # Ek socket kai topics pe ho sakta hai - message sirf ek baar bhejo
+        recipients: Dict[WebSocket, ClientConnection] = {}
+        for topic in topics:
+            recipients.update(self.subscriptions.get(topic, {}))
+        subscriber_count = self._fan_out(recipients.values(), message)
+        admin_count = self._fan_out(list(self.admin_connections.values()), message)
+        return subscriber_count, admin_count
+
+    def _deliver_all(self, message: OutboundMessage) -> int:
+        clients = list(self.clients.values()) + list(self.admin_connections.values())
+        return self._fan_out(clients, message)
+
+    async def _sequenced(
+        self, topics: List[str], data: dict
+    ) -> Tuple[Optional[int], OutboundMessage]:
+        """Event log mein likho aur payload mein `seq` daalo (resume ke liye)"""
+        seq = await event_log.append(topics, data)
+        if seq is None:
+            return None, OutboundMessage(data)
+        message = OutboundMessage({**data, "seq": seq})
+        event_log.record(seq, topics, message)
+        return seq, message
+
+    async def publish(self, topics: List[str], data: dict):
+        """Send to subscribers of any of `topics` (+ admins), on every worker"""
+        seq, message = await self._sequenced(topics, data)
+        subscriber_count, admin_count = self._deliver_topics(topics, message)
+        event_bus.publish(
+            {"kind": "topics", "topics": topics, "seq": seq, "message": message.text}
+        )
 
         print(
-            f"📤 Broadcast sent to {team_count} team members + {admin_count} admins for team {team_id}"
+            f"📤 Event queued for {subscriber_count} subscribers + {admin_count} admins ({len(topics)} topics)"
         )
 
-    async def broadcast_to_all(self, message: str):
-        """Broadcast to ALL connected users (team members + admins)"""
-        total_count = 0
-
-        # 1. Send to ALL team members across all teams
-        for team_id, connections in list(self.active_connections.items()):
-            for connection in list(connections):
-                try:
-                    await connection.send_text(message)
-                    total_count += 1
-                except Exception as e:
-                    print(f"❌ Failed to send to team member: {e}")
-                    self.disconnect(team_id, connection)
-
-        # 2. Send to Global Admins
-        for connection in list(self.admin_connections):
-            try:
-                await connection.send_text(message)
-                total_count += 1
-            except Exception as e:
-                print(f"❌ Failed to send to admin: {e}")
-                self.disconnect_admin(connection)
-
-        print(f"📤 Broadcast sent to {total_count} total users")
+    async def broadcast(self, team_id: UUID, data: dict):
+        """Send to one team's channel (+ admins)"""
+        await self.publish([team_topic(team_id)], data)
+
+    async def broadcast_to_all(self, data: dict):
+        """Broadcast to ALL connected users (team members + admins), on every worker"""
+        seq, message = await self._sequenced([ALL_TOPICS], data)
+        total_count = self._deliver_all(message)
+        event_bus.publish(
+            {"kind": "all", "topics": [ALL_TOPICS], "seq": seq, "message": message.text}
+        )
+
+        print(f"📤 Broadcast queued for {total_count} local users")
+
+    # ------------------------------------------------------------------
+    # Resume: reconnect pe missed events replay (seq > last_seq)
+    # ------------------------------------------------------------------
+
+    def resume(
+        self,
+        websocket: WebSocket,
+        last_seq: int,
+        backlog: Optional[List[LoggedEvent]],
+        topics: Optional[Iterable[str]],
+    ) -> int:
+        """
+        `backlog` = event_log.fetch_since() ka result (None = resync required).
+        Register ke turant baad bina await ke call karo, taaki replayed events
+        live events se pehle queue mein jaayein. Returns replayed count.
+        """
+        client = self.clients.get(websocket) or self.admin_connections.get(websocket)
+        if not client:
+            return 0
+
+        events = None
+        if backlog is not None:
+            cursor = backlog[-1].seq if backlog else last_seq
+            events = backlog + event_log.buffered_since(cursor, topics)
+            # Bounded queue mein fit nahi hota toh replay adhoora rahega - resync better
+            if len(events) > client.queue.maxsize - client.queue.qsize():
+                events = None
+
+        if events is None:
+            event_log.resyncs += 1
+            client.enqueue(
+                OutboundMessage(
+                    {"event": "RESYNC_REQUIRED", "latest_seq": event_log.latest_seq}
+                )
+            )
+            return 0
+
+        for event in events:
+            client.enqueue(event.message)
+        event_log.replayed += len(events)
+        return len(events)
+
+    def stats(self) -> dict:
+        all_clients = list(self.clients.values()) + list(
+            self.admin_connections.values()
+        )
+        return {
+            "connections": len(self.clients),
+            "admin_connections": len(self.admin_connections),
+            "topics": len(self.subscriptions),
+            "queued_messages": sum(c.queue.qsize() for c in all_clients),
+            "dropped_messages": sum(c.dropped for c in all_clients),
+            "policy": WS_SLOW_CONSUMER_POLICY,
+            "encodings": {
+                encoding: sum(1 for c in all_clients if c.encoding == encoding)
+                for encoding in encode_counts
+            },
+            "frames_encoded": dict(encode_counts),
+            "bus": event_bus.stats(),
+            "event_log": event_log.stats(),
+        }
 
 
 connection_manager = ConnectionManager()
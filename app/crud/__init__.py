@@ -5,6 +5,9 @@ from .issue import issue
 from .comment import comment
 from .attached import attachment
 from .crud_cycle import cycle
+from .sync import sync
+from .notification import notification
+from .issue_stats import issue_stats
 
 __all__ = [
     "user",
@@ -14,4 +17,7 @@ __all__ = [
     "comment",
     "attachment",
     "cycle",
+    "sync",
+    "notification",
+    "issue_stats",
 ]
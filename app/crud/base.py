@@ -1,12 +1,24 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
 from uuid import UUID
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import delete, insert, literal, select, tuple_, update
+from sqlalchemy.sql import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..lib.database import Base
+from ..pagination import InvalidCursorError
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -28,10 +40,59 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await db.execute(select(self.model).where(self.model.id == id))
         return result.scalars().first()
 
+    def _keyset_columns(self) -> list:
+        # (created_at, id) jahan created_at hai, warna sirf id
+        if hasattr(self.model, "created_at"):
+            return [self.model.created_at, self.model.id]
+        return [self.model.id]
+
+    def _paginate(
+        self,
+        query: Select,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[dict] = None,
+    ) -> Select:
+        """
+        Apply offset or keyset pagination to a query.
+
+        Args:
+            skip: Offset (ignored in cursor mode)
+            limit: Page size
+            cursor: Decoded cursor from app.pagination ({} = first page).
+                When given, rows are ordered newest first by (created_at, id)
+                and filtered with a row-value comparison instead of OFFSET.
+
+        Raises:
+            InvalidCursorError (ValueError): cursor ke keys is model ke keyset
+                columns se match nahi karte ya koi value null hai (e.g. users
+                listing ka cursor issues pe) - API 400 "Invalid cursor" deti hai.
+        """
+        if cursor is None:
+            return query.offset(skip).limit(limit)
+
+        columns = self._keyset_columns()
+        if cursor:
+            keys = {column.key for column in columns}
+            if set(cursor) != keys or any(cursor[key] is None for key in keys):
+                raise InvalidCursorError("Cursor does not match this listing")
+            position = [
+                literal(cursor[column.key], type_=column.type) for column in columns
+            ]
+            query = query.where(tuple_(*columns) < tuple_(*position))
+        return query.order_by(*(column.desc() for column in columns)).limit(limit)
+
     async def get_multi(
-        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[dict] = None,
     ) -> List[ModelType]:
-        result = await db.execute(select(self.model).offset(skip).limit(limit))
+        query = self._paginate(select(self.model), skip=skip, limit=limit, cursor=cursor)
+        result = await db.execute(query)
         return result.scalars().all()
 
     async def get_multi_by_owner(
@@ -42,6 +103,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         owner_field: str = "owner_id",
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[dict] = None,
     ) -> List[ModelType]:
         """
         Get multiple records filtered by owner field.
@@ -52,6 +114,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             owner_field: Name of the field to filter by (e.g., 'team_id', 'user_id')
             skip: Number of records to skip
             limit: Maximum number of records to return
+            cursor: Decoded keyset cursor (switches to cursor pagination)
         """
         if not hasattr(self.model, owner_field):
             raise ValueError(
@@ -59,20 +122,23 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             )
 
         filter_column = getattr(self.model, owner_field)
-        result = await db.execute(
-            select(self.model)
-            .where(filter_column == owner_id)
-            .offset(skip)
-            .limit(limit)
+        query = self._paginate(
+            select(self.model).where(filter_column == owner_id),
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
         )
+        result = await db.execute(query)
         return result.scalars().all()
 
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)  # type: ignore
-        db.add(db_obj)
+        # INSERT ... RETURNING: server defaults isi statement se, refresh SELECT nahi
+        result = await db.scalars(
+            insert(self.model).returning(self.model), [obj_in_data]
+        )
+        db_obj = result.one()
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
     async def update(
@@ -91,8 +157,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db.add(db_obj)
+        # expire_on_commit=False: UPDATE ke values (onupdate bhi) object pe hi hain
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
     async def remove(self, db: AsyncSession, *, id: UUID) -> Optional[ModelType]:
@@ -102,3 +168,105 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             await db.delete(obj)
             await db.commit()
         return obj
+
+    def _bulk_conditions(
+        self, ids: Optional[Sequence[UUID]], where: Optional[Dict[str, Any]]
+    ) -> list:
+        """ids and/or equality filters -> WHERE (dono khaali = error, poori table nahi)"""
+        if ids is None and not where:
+            raise ValueError("ids or where is required for bulk update/delete")
+        conditions = []
+        if ids is not None:
+            conditions.append(self.model.id.in_(ids))
+        for field, value in (where or {}).items():
+            if not hasattr(self.model, field):
+                raise ValueError(
+                    f"Model {self.model.__name__} has no attribute '{field}'"
+                )
+            conditions.append(getattr(self.model, field) == value)
+        return conditions
+
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        commit: bool = True,
+    ) -> List[ModelType]:
+        """
+        Multi-row INSERT ... RETURNING - saare rows ek round trip mein.
+
+        Args:
+            objs_in: Schemas or dicts (Python-side defaults har row pe lagte hain)
+            commit: False = caller ka transaction, caller commit/rollback karega
+        """
+        rows = [
+            obj if isinstance(obj, dict) else obj.model_dump() for obj in objs_in
+        ]
+        if not rows:
+            return []
+        result = await db.scalars(insert(self.model).returning(self.model), rows)
+        db_objs = result.all()
+        if commit:
+            await db.commit()
+        return db_objs
+
+    async def update_many(
+        self,
+        db: AsyncSession,
+        *,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        ids: Optional[Sequence[UUID]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        commit: bool = True,
+    ) -> List[ModelType]:
+        """
+        Set-based UPDATE ... WHERE id IN (ids) AND <where> RETURNING *.
+        Session mein loaded objects bhi RETURNING values se sync ho jaate hain.
+
+        Args:
+            obj_in: Same values for every matched row (schema: sirf set fields)
+            ids: Row ids to update
+            where: Equality filters by column name, e.g. {"team_id": ...}
+            commit: False = caller ka transaction
+        """
+        conditions = self._bulk_conditions(ids, where)
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        if not update_data or (ids is not None and not ids):
+            return []
+        result = await db.scalars(
+            update(self.model)
+            .where(*conditions)
+            .values(**update_data)
+            .returning(self.model)
+        )
+        db_objs = result.all()
+        if commit:
+            await db.commit()
+        return db_objs
+
+    async def remove_many(
+        self,
+        db: AsyncSession,
+        *,
+        ids: Optional[Sequence[UUID]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        commit: bool = True,
+    ) -> List[ModelType]:
+        """
+        Set-based DELETE ... RETURNING * (remove() ki tarah pehle SELECT nahi).
+        DB-level ondelete cascades lagte hain; ORM relationship cascades nahi.
+        """
+        conditions = self._bulk_conditions(ids, where)
+        if ids is not None and not ids:
+            return []
+        result = await db.scalars(
+            delete(self.model).where(*conditions).returning(self.model)
+        )
+        db_objs = result.all()
+        if commit:
+            await db.commit()
+        return db_objs
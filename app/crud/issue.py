@@ -1,25 +1,127 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
 from uuid import UUID
 import asyncio
-
-from sqlalchemy import select, or_, func
+import html
+import re
+
+from sqlalchemy import (
+    JSON,
+    and_,
+    select,
+    or_,
+    func,
+    exists,
+    literal,
+    literal_column,
+    true,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
 from app.crud.base import CRUDBase
 from app.model.issue import Issue
 from app.model.comment import Comment
 from app.model.activity import Activity
+from app.model.cycle import Cycle
+from app.model.project import Project
+from app.model.user import User
 from app.schemas.issue import (
     IssueCreate,
     IssueCreate as IssueUpdate,
+    IssuePriority,
+    IssueStatus,
 )  # Reuse schema for now
 
 
 from app.model.team import Team
 
+# Text search config - generated column aur indexes ke saath match hona chahiye
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+# ts_headline control-char markers lagata hai, HTML nahi: Python mein text escape
+# hota hai aur sirf markers <mark> bante hain (title/description ka HTML live nahi)
+MARK_START, MARK_END = "\x01", "\x02"
+HEADLINE_OPTIONS = f'StartSel="{MARK_START}", StopSel="{MARK_END}"'
+SNIPPET_OPTIONS = f"{HEADLINE_OPTIONS}, MaxWords=35, MinWords=15, MaxFragments=2"
+
+# Dashboard "open" issues inke alawa sab
+CLOSED_STATUSES = (IssueStatus.DONE.value, IssueStatus.CANCELED.value)
+
+# /issues/stats?dimension=... - optional extra breakdowns (name -> column)
+STATS_DIMENSIONS = {
+    "team": Issue.team_id,
+    "project": Issue.project_id,
+    "assignee": Issue.assignee_id,
+    "cycle": Issue.cycle_id,
+}
+
+
+def _headline_source(column):
+    # User text mein pehle se markers ho toh hata do - warna fake <mark> bante
+    return func.translate(column, MARK_START + MARK_END, "")
+
+
+def render_headline(fragment: Optional[str]) -> Optional[str]:
+    """ts_headline output -> escaped HTML jisme sirf <mark> tags live hain"""
+    if fragment is None:
+        return None
+    return (
+        html.escape(fragment)
+        .replace(MARK_START, "<mark>")
+        .replace(MARK_END, "</mark>")
+    )
+
+
+def build_prefix_tsquery(q: str) -> Optional[str]:
+    """
+    User input ko safe prefix tsquery mein convert karta hai.
+    "login bu" -> "login:* & bu:*" (search-as-you-type)
+    Returns None agar koi searchable word nahi hai.
+    """
+    terms = re.findall(r"[^\W_]+", q.lower())
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
 
 class CRUDIssue(CRUDBase[Issue, IssueCreate, IssueUpdate]):
+    def _search_condition(self, search: str, mode: str = "fulltext"):
+        """
+        `search` filter ke liye condition. Har mode ek GIN index use karta hai:
+        - fulltext: search_vector @@ prefix tsquery (ix_issues_search_vector)
+        - substring: title ILIKE '%q%' (ix_issues_title_trgm)
+        - fuzzy: q <% title, typo-tolerant word similarity (ix_issues_title_trgm)
+        Fulltext mein sirf punctuation wale input ke liye ILIKE fallback.
+        """
+        if mode == "substring":
+            return self.model.title.ilike(f"%{search}%")
+        if mode == "fuzzy":
+            return literal(search).op("<%")(self.model.title)
+
+        tsquery_text = build_prefix_tsquery(search)
+        if not tsquery_text:
+            return self.model.title.ilike(f"%{search}%")
+        return self.model.search_vector.op("@@")(
+            func.to_tsquery(SEARCH_CONFIG, tsquery_text)
+        )
+
+    def _visibility_condition(self, user_id: UUID, team_id: Optional[UUID]):
+        """Non-admin visibility: user ki team OR created by user OR assigned to user"""
+        conditions = [
+            self.model.creator_id == user_id,
+            self.model.assignee_id == user_id,
+        ]
+        if team_id:
+            conditions.append(self.model.team_id == team_id)
+        return or_(*conditions)
+
+    def _order_by_similarity(self, query, search: str):
+        # Fuzzy mode: best match pehle (sirf offset mode, cursor mode apna order rakhta hai)
+        return query.order_by(
+            func.word_similarity(search, self.model.title).desc(), self.model.id
+        )
+
     async def get_multi_by_owner(
         self,
         db: AsyncSession,
@@ -33,6 +135,8 @@ class CRUDIssue(CRUDBase[Issue, IssueCreate, IssueUpdate]):
         project_id: Optional[UUID] = None,
         assignee_id: Optional[UUID] = None,
         search: Optional[str] = None,
+        search_mode: str = "fulltext",
+        cursor: Optional[dict] = None,
     ) -> List[Issue]:
         query = select(self.model)
         if creator_id:
@@ -49,14 +153,16 @@ class CRUDIssue(CRUDBase[Issue, IssueCreate, IssueUpdate]):
         if assignee_id:
             query = query.where(self.model.assignee_id == assignee_id)
         if search:
-            query = query.where(self.model.title.ilike(f"%{search}%"))
+            query = query.where(self._search_condition(search, search_mode))
+            if search_mode == "fuzzy" and cursor is None:
+                query = self._order_by_similarity(query, search)
 
         query = query.options(
             selectinload(self.model.assignee),
             selectinload(self.model.team).selectinload(Team.projects),
         )
 
-        query = query.offset(skip).limit(limit)
+        query = self._paginate(query, skip=skip, limit=limit, cursor=cursor)
         result = await db.execute(query)
         return result.scalars().all()
 
@@ -69,6 +175,7 @@ class CRUDIssue(CRUDBase[Issue, IssueCreate, IssueUpdate]):
         skip: int = 0,
         limit: int = 100,
         filters: dict = None,
+        cursor: Optional[dict] = None,
     ) -> List[Issue]:
         """
         Fetch issues visible to a specific user using OR logic:
@@ -76,19 +183,13 @@ class CRUDIssue(CRUDBase[Issue, IssueCreate, IssueUpdate]):
         - In User's Team
         - OR Assigned to User
         - OR Created by User
-        """
-        conditions = []
-
-        # Base visibility conditions
-        visibility_conditions = [
-            self.model.creator_id == user_id,
-            self.model.assignee_id == user_id,
-        ]
-        if team_id:
-            visibility_conditions.append(self.model.team_id == team_id)
 
-        # Combine visibility with OR
-        base_query = select(self.model).where(or_(*visibility_conditions))
+        `cursor` switches from OFFSET to keyset pagination on (created_at, id).
+        """
+        # Base visibility conditions (Team OR Assigned OR Created)
+        base_query = select(self.model).where(
+            self._visibility_condition(user_id, team_id)
+        )
 
         # Apply additional filters (AND)
         # Apply additional filters (AND)
@@ -103,16 +204,21 @@ class CRUDIssue(CRUDBase[Issue, IssueCreate, IssueUpdate]):
             )
 
         if safe_filters.get("search"):
+            search_mode = safe_filters.get("search_mode") or "fulltext"
             base_query = base_query.where(
-                self.model.title.ilike(f"%{safe_filters['search']}%")
+                self._search_condition(safe_filters["search"], search_mode)
             )
+            if search_mode == "fuzzy" and cursor is None:
+                base_query = self._order_by_similarity(
+                    base_query, safe_filters["search"]
+                )
 
         base_query = base_query.options(
             selectinload(self.model.assignee),
             selectinload(self.model.team).selectinload(Team.projects),
         )
 
-        base_query = base_query.offset(skip).limit(limit)
+        base_query = self._paginate(base_query, skip=skip, limit=limit, cursor=cursor)
         result = await db.execute(base_query)
         return result.scalars().all()
 
@@ -133,10 +239,85 @@ class CRUDIssue(CRUDBase[Issue, IssueCreate, IssueUpdate]):
         result = await db.execute(query)
         return result.scalars().first()
 
-    async def get_all_for_export(
+    @staticmethod
+    def _response_options() -> list:
+        # IssueOut ko sirf assignee + team.projects chahiye (comments/activities nahi)
+        return [
+            joinedload(Issue.assignee),
+            joinedload(Issue.team).selectinload(Team.projects),
+        ]
+
+    async def get_for_response(self, db: AsyncSession, *, id: UUID) -> Optional[Issue]:
+        """Write endpoints ka response: 2 queries (issue+assignee+team, projects)"""
+        result = await db.execute(
+            select(self.model)
+            .where(self.model.id == id)
+            .options(*self._response_options())
+        )
+        return result.scalars().first()
+
+    async def get_many_for_response(
+        self, db: AsyncSession, *, ids: Sequence[UUID]
+    ) -> List[Issue]:
+        result = await db.execute(
+            select(self.model)
+            .where(self.model.id.in_(ids))
+            .options(*self._response_options())
+            .order_by(self.model.created_at, self.model.id)
+        )
+        return result.scalars().unique().all()
+
+    async def get_many_for_update(
+        self, db: AsyncSession, *, ids: Sequence[UUID]
+    ) -> List[Issue]:
+        """SELECT ... FOR UPDATE in id order (concurrent bulk updates deadlock na hon)"""
+        result = await db.execute(
+            select(self.model)
+            .where(self.model.id.in_(ids))
+            .order_by(self.model.id)
+            .with_for_update()
+        )
+        return result.scalars().all()
+
+    async def get_missing_references(
         self,
         db: AsyncSession,
         *,
+        project_id: Optional[UUID] = None,
+        assignee_id: Optional[UUID] = None,
+        team_id: Optional[UUID] = None,
+    ) -> List[str]:
+        """
+        Referenced project/assignee/team ek hi SELECT (EXISTS per id) mein check.
+        Returns missing names in order: "project", "assignee", "team".
+        """
+        checks = [
+            (name, model, ref_id)
+            for name, model, ref_id in (
+                ("project", Project, project_id),
+                ("assignee", User, assignee_id),
+                ("team", Team, team_id),
+            )
+            if ref_id
+        ]
+        if not checks:
+            return []
+        result = await db.execute(
+            select(
+                *(
+                    select(model.id).where(model.id == ref_id).exists()
+                    for _, model, ref_id in checks
+                )
+            )
+        )
+        found = result.one()
+        return [name for (name, _, _), exists_ in zip(checks, found) if not exists_]
+
+    async def stream_for_export(
+        self,
+        db: AsyncSession,
+        *,
+        chunk_size: int = 1000,
         creator_id: Optional[UUID] = None,
         status: Optional[str] = None,
         priority: Optional[int] = None,
@@ -144,17 +325,33 @@ class CRUDIssue(CRUDBase[Issue, IssueCreate, IssueUpdate]):
         project_id: Optional[UUID] = None,
         assignee_id: Optional[UUID] = None,
         search: Optional[str] = None,
-    ) -> List[Issue]:
-        query = select(self.model)
+        search_mode: str = "fulltext",
+    ) -> AsyncIterator[list]:
+        """
+        CSV export rows, `chunk_size` rows per yielded list.
+        Server-side cursor (stream + yield_per): memory chunk size tak hi,
+        result kitna bhi bada ho. Assignee/project/team names SQL JOIN se -
+        ORM objects ya selectinload nahi.
+        Row fields: identifier, title, status, priority, assignee_email,
+        project_name, team_name, created_at
+        """
+        query = (
+            select(
+                self.model.identifier,
+                self.model.title,
+                self.model.status,
+                self.model.priority,
+                User.email.label("assignee_email"),
+                Project.name.label("project_name"),
+                Team.name.label("team_name"),
+                self.model.created_at,
+            )
+            .outerjoin(User, User.id == self.model.assignee_id)
+            .outerjoin(Project, Project.id == self.model.project_id)
+            .outerjoin(Team, Team.id == self.model.team_id)
+        )
         if creator_id:
             query = query.where(self.model.creator_id == creator_id)
-
-        query = query.options(
-            selectinload(self.model.assignee),
-            selectinload(self.model.project),
-            selectinload(self.model.team),
-        )
-
         if status:
             query = query.where(self.model.status == status)
         if priority is not None:
@@ -166,65 +363,235 @@ class CRUDIssue(CRUDBase[Issue, IssueCreate, IssueUpdate]):
         if assignee_id:
             query = query.where(self.model.assignee_id == assignee_id)
         if search:
-            query = query.where(self.model.title.ilike(f"%{search}%"))
+            query = query.where(self._search_condition(search, search_mode))
+        query = query.order_by(self.model.created_at, self.model.id).execution_options(
+            yield_per=chunk_size
+        )
 
-        result = await db.execute(query)
-        return result.scalars().all()
+        result = await db.stream(query)
+        async for rows in result.partitions():
+            yield rows
 
     async def search_global(
-        self, db: AsyncSession, *, q: str, skip: int = 0, limit: int = 100
-    ) -> List[Issue]:
-        if not q:
+        self,
+        db: AsyncSession,
+        *,
+        q: str,
+        skip: int = 0,
+        limit: int = 100,
+        include_comments: bool = False,
+    ) -> List[Tuple[Issue, float, str, str]]:
+        """
+        Ranked full-text search over title + description (+ comments optionally).
+
+        Returns (issue, rank, title_highlight, snippet) rows, best match first.
+        Highlights are HTML-escaped text with only the <mark> tags live.
+        Headlines are computed only for the requested page (ts_headline is
+        expensive), so ranking runs in a subquery and the outer query joins it.
+        """
+        tsquery_text = build_prefix_tsquery(q or "")
+        if not tsquery_text:
             return []
+
+        ts_query = func.to_tsquery(SEARCH_CONFIG, tsquery_text)
+        match = self.model.search_vector.op("@@")(ts_query)
+        if include_comments:
+            comment_match = exists().where(
+                Comment.issue_id == self.model.id,
+                func.to_tsvector(SEARCH_CONFIG, Comment.content).op("@@")(ts_query),
+            )
+            match = or_(match, comment_match)
+
+        rank = func.ts_rank(self.model.search_vector, ts_query).label("rank")
+        ranked = (
+            select(self.model.id, rank)
+            .where(match)
+            .order_by(rank.desc(), self.model.id)
+            .offset(skip)
+            .limit(limit)
+            .subquery()
+        )
+
         query = (
-            select(self.model)
-            .where(
-                or_(
-                    self.model.title.ilike(f"%{q}%"),
-                    self.model.description.ilike(f"%{q}%"),
-                )
+            select(
+                self.model,
+                ranked.c.rank,
+                func.ts_headline(
+                    SEARCH_CONFIG,
+                    _headline_source(self.model.title),
+                    ts_query,
+                    HEADLINE_OPTIONS,
+                ).label("title_highlight"),
+                func.ts_headline(
+                    SEARCH_CONFIG,
+                    _headline_source(func.coalesce(self.model.description, "")),
+                    ts_query,
+                    SNIPPET_OPTIONS,
+                ).label("snippet"),
             )
+            .join(ranked, ranked.c.id == self.model.id)
             .options(
                 selectinload(self.model.assignee),
                 selectinload(self.model.team).selectinload(Team.projects),
             )
-            .offset(skip)
-            .limit(limit)
+            .order_by(ranked.c.rank.desc(), self.model.id)
         )
         result = await db.execute(query)
-        return result.scalars().all()
+        return [
+            (issue, rank, render_headline(title_highlight), render_headline(snippet))
+            for issue, rank, title_highlight, snippet in result.all()
+        ]
 
     async def get_stats(
-        self, db: AsyncSession, *, creator_id: Optional[UUID] = None
+        self,
+        db: AsyncSession,
+        *,
+        creator_id: Optional[UUID] = None,
+        dimensions: Sequence[str] = (),
     ) -> dict:
-        total_query = select(func.count(self.model.id))
-
-        status_query = select(self.model.status, func.count(self.model.id)).group_by(
-            self.model.status
-        )
-
-        priority_query = select(
-            self.model.priority, func.count(self.model.id)
-        ).group_by(self.model.priority)
-
+        """
+        Total + status + priority (+ optional `dimensions` from STATS_DIMENSIONS)
+        ek hi scan mein: GROUP BY GROUPING SETS ((), (status), (priority), ...).
+        GROUPING(col) = 0 batata hai ki row kis set ki hai - isliye NULL
+        team/assignee wala group aur rolled-up row alag pehchane jaate hain.
+        Keys: "<dimension>_counts" -> {value: count}, NULL value -> "none".
+        """
+        names = ["status", "priority", *dimensions]
+        columns = [
+            self.model.status,
+            self.model.priority,
+            *(STATS_DIMENSIONS[name] for name in dimensions),
+        ]
+        query = select(
+            *columns, *(func.grouping(column) for column in columns), func.count()
+        ).group_by(func.grouping_sets(literal_column("()"), *columns))
         if creator_id:
-            total_query = total_query.where(self.model.creator_id == creator_id)
-            status_query = status_query.where(self.model.creator_id == creator_id)
-            priority_query = priority_query.where(self.model.creator_id == creator_id)
-
-        # Execute queries sequentially to avoid SQLAlchemy async session concurrency issues
-        total_result = await db.execute(total_query)
-        status_result = await db.execute(status_query)
-        priority_result = await db.execute(priority_query)
+            query = query.where(self.model.creator_id == creator_id)
 
-        total_count = total_result.scalar() or 0
-        status_counts = {row[0]: row[1] for row in status_result.all()}
-        priority_counts = {str(row[0]): row[1] for row in priority_result.all()}
+        result = await db.execute(query)
 
+        stats = {"total_count": 0, **{f"{name}_counts": {} for name in names}}
+        width = len(columns)
+        for row in result.all():
+            values, grouped, count = row[:width], row[width : 2 * width], row[-1]
+            for name, value, is_rolled_up in zip(names, values, grouped):
+                if not is_rolled_up:
+                    key = "none" if value is None else str(value)
+                    stats[f"{name}_counts"][key] = count
+                    break
+            else:
+                # () set - saare columns rolled up
+                stats["total_count"] = count
+        return stats
+
+    async def get_dashboard(
+        self,
+        db: AsyncSession,
+        *,
+        team_id: Optional[UUID] = None,
+        project_id: Optional[UUID] = None,
+        user_id: Optional[UUID] = None,
+        user_team_id: Optional[UUID] = None,
+        top_n: int = 5,
+        now: datetime,
+    ) -> Optional[dict]:
+        """
+        Team (ya project) dashboard ek hi statement mein: visible issues ka CTE,
+        uspe total/status/priority counts + top-N lists (json_agg).
+        `user_id` diya toh get_issues_for_user wali visibility SQL mein lagti hai;
+        None = admin / poori team dikhti hai.
+        Overdue = open issue jiski cycle end_date nikal chuki hai.
+        Returns None agar team/project exist nahi karta.
+        """
+        scope_model, scope_id = (Project, project_id) if project_id else (Team, team_id)
+        scope_column = self.model.project_id if project_id else self.model.team_id
+
+        visible = (
+            select(
+                self.model.id,
+                self.model.identifier,
+                self.model.title,
+                self.model.status,
+                self.model.priority,
+                self.model.assignee_id,
+                self.model.updated_at,
+                Cycle.end_date.label("due_date"),
+            )
+            .outerjoin(Cycle, Cycle.id == self.model.cycle_id)
+            .where(scope_column == scope_id)
+        )
+        if user_id:
+            visible = visible.where(self._visibility_condition(user_id, user_team_id))
+        visible = visible.cte("visible")
+        is_open = visible.c.status.not_in(CLOSED_STATUSES)
+
+        def counts(column):
+            grouped = (
+                select(column.label("key"), func.count().label("n"))
+                .where(column.is_not(None))
+                .group_by(column)
+                .subquery()
+            )
+            return select(
+                func.coalesce(
+                    func.json_object_agg(grouped.c.key, grouped.c.n),
+                    literal_column("'{}'::json"),
+                    type_=JSON,
+                )
+            ).scalar_subquery()
+
+        def top(condition, order):
+            # order: [(column name, descending)] - limit ke liye aur json_agg ke andar
+            def order_by(columns):
+                return [
+                    columns[name].desc() if descending else columns[name]
+                    for name, descending in order
+                ]
+
+            rows = (
+                select(visible)
+                .where(condition)
+                .order_by(*order_by(visible.c))
+                .limit(top_n)
+                .subquery()
+            )
+            return select(
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(rows.table_valued(), *order_by(rows.c))
+                    ),
+                    literal_column("'[]'::json"),
+                    type_=JSON,
+                )
+            ).scalar_subquery()
+
+        recent = [("updated_at", True), ("id", True)]
+        query = select(
+            select(scope_model.id).where(scope_model.id == scope_id).exists().label(
+                "found"
+            ),
+            select(func.count()).select_from(visible).scalar_subquery().label("total"),
+            counts(visible.c.status).label("status_counts"),
+            counts(visible.c.priority).label("priority_counts"),
+            top(true(), recent).label("recently_updated"),
+            top(
+                and_(is_open, visible.c.due_date < now),
+                [("due_date", False), ("id", False)],
+            ).label("overdue"),
+            top(
+                and_(is_open, visible.c.priority == IssuePriority.HIGH.value), recent
+            ).label("high_priority"),
+        )
+        row = (await db.execute(query)).one()
+        if not row.found:
+            return None
         return {
-            "total_count": total_count,
-            "status_counts": status_counts,
-            "priority_counts": priority_counts,
+            "total_count": row.total,
+            "status_counts": row.status_counts,
+            "priority_counts": row.priority_counts,
+            "recently_updated": row.recently_updated,
+            "overdue": row.overdue,
+            "high_priority": row.high_priority,
         }
 
 
@@ -0,0 +1,204 @@
+import os
+import random
+from collections import Counter
+from typing import Iterable, Optional, Tuple
+from uuid import UUID
+
+from dotenv import load_dotenv
+from sqlalchemy import (
+    BigInteger,
+    String,
+    cast,
+    delete,
+    func,
+    literal,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.model.issue import Issue
+from app.model.issue_stat import IssueStat
+
+load_dotenv()
+
+ALL_SCOPE = "all"
+
+# Har counter itne rows (slots) mein - concurrent writes alag rows lock karte hain
+ISSUE_STATS_SLOTS = max(1, int(os.getenv("ISSUE_STATS_SLOTS", "16")))
+
+StatKey = Tuple[str, str, str]  # (scope, dimension, value)
+
+
+def team_scope(team_id: UUID) -> str:
+    return f"team:{team_id}"
+
+
+def creator_scope(creator_id: UUID) -> str:
+    return f"creator:{creator_id}"
+
+
+def _plain(value):
+    # IssueStatus/IssuePriority enums ya raw DB values - dono same key dein
+    value = getattr(value, "value", value)
+    return None if value is None else str(value)
+
+
+class CRUDIssueStats:
+    """
+    Incrementally maintained dashboard counters (table issue_stats).
+
+    Writes: IssueService snapshot() leta hai change se pehle/baad, phir
+    apply_change() sirf net delta ka ek INSERT ... ON CONFLICT DO UPDATE karta
+    hai caller ke transaction mein (commit caller karega). Har transaction ek
+    random slot pe likhta hai, isliye "all" (aur badi teams) ka counter ek
+    row lock pe serialize nahi hota.
+    Reads: get() ek scope ke rows slots pe SUM karta hai - issues table touch
+    nahi hoti.
+    """
+
+    @staticmethod
+    def snapshot(issue: Issue) -> dict:
+        """Counter-relevant fields of an issue (mutation se pehle capture karo)"""
+        return {
+            "team_id": issue.team_id,
+            "creator_id": issue.creator_id,
+            "status": _plain(issue.status),
+            "priority": _plain(issue.priority),
+        }
+
+    @staticmethod
+    def _keys(snapshot: dict):
+        scopes = [ALL_SCOPE]
+        if snapshot["team_id"]:
+            scopes.append(team_scope(snapshot["team_id"]))
+        if snapshot["creator_id"]:
+            scopes.append(creator_scope(snapshot["creator_id"]))
+        for scope in scopes:
+            yield scope, "total", ""
+            if snapshot["status"] is not None:
+                yield scope, "status", snapshot["status"]
+            if snapshot["priority"] is not None:
+                yield scope, "priority", snapshot["priority"]
+
+    async def apply_change(
+        self,
+        db: AsyncSession,
+        *,
+        old: Optional[dict] = None,
+        new: Optional[dict] = None,
+    ) -> None:
+        """
+        create: new=snapshot, delete: old=snapshot, update: dono.
+        Unchanged keys cancel out - title/description edit pe koi write nahi.
+        """
+        await self.apply_changes(db, [(old, new)])
+
+    async def apply_changes(
+        self,
+        db: AsyncSession,
+        changes: Iterable[Tuple[Optional[dict], Optional[dict]]],
+    ) -> None:
+        """Many (old, new) pairs -> net deltas -> ek hi upsert (bulk endpoints)"""
+        deltas: Counter = Counter()
+        for old, new in changes:
+            if old:
+                deltas.subtract(self._keys(old))
+            if new:
+                deltas.update(self._keys(new))
+        # Ek slot poore transaction ke liye; sorted keys - concurrent requests
+        # same order mein row locks lein (no deadlock)
+        slot = random.randrange(ISSUE_STATS_SLOTS)
+        rows = [
+            {
+                "scope": scope,
+                "dimension": dimension,
+                "value": value,
+                "slot": slot,
+                "count": delta,
+            }
+            for (scope, dimension, value), delta in sorted(deltas.items())
+            if delta
+        ]
+        if not rows:
+            return
+        stmt = insert(IssueStat).values(rows)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    IssueStat.scope,
+                    IssueStat.dimension,
+                    IssueStat.value,
+                    IssueStat.slot,
+                ],
+                set_={"count": IssueStat.count + stmt.excluded.count},
+            )
+        )
+
+    async def get(self, db: AsyncSession, *, scope: str = ALL_SCOPE) -> dict:
+        """Same shape as crud.issue.get_stats"""
+        total = cast(func.sum(IssueStat.count), BigInteger)
+        result = await db.execute(
+            select(IssueStat.dimension, IssueStat.value, total)
+            .where(IssueStat.scope == scope)
+            .group_by(IssueStat.dimension, IssueStat.value)
+            .having(total > 0)
+        )
+        stats = {"total_count": 0, "status_counts": {}, "priority_counts": {}}
+        for dimension, value, count in result.all():
+            if dimension == "total":
+                stats["total_count"] = count
+            else:
+                stats[f"{dimension}_counts"][value] = count
+        return stats
+
+    @staticmethod
+    def _rebuild_query():
+        """
+        Saare scopes x dimensions ek INSERT ... SELECT mein (9 aggregates,
+        UNION ALL) - sab slot 0 mein, baad ke writes baaki slots bharte hain
+        """
+        scopes = [
+            (literal(ALL_SCOPE, String), None),
+            (literal("team:") + cast(Issue.team_id, String), Issue.team_id),
+            (literal("creator:") + cast(Issue.creator_id, String), Issue.creator_id),
+        ]
+        dimensions = [
+            ("total", literal("", String), None),
+            ("status", Issue.status, Issue.status),
+            ("priority", cast(Issue.priority, String), Issue.priority),
+        ]
+        selects = []
+        for scope_expr, scope_column in scopes:
+            for dimension, value_expr, value_column in dimensions:
+                group_by = [c for c in (scope_column, value_column) if c is not None]
+                query = select(
+                    scope_expr, literal(dimension, String), value_expr, func.count()
+                ).select_from(Issue)
+                for column in group_by:
+                    query = query.where(column.is_not(None))
+                if group_by:
+                    query = query.group_by(*group_by)
+                selects.append(query)
+        return union_all(*selects)
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        """
+        Counters issues table se dobara banao (maintenance / drift fix).
+        SHARE ROW EXCLUSIVE lock: chal rahe issue writes commit hone tak ruko,
+        naye writes rebuild commit hone tak apply_change pe wait karein.
+        """
+        await db.execute(text("LOCK TABLE issue_stats IN SHARE ROW EXCLUSIVE MODE"))
+        await db.execute(delete(IssueStat))
+        result = await db.execute(
+            insert(IssueStat).from_select(
+                ["scope", "dimension", "value", "count"], self._rebuild_query()
+            )
+        )
+        await db.commit()
+        return result.rowcount
+
+
+issue_stats = CRUDIssueStats()
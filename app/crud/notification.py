@@ -0,0 +1,148 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.connectionManager import user_topic
+from app.crud.base import CRUDBase
+from app.model.notification import Notification, NotificationArchive
+from app.model.tombstone import SyncTombstone
+from app.schemas.notification import (
+    NotificationCreate,
+    NotificationCreate as NotificationUpdate,
+)
+
+
+class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUpdate]):
+    async def get_multi_by_user(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[dict] = None,
+    ) -> List[Notification]:
+        """Most recent first; `cursor` switches to keyset pagination on (created_at, id)"""
+        query = select(self.model).where(self.model.user_id == user_id)
+        if cursor is None:
+            query = query.order_by(self.model.created_at.desc())
+        query = self._paginate(query, skip=skip, limit=limit, cursor=cursor)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def count_unread(self, db: AsyncSession, *, user_id: UUID) -> int:
+        # Partial index ix_notifications_user_unread sirf unread rows rakhta hai
+        result = await db.execute(
+            select(func.count())
+            .select_from(self.model)
+            .where(self.model.user_id == user_id, self.model.read.is_(False))
+        )
+        return result.scalar_one()
+
+    async def mark_read(
+        self, db: AsyncSession, *, user_id: UUID, ids: Optional[List[UUID]] = None
+    ) -> int:
+        """
+        Set-based UPDATE ... SET read = true WHERE user_id AND read = false.
+        `ids` diye toh sirf wahi (doosre user ke ids chup-chaap ignore).
+        Returns affected row count.
+        """
+        query = (
+            update(self.model)
+            .where(self.model.user_id == user_id, self.model.read.is_(False))
+            .values(read=True)
+            .execution_options(synchronize_session=False)
+        )
+        if ids is not None:
+            query = query.where(self.model.id.in_(ids))
+        result = await db.execute(query)
+        await db.commit()
+        return result.rowcount
+
+    async def delete_read_before(
+        self, db: AsyncSession, *, user_id: UUID, before: datetime
+    ) -> int:
+        """
+        Delete read notifications created before `before` (ek DELETE ... RETURNING).
+        Delta sync clients ke liye tombstones same transaction mein likhe jaate hain.
+        """
+        result = await db.execute(
+            delete(self.model)
+            .where(
+                self.model.user_id == user_id,
+                self.model.read.is_(True),
+                self.model.created_at < before,
+            )
+            .returning(self.model.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_ids = result.scalars().all()
+        if deleted_ids:
+            tombstones = [
+                {
+                    "entity_type": "notification",
+                    "entity_id": notification_id,
+                    "topics": [user_topic(user_id)],
+                }
+                for notification_id in deleted_ids
+            ]
+            await db.execute(insert(SyncTombstone).values(tombstones))
+        await db.commit()
+        return len(deleted_ids)
+
+    async def purge_read_batch(
+        self,
+        db: AsyncSession,
+        *,
+        before: datetime,
+        batch_size: int,
+        archive: bool = False,
+    ) -> int:
+        """
+        Retention task ka ek batch: sabse purane `batch_size` read notifications
+        (created_at < before) delete karo, tombstones + (archive=True pe)
+        notifications_archive rows same transaction mein, phir commit.
+        SKIP LOCKED - parallel run ya user ka apna delete block nahi karta.
+        Returns rows removed (0 = kuch baaki nahi).
+        """
+        batch = (
+            select(self.model.id)
+            .where(self.model.read.is_(True), self.model.created_at < before)
+            .order_by(self.model.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            delete(self.model)
+            .where(self.model.id.in_(batch))
+            .returning(*self.model.__table__.columns)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.mappings().all()
+        if not rows:
+            await db.commit()
+            return 0
+
+        if archive:
+            await db.execute(
+                insert(NotificationArchive).values([dict(row) for row in rows])
+            )
+        await db.execute(
+            insert(SyncTombstone).values(
+                [
+                    {
+                        "entity_type": "notification",
+                        "entity_id": row["id"],
+                        "topics": [user_topic(row["user_id"])],
+                    }
+                    for row in rows
+                ]
+            )
+        )
+        await db.commit()
+        return len(rows)
+
+
+notification = CRUDNotification(Notification)
@@ -0,0 +1,176 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, literal, or_, select, tuple_
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.model.activity import Activity
+from app.model.comment import Comment
+from app.model.issue import Issue
+from app.model.notification import Notification
+from app.model.team import Team
+from app.model.tombstone import SyncTombstone
+from app.pagination import SyncPosition
+
+
+class CRUDSync:
+    """
+    Delta sync queries: rows changed at/after `since`, oldest change first,
+    ordered by (changed_at, id). `after` diya ho toh keyset position se aage
+    (exclusive) - same timestamp wale bahut saare rows pe bhi paging aage badhti hai.
+    `user_id=None` matlab admin (no visibility filter), warna wahi rules
+    jo get_issues_for_user mein hain (team OR creator OR assignee).
+    Har query `limit` rows tak - caller limit+1 maang ke has_more nikalta hai.
+    """
+
+    @staticmethod
+    def _changed_since(
+        changed_at, id_column, since: datetime, after: Optional[SyncPosition]
+    ):
+        if after is None:
+            return changed_at >= since
+        position = (
+            literal(after[0], type_=changed_at.type),
+            literal(after[1], type_=id_column.type),
+        )
+        return tuple_(changed_at, id_column) > tuple_(*position)
+
+    @staticmethod
+    def _visible_issue_ids(user_id: UUID, team_id: Optional[UUID]):
+        conditions = [Issue.creator_id == user_id, Issue.assignee_id == user_id]
+        if team_id:
+            conditions.append(Issue.team_id == team_id)
+        return select(Issue.id).where(or_(*conditions))
+
+    async def get_issues(
+        self,
+        db: AsyncSession,
+        *,
+        since: datetime,
+        limit: int,
+        after: Optional[SyncPosition] = None,
+        user_id: Optional[UUID] = None,
+        team_id: Optional[UUID] = None,
+    ) -> List[Issue]:
+        query = select(Issue).where(
+            self._changed_since(Issue.updated_at, Issue.id, since, after)
+        )
+        if user_id:
+            query = query.where(Issue.id.in_(self._visible_issue_ids(user_id, team_id)))
+        query = (
+            query.options(
+                selectinload(Issue.assignee),
+                selectinload(Issue.team).selectinload(Team.projects),
+            )
+            .order_by(Issue.updated_at, Issue.id)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def get_comments(
+        self,
+        db: AsyncSession,
+        *,
+        since: datetime,
+        limit: int,
+        after: Optional[SyncPosition] = None,
+        user_id: Optional[UUID] = None,
+        team_id: Optional[UUID] = None,
+    ) -> List[Comment]:
+        query = select(Comment).where(
+            self._changed_since(Comment.updated_at, Comment.id, since, after)
+        )
+        if user_id:
+            query = query.where(
+                Comment.issue_id.in_(self._visible_issue_ids(user_id, team_id))
+            )
+        query = (
+            query.options(selectinload(Comment.author))
+            .order_by(Comment.updated_at, Comment.id)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def get_activities(
+        self,
+        db: AsyncSession,
+        *,
+        since: datetime,
+        limit: int,
+        after: Optional[SyncPosition] = None,
+        user_id: Optional[UUID] = None,
+        team_id: Optional[UUID] = None,
+    ) -> List[Activity]:
+        query = select(Activity).where(
+            self._changed_since(Activity.updated_at, Activity.id, since, after)
+        )
+        if user_id:
+            query = query.where(
+                Activity.issue_id.in_(self._visible_issue_ids(user_id, team_id))
+            )
+        query = (
+            query.options(selectinload(Activity.user))
+            .order_by(Activity.updated_at, Activity.id)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def get_notifications(
+        self,
+        db: AsyncSession,
+        *,
+        since: datetime,
+        limit: int,
+        user_id: UUID,
+        after: Optional[SyncPosition] = None,
+    ) -> List[Notification]:
+        # Notifications hamesha sirf apni (admin ke liye bhi)
+        query = (
+            select(Notification)
+            .where(
+                Notification.user_id == user_id,
+                self._changed_since(
+                    Notification.updated_at, Notification.id, since, after
+                ),
+            )
+            .order_by(Notification.updated_at, Notification.id)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def get_tombstones(
+        self,
+        db: AsyncSession,
+        *,
+        since: datetime,
+        limit: int,
+        after: Optional[SyncPosition] = None,
+        topics: Optional[List[str]] = None,
+    ) -> List[SyncTombstone]:
+        """`topics` = caller ke visible topics (None = admin, sab kuch)"""
+        query = select(SyncTombstone).where(
+            self._changed_since(
+                SyncTombstone.deleted_at, SyncTombstone.id, since, after
+            )
+        )
+        if topics is not None:
+            query = query.where(SyncTombstone.topics.overlap(topics))
+        query = query.order_by(SyncTombstone.deleted_at, SyncTombstone.id).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def prune_tombstones(self, db: AsyncSession, *, before: datetime) -> int:
+        result = await db.execute(
+            delete(SyncTombstone).where(SyncTombstone.deleted_at < before)
+        )
+        await db.commit()
+        return result.rowcount
+
+
+sync = CRUDSync()
@@ -15,13 +15,18 @@ class CRUDTeam(CRUDBase[Team, TeamCreate, TeamUpdate]):
         return result.scalars().first()
 
     async def get_multi(
-        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[dict] = None,
     ) -> List[Team]:
-        query = (
-            select(self.model)
-            .options(selectinload(self.model.projects))
-            .offset(skip)
-            .limit(limit)
+        query = self._paginate(
+            select(self.model).options(selectinload(self.model.projects)),
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
         )
         result = await db.execute(query)
         return result.scalars().all()
@@ -12,6 +12,12 @@ class IssueFilters:
         project_id: Optional[UUID] = Query(None),
         assignee_id: Optional[UUID] = Query(None),
         search: Optional[str] = Query(None),
+        search_mode: str = Query(
+            "fulltext",
+            pattern="^(fulltext|substring|fuzzy)$",
+            description="fulltext (default), substring (ILIKE) or fuzzy "
+            "(typo-tolerant, ordered by similarity)",
+        ),
     ):
         self.status = status_filter
         self.priority = priority
@@ -19,3 +25,4 @@ class IssueFilters:
         self.project_id = project_id
         self.assignee_id = assignee_id
         self.search = search
+        self.search_mode = search_mode
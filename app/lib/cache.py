@@ -0,0 +1,184 @@
+"""
+In-process TTL + LRU caches with optional cross-worker invalidation.
+
+Development: har uvicorn worker ka apna cache (in-memory only)
+Production: CACHE_REDIS_URL set karo - invalidations Redis pub/sub se
+saare workers tak pahunchte hain
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")  # Optional shared backend
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))  # seconds
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+UNREAD_COUNT_CACHE_TTL = float(os.getenv("UNREAD_COUNT_CACHE_TTL", "300"))  # seconds
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "30"))  # seconds
+DASHBOARD_CACHE_MAX_SIZE = int(os.getenv("DASHBOARD_CACHE_MAX_SIZE", "1000"))
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with per-entry TTL and hit/miss counters.
+    Single event loop ke andar use hota hai, isliye locking ki zarurat nahi.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl: float):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        invalidation_bus.register(self)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        if self._data.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    async def invalidate(self, key: Hashable) -> None:
+        """Local delete + baaki workers ko bhi batao (agar shared backend hai)"""
+        self.delete(key)
+        await invalidation_bus.publish(self.name, key)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class InvalidationBus:
+    """
+    Redis pub/sub pe cache invalidations broadcast karta hai.
+    CACHE_REDIS_URL set nahi hai toh sab no-op (single worker setup).
+    """
+
+    CHANNEL = "cache:invalidate"
+
+    def __init__(self, url: Optional[str]):
+        self.url = url
+        self.origin = uuid.uuid4().hex  # Apne messages ignore karne ke liye
+        self._caches: Dict[str, "TTLCache"] = {}
+        self._redis = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url)
+
+    def register(self, cache: "TTLCache") -> None:
+        self._caches[cache.name] = cache
+
+    def _client(self):
+        if self._redis is None:
+            import redis.asyncio as redis  # Optional dependency, sirf shared mode mein
+
+            self._redis = redis.from_url(self.url, decode_responses=True)
+        return self._redis
+
+    async def publish(self, cache_name: str, key: Hashable) -> None:
+        if not self.enabled:
+            return
+        message = json.dumps({"cache": cache_name, "key": key, "origin": self.origin})
+        try:
+            await self._client().publish(self.CHANNEL, message)
+        except Exception as e:
+            # Invalidation miss ho gaya - TTL ke baad entry khud expire hogi
+            logger.error(f"Cache invalidation publish failed: {e}")
+
+    async def listen(self) -> None:
+        """Background task (startup pe): doosre workers ke invalidations apply karo"""
+        while True:
+            try:
+                pubsub = self._client().pubsub()
+                await pubsub.subscribe(self.CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._apply(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation listener error: {e}")
+                await asyncio.sleep(1)
+
+    def _apply(self, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+        if message.get("origin") == self.origin:
+            return
+        cache = self._caches.get(message.get("cache"))
+        if cache:
+            cache.delete(message.get("key"))
+
+    def stats(self) -> dict:
+        return {name: cache.stats() for name, cache in self._caches.items()}
+
+
+invalidation_bus = InvalidationBus(CACHE_REDIS_URL)
+
+# Authenticated user snapshots, keyed by token `sub` (email)
+user_cache = TTLCache("user", max_size=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL)
+
+# users.token_version per user id - claims-based auth ka revocation counter
+token_version_cache = TTLCache(
+    "token_version", max_size=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL
+)
+
+# Unread notification count per user id - writes invalidate, reads recount
+unread_count_cache = TTLCache(
+    "unread_count", max_size=USER_CACHE_MAX_SIZE, ttl=UNREAD_COUNT_CACHE_TTL
+)
+
+# Team/project dashboards - short TTL, no invalidation (thoda stale chalega)
+dashboard_cache = TTLCache(
+    "dashboard", max_size=DASHBOARD_CACHE_MAX_SIZE, ttl=DASHBOARD_CACHE_TTL
+)
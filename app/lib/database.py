@@ -1,18 +1,114 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+import asyncio
+import logging
 import os
+import time
 from dotenv import load_dotenv
 
 # .env file se environment variables load karo
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # 1. URL .env file se load karo
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable nahi mila .env file mein")
 
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Pool / engine profile (.env se override karo, defaults production ke liye hain)
+DB_ECHO = _env_bool("DB_ECHO", False)  # SQL logging sirf debugging ke liye
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+DB_POOL_LOG_INTERVAL = int(os.getenv("DB_POOL_LOG_INTERVAL", "0"))  # 0 = disabled
+
+
+def _connect_args() -> dict:
+    """asyncpg specific options (statement cache + server side timeout)"""
+    if "+asyncpg" not in DATABASE_URL:
+        return {}
+    server_settings = {}
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        server_settings["statement_timeout"] = str(DB_STATEMENT_TIMEOUT_MS)
+    return {
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        "server_settings": server_settings,
+    }
+
+
+# Pool counters (per worker process) - pool sizing ke liye
+_pool_counters = {
+    "connects": 0,
+    "checkouts": 0,
+    "checkins": 0,
+    "overflow_checkouts": 0,  # Checkouts jo pool_size ke upar overflow se mile
+    "invalidations": 0,
+    "timeouts": 0,  # pool_timeout ke baad bhi connection nahi mila
+    "waits": 0,  # Checkouts jinhe free connection ka wait karna pada
+    "wait_ms_total": 0.0,
+    "wait_ms_max": 0.0,
+}
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Checkout ko pool level pe time karta hai: wait count/latency aur
+    pool_timeout - chahe checkout get_db se ho ya kisi background session se.
+    """
+
+    def _do_get(self):
+        # Koi idle connection nahi aur overflow bhi full - queue pe wait hoga
+        # (max_overflow -1 = unlimited, kabhi wait nahi)
+        must_wait = (
+            self.checkedin() == 0
+            and DB_MAX_OVERFLOW >= 0
+            and self.overflow() >= DB_MAX_OVERFLOW
+        )
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            _pool_counters["timeouts"] += 1
+            logger.warning("DB pool timeout: %s", get_pool_status())
+            raise
+        finally:
+            if must_wait:
+                waited_ms = (time.perf_counter() - start) * 1000
+                _pool_counters["waits"] += 1
+                _pool_counters["wait_ms_total"] += waited_ms
+                _pool_counters["wait_ms_max"] = max(
+                    _pool_counters["wait_ms_max"], waited_ms
+                )
+
+
 # 2. Async Engine banao
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=DB_ECHO,
+    poolclass=InstrumentedPool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args=_connect_args(),
+)
 
 # 3. Async Session factory
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
@@ -21,8 +117,62 @@ AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=F
 Base = declarative_base()
 
 
+@event.listens_for(engine.sync_engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    _pool_counters["connects"] += 1
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    _pool_counters["checkouts"] += 1
+    if engine.pool.checkedout() > DB_POOL_SIZE:
+        _pool_counters["overflow_checkouts"] += 1
+
+
+@event.listens_for(engine.sync_engine, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    _pool_counters["checkins"] += 1
+
+
+@event.listens_for(engine.sync_engine, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    _pool_counters["invalidations"] += 1
+
+
+def get_pool_status() -> dict:
+    """
+    Current pool snapshot + cumulative counters.
+    Used by /health/db-pool endpoint and the periodic log line.
+    """
+    pool = engine.pool
+    waits = _pool_counters["waits"]
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        **_pool_counters,
+        "wait_ms_avg": _pool_counters["wait_ms_total"] / waits if waits else 0.0,
+    }
+
+
+def log_pool_status() -> None:
+    logger.info("DB pool status: %s", get_pool_status())
+
+
+async def pool_status_logger() -> None:
+    """Background loop: har DB_POOL_LOG_INTERVAL seconds pool status log karo"""
+    # Root logger ERROR level pe hai (main.py), isliye is logger ko INFO pe rakho
+    logger.setLevel(logging.INFO)
+    while True:
+        await asyncio.sleep(DB_POOL_LOG_INTERVAL)
+        log_pool_status()
+
+
 # 5. Dependency injection function (Jo main.py mein use hoga)
 async def get_db():
+    # Pool timeouts/waits InstrumentedPool ginta hai (har checkout pe)
     async with AsyncSessionLocal() as session:
         yield session
         await session.commit()
@@ -0,0 +1,316 @@
+"""
+Cross-worker event bus for WebSocket broadcasts.
+
+uvicorn --workers 4 mein har worker ka apna ConnectionManager hai. Jo event
+ek worker pe raise hota hai wo bus ke through baaki workers tak jaata hai,
+aur har worker apne local sockets ko deliver karta hai.
+
+Backends (WS_BUS_BACKEND):
+- memory: same process only (development / tests)
+- redis: Redis pub/sub (WS_BUS_REDIS_URL)
+- postgres: LISTEN/NOTIFY on the app database (no extra infra)
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+import orjson
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+WS_BUS_BACKEND = os.getenv("WS_BUS_BACKEND", "memory")
+WS_BUS_CHANNEL = os.getenv("WS_BUS_CHANNEL", "ws_events")
+WS_BUS_REDIS_URL = os.getenv(
+    "WS_BUS_REDIS_URL", os.getenv("REDIS_URL", "redis://localhost:6379/0")
+)
+# Outgoing publishes itni der tak collect karke ek message mein bhejo
+WS_BUS_BATCH_INTERVAL = float(os.getenv("WS_BUS_BATCH_INTERVAL", "0.01"))  # seconds
+WS_BUS_MAX_BATCH = int(os.getenv("WS_BUS_MAX_BATCH", "100"))
+WS_BUS_DEDUP_SIZE = int(os.getenv("WS_BUS_DEDUP_SIZE", "10000"))
+# postgres backend: pg_notify sends ke liye chhota pool (LISTEN connection alag)
+WS_BUS_PG_SEND_POOL_SIZE = int(os.getenv("WS_BUS_PG_SEND_POOL_SIZE", "2"))
+# Idle LISTEN connection itne seconds mein ek baar ping (half-open TCP pakadne ke liye)
+WS_BUS_PG_HEALTHCHECK_INTERVAL = float(
+    os.getenv("WS_BUS_PG_HEALTHCHECK_INTERVAL", "30")
+)
+
+PayloadHandler = Callable[[str], None]
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+
+class InMemoryBackend:
+    """Process-local pub/sub (tests aur single worker ke liye)"""
+
+    max_payload: Optional[int] = None
+    _subscribers: List[PayloadHandler] = []
+
+    async def connect(self, on_payload: PayloadHandler) -> None:
+        self._on_payload = on_payload
+        InMemoryBackend._subscribers.append(on_payload)
+
+    async def send(self, payload: str) -> None:
+        loop = asyncio.get_running_loop()
+        for subscriber in list(InMemoryBackend._subscribers):
+            loop.call_soon(subscriber, payload)
+
+    async def close(self) -> None:
+        if self._on_payload in InMemoryBackend._subscribers:
+            InMemoryBackend._subscribers.remove(self._on_payload)
+
+
+class RedisBackend:
+    max_payload: Optional[int] = None
+
+    def __init__(self, url: str, channel: str):
+        self.url = url
+        self.channel = channel
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def connect(self, on_payload: PayloadHandler) -> None:
+        import redis.asyncio as redis  # Optional dependency
+
+        self._redis = redis.from_url(self.url, decode_responses=True)
+        self._listener = asyncio.create_task(self._listen(on_payload))
+
+    async def _listen(self, on_payload: PayloadHandler) -> None:
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        on_payload(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"WS bus (redis) listener error: {e}")
+                await asyncio.sleep(1)
+
+    async def send(self, payload: str) -> None:
+        await self._redis.publish(self.channel, payload)
+
+    async def close(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+        if self._redis:
+            await self._redis.close()
+
+
+class PostgresBackend:
+    """
+    LISTEN/NOTIFY, app ke SQLAlchemy pool se alag:
+    - LISTEN ek dedicated asyncpg connection pe; drop hua toh reconnect loop
+    - pg_notify sends apne chhote pool se - LISTEN connection pe kabhi nahi
+      (notification delivery aur sends ek doosre ko block na karein)
+    """
+
+    # NOTIFY payload limit 8000 bytes hai, thoda margin rakho
+    max_payload: Optional[int] = 7900
+
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn
+        self.channel = channel
+        self._conn = None
+        self._pool = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def connect(self, on_payload: PayloadHandler) -> None:
+        import asyncpg  # Optional dependency
+
+        self._pool = await asyncpg.create_pool(
+            self.dsn, min_size=1, max_size=WS_BUS_PG_SEND_POOL_SIZE
+        )
+        self._listener = asyncio.create_task(self._listen(on_payload))
+
+    async def _listen(self, on_payload: PayloadHandler) -> None:
+        import asyncpg
+
+        while True:
+            lost = asyncio.Event()
+            try:
+                self._conn = await asyncpg.connect(self.dsn)
+                self._conn.add_termination_listener(lambda conn: lost.set())
+                await self._conn.add_listener(
+                    self.channel,
+                    lambda conn, pid, channel, payload: on_payload(payload),
+                )
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(
+                            lost.wait(), timeout=WS_BUS_PG_HEALTHCHECK_INTERVAL
+                        )
+                    except asyncio.TimeoutError:
+                        await self._conn.execute("SELECT 1")
+                logger.error("WS bus (postgres) LISTEN connection lost, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"WS bus (postgres) listener error: {e}")
+            if self._conn and not self._conn.is_closed():
+                self._conn.terminate()
+            await asyncio.sleep(1)
+
+    async def send(self, payload: str) -> None:
+        await self._pool.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+
+    async def close(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+        if self._conn and not self._conn.is_closed():
+            await self._conn.close()
+        if self._pool:
+            await self._pool.close()
+
+
+# ============================================================================
+# EVENT BUS
+# ============================================================================
+
+
+class EventBus:
+    """
+    Batches outgoing events and de-duplicates incoming ones.
+
+    publish() never awaits: events are buffered and flushed every
+    WS_BUS_BATCH_INTERVAL (or when WS_BUS_MAX_BATCH is reached) as one
+    backend message. Events from this worker are skipped on receive since
+    they were already delivered locally.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.origin = uuid.uuid4().hex
+        self._handler: Optional[Callable[[dict], None]] = None
+        self._pending: List[dict] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # MAX_BATCH flush aur pending _flush_later saath na bhejein (order + no overlap)
+        self._flush_lock = asyncio.Lock()
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self.published = 0
+        self.received = 0
+        self.duplicates = 0
+
+    @property
+    def started(self) -> bool:
+        return self._handler is not None
+
+    async def start(self, handler: Callable[[dict], None]) -> None:
+        await self.backend.connect(self._on_payload)
+        self._handler = handler
+
+    async def stop(self) -> None:
+        if self._flush_task:
+            self._flush_task.cancel()
+        await self._flush()
+        await self.backend.close()
+        self._handler = None
+
+    def publish(self, event: dict) -> None:
+        if not self.started:
+            return  # Bus nahi chal raha - sirf local delivery
+        event = {"id": uuid.uuid4().hex, **event}
+        self._remember(event["id"])
+        self._pending.append(event)
+        if len(self._pending) >= WS_BUS_MAX_BATCH:
+            asyncio.create_task(self._flush())
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(WS_BUS_BATCH_INTERVAL)
+        await self._flush()
+
+    async def _flush(self) -> None:
+        async with self._flush_lock:
+            batch, self._pending = self._pending, []
+            for payload in self._encode(batch):
+                try:
+                    await self.backend.send(payload)
+                    self.published += 1
+                except Exception as e:
+                    # Local sockets ko mil gaya, sirf doosre workers miss karenge
+                    logger.error(f"WS bus publish failed: {e}")
+
+    def _encode(self, batch: List[dict]) -> List[str]:
+        """Batch ko backend ke payload limit ke hisaab se chunks mein todo"""
+        payloads: List[str] = []
+        chunk: List[dict] = []
+        for event in batch:
+            candidate = self._dump(chunk + [event])
+            limit = self.backend.max_payload
+            if limit and len(candidate.encode()) > limit:
+                if chunk:
+                    payloads.append(self._dump(chunk))
+                    chunk = []
+                if len(self._dump([event]).encode()) > limit:
+                    logger.error(f"WS bus event {event['id']} too large, skipped")
+                    continue
+            chunk.append(event)
+        if chunk:
+            payloads.append(self._dump(chunk))
+        return payloads
+
+    def _dump(self, events: List[dict]) -> str:
+        return orjson.dumps({"origin": self.origin, "events": events}).decode()
+
+    def _on_payload(self, payload: str) -> None:
+        try:
+            data = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            return
+        if data.get("origin") == self.origin or not self._handler:
+            return
+        for event in data.get("events", []):
+            if event.get("id") in self._seen:
+                self.duplicates += 1
+                continue
+            self._remember(event.get("id"))
+            self.received += 1
+            try:
+                self._handler(event)
+            except Exception as e:
+                logger.error(f"WS bus handler error: {e}")
+
+    def _remember(self, event_id: str) -> None:
+        self._seen[event_id] = None
+        while len(self._seen) > WS_BUS_DEDUP_SIZE:
+            self._seen.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "started": self.started,
+            "published_batches": self.published,
+            "received_events": self.received,
+            "duplicates": self.duplicates,
+            "pending": len(self._pending),
+        }
+
+
+def create_event_bus() -> EventBus:
+    if WS_BUS_BACKEND == "redis":
+        return EventBus(RedisBackend(WS_BUS_REDIS_URL, WS_BUS_CHANNEL))
+    if WS_BUS_BACKEND == "postgres":
+        # asyncpg ko plain postgresql:// DSN chahiye
+        dsn = os.getenv("DATABASE_URL", "").replace(
+            "postgresql+asyncpg://", "postgresql://"
+        )
+        return EventBus(PostgresBackend(dsn, WS_BUS_CHANNEL))
+    if WS_BUS_BACKEND == "memory":
+        return EventBus(InMemoryBackend())
+    raise ValueError("WS_BUS_BACKEND must be one of: memory, redis, postgres")
+
+
+event_bus = create_event_bus()
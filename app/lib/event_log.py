@@ -0,0 +1,209 @@
+"""
+Sequenced WebSocket event log (resumable /ws stream).
+
+Har published event ko ek global, monotonically increasing `seq` milta hai
+(ws_events table ki identity column se - saare workers mein unique). Insert
+ek transaction-level advisory lock ke andar hota hai, isliye seq order ==
+commit order: replay `seq > last_seq` baad mein commit hone wala chhota seq
+kabhi skip nahi karta.
+- Durable: ws_events table, WS_EVENT_RETENTION_HOURS tak
+- Hot: har worker mein last WS_EVENT_BUFFER_SIZE events ka ring buffer
+
+Reconnect pe client `last_seq` bhejta hai aur sirf missed events paata hai.
+Gap retention se purana ya WS_EVENT_REPLAY_MAX se bada ho toh client ko
+"full resync required" milta hai.
+"""
+
+import asyncio
+import logging
+import os
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Iterable, List, NamedTuple, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, func, insert, select, text
+
+from app.lib.database import AsyncSessionLocal
+from app.lib.ws_frames import OutboundMessage
+from app.model.ws_event import WsEvent
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+WS_EVENT_BUFFER_SIZE = int(os.getenv("WS_EVENT_BUFFER_SIZE", "1000"))
+# Isse zyada missed events ho toh replay ki jagah full resync
+WS_EVENT_REPLAY_MAX = int(os.getenv("WS_EVENT_REPLAY_MAX", "500"))
+WS_EVENT_RETENTION_HOURS = float(os.getenv("WS_EVENT_RETENTION_HOURS", "24"))
+WS_EVENT_PRUNE_INTERVAL = int(os.getenv("WS_EVENT_PRUNE_INTERVAL", "3600"))  # seconds
+
+# broadcast_to_all events ka topic - har client ke replay mein aata hai
+ALL_TOPICS = "*"
+
+# pg_advisory_xact_lock key - ws_events inserts (seq assignment) serialize karta hai
+WS_EVENT_SEQ_LOCK_KEY = 0x77735F6576656E74  # "ws_event"
+
+
+class LoggedEvent(NamedTuple):
+    seq: int
+    topics: tuple
+    message: OutboundMessage
+
+
+class ResyncRequired(Exception):
+    """Client ka last_seq replay window se bahar hai"""
+
+
+class EventLog:
+    """
+    Ring buffer (per worker) + ws_events table.
+    Buffer `(floor, latest]` range cover karta hai; usse purana gap DB se aata hai.
+    """
+
+    def __init__(self, buffer_size: int = WS_EVENT_BUFFER_SIZE):
+        self._buffer: "deque[LoggedEvent]" = deque()
+        self._buffer_size = buffer_size
+        # Buffer is seq ke baad ke saare events rakhta hai (None = abhi kuch nahi dekha)
+        self._floor: Optional[int] = None
+        self.latest_seq = 0
+        self.replayed = 0
+        self.resyncs = 0
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+
+    async def append(self, topics: List[str], data: dict) -> Optional[int]:
+        """Durable insert, returns seq. DB fail ho toh None (event live-only jaata hai)"""
+        try:
+            async with AsyncSessionLocal() as session:
+                # Identity seq insert order mein milta hai, commit order mein nahi -
+                # lock commit tak hold hota hai, toh seq N+1 tabhi banta hai jab
+                # seq N commit (ya rollback) ho chuka
+                await session.execute(
+                    text("SELECT pg_advisory_xact_lock(:key)"),
+                    {"key": WS_EVENT_SEQ_LOCK_KEY},
+                )
+                result = await session.execute(
+                    insert(WsEvent)
+                    .values(topics=list(topics), payload=data)
+                    .returning(WsEvent.seq)
+                )
+                await session.commit()
+                return result.scalar_one()
+        except Exception as e:
+            logger.error(f"WS event log append failed: {e}")
+            return None
+
+    def record(self, seq: int, topics: Iterable[str], message: OutboundMessage) -> None:
+        """Local ya bus se aaya event buffer mein daalo"""
+        if self._floor is None:
+            self._floor = seq - 1
+        self._buffer.append(LoggedEvent(seq, tuple(topics), message))
+        self.latest_seq = max(self.latest_seq, seq)
+        while len(self._buffer) > self._buffer_size:
+            evicted = self._buffer.popleft()
+            self._floor = max(self._floor, evicted.seq)
+
+    # ------------------------------------------------------------------
+    # Replay path
+    # ------------------------------------------------------------------
+
+    def covers(self, last_seq: int) -> bool:
+        """
+        Buffer se replay tabhi jab (last_seq, latest_seq] ka har seq buffer mein
+        ho. Doosre workers ke events bus se aate hain aur drop ho sakte hain
+        (send failure, oversized payload) - gap mile toh ws_events table se padho.
+        """
+        if self._floor is None or last_seq < self._floor:
+            return False
+        expected = last_seq + 1
+        buffered = {event.seq for event in self._buffer if event.seq > last_seq}
+        for seq in sorted(buffered):
+            if seq != expected:
+                return False
+            expected += 1
+        return expected > self.latest_seq
+
+    def buffered_since(
+        self, last_seq: int, topics: Optional[Iterable[str]]
+    ) -> List[LoggedEvent]:
+        """Buffer se missed events (topics None = admin, sab kuch)"""
+        wanted = None if topics is None else set(topics) | {ALL_TOPICS}
+        events = [
+            event
+            for event in self._buffer
+            if event.seq > last_seq and (wanted is None or wanted.intersection(event.topics))
+        ]
+        # Workers ke events bus se thode out-of-order aa sakte hain
+        events.sort(key=lambda event: event.seq)
+        return events
+
+    async def fetch_since(
+        self, last_seq: int, topics: Optional[Iterable[str]]
+    ) -> List[LoggedEvent]:
+        """
+        ws_events table se missed events (buffer gap cover nahi karta tab).
+        Raises ResyncRequired agar gap retention se purana ya bahut bada hai.
+        """
+        if self.covers(last_seq):
+            return []
+
+        async with AsyncSessionLocal() as session:
+            oldest = await session.scalar(select(func.min(WsEvent.seq)))
+            if oldest is not None and last_seq < oldest - 1:
+                raise ResyncRequired()
+
+            query = select(WsEvent.seq, WsEvent.topics, WsEvent.payload).where(
+                WsEvent.seq > last_seq
+            )
+            if topics is not None:
+                query = query.where(
+                    WsEvent.topics.overlap(list(topics) + [ALL_TOPICS])
+                )
+            query = query.order_by(WsEvent.seq).limit(WS_EVENT_REPLAY_MAX + 1)
+            rows = (await session.execute(query)).all()
+
+        if len(rows) > WS_EVENT_REPLAY_MAX:
+            raise ResyncRequired()
+        return [
+            LoggedEvent(seq, tuple(row_topics), OutboundMessage({**payload, "seq": seq}))
+            for seq, row_topics, payload in rows
+        ]
+
+    # ------------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------------
+
+    async def prune(self) -> int:
+        cutoff = datetime.utcnow() - timedelta(hours=WS_EVENT_RETENTION_HOURS)
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                delete(WsEvent).where(WsEvent.created_at < cutoff)
+            )
+            await session.commit()
+            return result.rowcount
+
+    async def prune_loop(self) -> None:
+        """Background loop (startup pe): retention se purane events delete karo"""
+        while True:
+            await asyncio.sleep(WS_EVENT_PRUNE_INTERVAL)
+            try:
+                deleted = await self.prune()
+                if deleted:
+                    logger.info(f"WS event log pruned {deleted} events")
+            except Exception as e:
+                logger.error(f"WS event log prune failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "latest_seq": self.latest_seq,
+            "buffered": len(self._buffer),
+            "buffer_floor": self._floor,
+            "replayed": self.replayed,
+            "resyncs": self.resyncs,
+        }
+
+
+event_log = EventLog()
@@ -0,0 +1,84 @@
+"""
+Per-request SQL statement counter + per-endpoint query budgets.
+
+Engine ke before_cursor_execute event se har statement gina jaata hai
+(ContextVar - concurrent requests alag count karte hain). Middleware
+request ke end pe count ko endpoint ke budget se compare karta hai:
+- budget cross hua toh warning log (response kabhi nahi badalta - handler
+  tab tak commit kar chuka hota hai)
+- DB_QUERY_COUNT_HEADER=true: X-DB-Queries response header (debugging)
+CI mein budgets tests/test_query_budget.py enforce karta hai (N+1 regressions).
+"""
+
+import logging
+import os
+from contextvars import ContextVar
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+
+from app.lib.database import engine
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DB_QUERY_BUDGET_DEFAULT = int(os.getenv("DB_QUERY_BUDGET_DEFAULT", "20"))
+DB_QUERY_COUNT_HEADER = os.getenv("DB_QUERY_COUNT_HEADER", "false").lower() == "true"
+
+# Route endpoint name -> max SQL statements per request (auth lookup included).
+# Write path badla aur count badha toh yahan consciously update karo.
+QUERY_BUDGETS = {
+    # user lookup + validate(1) + issue/activity INSERTs + notifications
+    # + stats upsert + outbox + response (issue + team projects)
+    "create_issue": 10,
+    # user + issue + validate(1) + activities/notifications/stats/outbox + response
+    "update_issue": 12,
+    "delete_issue": 8,
+    # user + FOR UPDATE + validate + UPDATE + activities/notifications/stats/outbox
+    # + response - issues ki ginti se independent
+    "bulk_update_issues": 12,
+    "get_all_issues": 5,
+    # issue + comments/authors + activities/users + assignee + team/projects
+    "get_issue_by_id": 8,
+    "get_issue_stats": 2,
+    "create_comment": 10,
+    "get_notifications": 2,
+    "get_unread_count": 1,
+}
+
+# Mutable holder - BaseHTTPMiddleware app ko copied context mein chalata hai,
+# isliye ContextVar ki value nahi, list ka item badalte hain
+_query_count: ContextVar[Optional[List[int]]] = ContextVar(
+    "db_query_count", default=None
+)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def start_counting() -> List[int]:
+    counter = [0]
+    _query_count.set(counter)
+    return counter
+
+
+def budget_for(endpoint_name: Optional[str]) -> int:
+    return QUERY_BUDGETS.get(endpoint_name, DB_QUERY_BUDGET_DEFAULT)
+
+
+def check_budget(endpoint_name: Optional[str], path: str, count: int) -> bool:
+    """True agar budget ke andar hai; warna warning log karo"""
+    budget = budget_for(endpoint_name)
+    if count <= budget:
+        return True
+    logger.warning(
+        f"Query budget exceeded: {endpoint_name or path} ran {count} SQL "
+        f"statements (budget {budget})"
+    )
+    return False
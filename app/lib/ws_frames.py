@@ -0,0 +1,93 @@
+"""
+Serialize-once WebSocket frames.
+
+Broadcast ka payload har recipient ke liye dobara encode nahi hota:
+OutboundMessage har wire format ko pehli baar maangne pe encode karke
+cache kar leta hai, aur saare sockets wahi str/bytes object reuse karte hain.
+
+Wire formats (client `/ws?encoding=...` se choose karta hai):
+- json: text frame (default, existing clients)
+- msgpack: binary frame (msgpack package install hona chahiye)
+- deflate: binary frame, raw DEFLATE compressed JSON (browser mein
+  DecompressionStream("deflate-raw") se decode hota hai)
+"""
+
+import os
+import zlib
+from typing import Any, Dict, Optional, Tuple, Union
+
+import orjson
+from dotenv import load_dotenv
+
+try:
+    import msgpack  # Optional dependency, sirf binary clients ke liye
+except ImportError:
+    msgpack = None
+
+load_dotenv()
+
+WS_DEFLATE_LEVEL = int(os.getenv("WS_DEFLATE_LEVEL", "6"))
+
+ENCODINGS = ("json", "msgpack", "deflate")
+
+Frame = Union[str, bytes]
+
+# Per-format encode counters (per worker) - /health/ws pe dikhte hain
+encode_counts: Dict[str, int] = {encoding: 0 for encoding in ENCODINGS}
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    return tuple(e for e in ENCODINGS if e != "msgpack" or msgpack is not None)
+
+
+def dumps(data: Any) -> str:
+    """orjson encode (UUID/datetime natively handle hote hain)"""
+    return orjson.dumps(data).decode()
+
+
+class OutboundMessage:
+    """
+    One broadcast payload, lazily encoded once per wire format.
+    Create it from a dict (local publish) or from already-encoded JSON text
+    (event bus se aaya hua) - dono cases mein JSON dobara nahi banta.
+    """
+
+    __slots__ = ("_data", "_frames")
+
+    def __init__(self, data: Optional[dict] = None, text: Optional[str] = None):
+        self._data = data
+        self._frames: Dict[str, Frame] = {}
+        if text is not None:
+            self._frames["json"] = text
+
+    @classmethod
+    def from_text(cls, text: str) -> "OutboundMessage":
+        return cls(text=text)
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            self._data = orjson.loads(self._frames["json"])
+        return self._data
+
+    @property
+    def text(self) -> str:
+        return self.frame("json")
+
+    def frame(self, encoding: str) -> Frame:
+        frame = self._frames.get(encoding)
+        if frame is None:
+            frame = self._frames[encoding] = self._encode(encoding)
+            encode_counts[encoding] += 1
+        return frame
+
+    def _encode(self, encoding: str) -> Frame:
+        if encoding == "json":
+            return dumps(self._data)
+        if encoding == "msgpack":
+            return msgpack.packb(self.data, default=str)
+        if encoding == "deflate":
+            compressor = zlib.compressobj(WS_DEFLATE_LEVEL, zlib.DEFLATED, -15)
+            raw = self.text.encode()
+            return compressor.compress(raw) + compressor.flush()
+        raise ValueError(f"Unknown WebSocket encoding: {encoding}")
@@ -1,8 +1,22 @@
 from fastapi import FastAPI, status, Request
 from fastapi.responses import JSONResponse
+import asyncio
 import logging
 
-from .lib.database import engine, Base
+from .lib.cache import invalidation_bus
+from .connectionManager import connection_manager
+from .lib.event_log import event_log
+from .services.sync import SyncService
+from .services.outbox import outbox_dispatcher
+from .lib import query_budget
+from .pagination import InvalidCursorError, invalid_cursor_handler
+from .lib.database import (
+    engine,
+    Base,
+    DB_POOL_LOG_INTERVAL,
+    get_pool_status,
+    pool_status_logger,
+)
 
 # Iska matlab hai models wali file load karo taaki Base ko pata chale kitni tables hain
 from . import model
@@ -51,6 +65,8 @@ app = FastAPI(
 # Add rate limiting
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
+# Cursor kisi aur listing ka ho (CRUDBase._paginate) -> 400 "Invalid cursor"
+app.add_exception_handler(InvalidCursorError, invalid_cursor_handler)
 
 # Ensure static directory exists
 os.makedirs("static", exist_ok=True)
@@ -84,6 +100,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def query_budget_middleware(request: Request, call_next):
+    """Per-request SQL statement count vs endpoint budget (app.lib.query_budget)"""
+    counter = query_budget.start_counting()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    endpoint_name = getattr(route, "name", None)
+    # Sirf log - handler commit kar chuka hai, response badalna galat hoga.
+    # Budgets tests/test_query_budget.py mein enforce hote hain.
+    query_budget.check_budget(endpoint_name, request.url.path, counter[0])
+    if query_budget.DB_QUERY_COUNT_HEADER:
+        response.headers["X-DB-Queries"] = str(counter[0])
+    return response
+
 # ============================================================================
 # Backward Compatibility - Deprecated (Will be removed in V2)
 # ============================================================================
@@ -136,7 +167,56 @@ async def health_check():
     return {"status": "online", "database": "checking..."}
 
 
+@app.get("/health/db-pool")
+async def db_pool_status():
+    """
+    Connection pool checkouts/overflow/waits/timeouts (per worker) - pool sizing
+    ke liye. waits + wait_ms_avg/max: free connection ke liye kitna ruke.
+    """
+    return get_pool_status()
+
+
+@app.get("/health/cache")
+async def cache_status():
+    """In-process cache hit/miss counters (per worker)"""
+    return invalidation_bus.stats()
+
+
+@app.get("/health/ws")
+async def websocket_status():
+    """WebSocket connections, queued and dropped messages (per worker)"""
+    return {**connection_manager.stats(), "outbox": outbox_dispatcher.stats()}
+
+
 @app.on_event("startup")
 async def startup():
     # Alembic ab migrations handle karega, auto-create ki zarurat nahi
     print("Server started! Use 'alembic upgrade head' for migrations.")
+
+    # Optional periodic pool status log line (DB_POOL_LOG_INTERVAL seconds)
+    if DB_POOL_LOG_INTERVAL > 0:
+        app.state.pool_logger_task = asyncio.create_task(pool_status_logger())
+
+    # Cross-worker WebSocket event bus (WS_BUS_BACKEND)
+    await connection_manager.start()
+
+    # Resumable WS stream: retention se purane ws_events delete karo
+    app.state.ws_event_prune_task = asyncio.create_task(event_log.prune_loop())
+
+    # Transactional outbox: WebSocket/email side effects commit ke baad
+    app.state.outbox_task = asyncio.create_task(outbox_dispatcher.run())
+
+    # Delta sync: retention se purane tombstones delete karo
+    app.state.sync_prune_task = asyncio.create_task(
+        SyncService.prune_tombstones_loop()
+    )
+
+    # Shared cache backend: doosre workers ke invalidations suno
+    if invalidation_bus.enabled:
+        app.state.cache_listener_task = asyncio.create_task(invalidation_bus.listen())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Pending bus publishes flush karo
+    await connection_manager.stop()
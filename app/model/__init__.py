@@ -10,7 +10,11 @@ from .comment import Comment
 from .activity import Activity
 from .attached import Attachment
 from .cycle import Cycle
-from .notification import Notification
+from .notification import Notification, NotificationArchive
+from .ws_event import WsEvent
+from .tombstone import SyncTombstone
+from .outbox import OutboxEvent
+from .issue_stat import IssueStat
 
 __all__ = [
     "User",
@@ -23,4 +27,9 @@ __all__ = [
     "Attachment",
     "Cycle",
     "Notification",
+    "NotificationArchive",
+    "WsEvent",
+    "SyncTombstone",
+    "OutboxEvent",
+    "IssueStat",
 ]
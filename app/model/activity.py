@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -18,7 +18,19 @@ class Activity(Base):
     old_value = Column(String, nullable=True)
     new_value = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+        index=True,
+    )
 
     # Relationships
     issue = relationship("Issue", back_populates="activities")
     user = relationship("User")
+
+    __table_args__ = (
+        # Issue detail: activities WHERE issue_id (IN ...) ORDER BY created_at
+        Index("ix_activities_issue_created", "issue_id", "created_at"),
+    )
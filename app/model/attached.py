@@ -12,7 +12,7 @@ class Attachment(Base): # Naam thoda professional 'Attachment' rakhte hain
     file_path = Column(String, nullable=False) # Storage path (e.g. static/uuid_bug.png)
     
     # Kiske liye hai? (Relationship with Issue)
-    issue_id = Column(UUID(as_uuid=True), ForeignKey("issues.id", ondelete="CASCADE"), nullable=False)
+    issue_id = Column(UUID(as_uuid=True), ForeignKey("issues.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Kisne kiya? (Relationship with User)
     uploader_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index, func, literal_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -16,7 +16,25 @@ class Comment(Base):
     author_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"))
 
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+        index=True,
+    )
 
     # Relationships
     issue = relationship("Issue", back_populates="comments")
     author = relationship("User")
+
+    # Optional comment search (/issues/search?include_comments=true)
+    __table_args__ = (
+        # Issue ke comments: WHERE issue_id ORDER BY created_at DESC
+        Index("ix_comments_issue_created", "issue_id", "created_at"),
+        Index(
+            "ix_comments_content_fts",
+            func.to_tsvector(literal_column("'english'::regconfig"), content),
+            postgresql_using="gin",
+        ),
+    )
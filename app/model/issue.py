@@ -1,6 +1,15 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, Text, DateTime
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Column,
+    Computed,
+    String,
+    Integer,
+    ForeignKey,
+    Text,
+    DateTime,
+    Index,
+)
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 import uuid
 from datetime import datetime
 from ..lib.database import Base
@@ -23,6 +32,28 @@ class Issue(Base):
     parent_id = Column(UUID(as_uuid=True), ForeignKey("issues.id"), nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Delta sync (/sync?since=) ka cursor column - har ORM/Core UPDATE pe badalta hai
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+        index=True,
+    )
+
+    # Full-text search: title (weight A) ranks above description (weight B)
+    # Postgres khud maintain karta hai (generated column), app kabhi write nahi karta
+    # Deferred: sirf WHERE/ORDER BY mein use hota hai, SELECT mein load nahi hota
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+        )
+    )
 
     # Relationships
     creator = relationship("User", foreign_keys=[creator_id])
@@ -33,3 +64,31 @@ class Issue(Base):
     activities = relationship("Activity", back_populates="issue")
     cycle_id = Column(UUID(as_uuid=True), ForeignKey("cycles.id"), nullable=True)
     cycle = relationship("Cycle", back_populates="issues")
+
+    __table_args__ = (
+        # Listings filter on one FK and page by (created_at, id) - _paginate keyset.
+        # get_issues_for_user ka OR (team/creator/assignee) BitmapOr se inhi ko use karta hai
+        Index("ix_issues_team_created", "team_id", "created_at", "id"),
+        Index("ix_issues_project_created", "project_id", "created_at", "id"),
+        Index("ix_issues_assignee_created", "assignee_id", "created_at", "id"),
+        Index("ix_issues_creator_created", "creator_id", "created_at", "id"),
+        # Zyada issues cycle/parent ke bina hote hain - partial indexes chhote rehte hain
+        Index(
+            "ix_issues_cycle_id",
+            "cycle_id",
+            postgresql_where=cycle_id.is_not(None),
+        ),
+        Index(
+            "ix_issues_parent_id",
+            "parent_id",
+            postgresql_where=parent_id.is_not(None),
+        ),
+        Index("ix_issues_search_vector", "search_vector", postgresql_using="gin"),
+        # pg_trgm: ILIKE '%q%' substring + fuzzy (word_similarity) title search
+        Index(
+            "ix_issues_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
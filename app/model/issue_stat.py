@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, SmallInteger, String
+from ..lib.database import Base
+
+
+class IssueStat(Base):
+    """
+    Dashboard counters - IssueService har create/update/delete pe same
+    transaction mein +1/-1 apply karta hai, isliye dashboard ko issues table
+    scan nahi karni padti.
+
+    scope: "all" | "team:<id>" | "creator:<id>"
+    dimension: "total" (value "") | "status" | "priority"
+    slot: har counter ISSUE_STATS_SLOTS rows mein bata hai (writer random slot
+    chunta hai, read pe SUM) - "all" row pe saare issue writes ek lock pe na rukein
+    Drift ho jaye toh: python scripts/rebuild_issue_stats.py
+    """
+
+    __tablename__ = "issue_stats"
+
+    scope = Column(String(80), primary_key=True)
+    dimension = Column(String(20), primary_key=True)
+    value = Column(String(50), primary_key=True)
+    slot = Column(SmallInteger, primary_key=True, default=0, server_default="0")
+    count = Column(BigInteger, default=0, server_default="0", nullable=False)
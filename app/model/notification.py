@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -16,7 +16,53 @@ class Notification(Base):
     issue_id = Column(UUID(as_uuid=True), ForeignKey("issues.id", ondelete="SET NULL"), nullable=True)
     read = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # read flag badalne pe bhi badalta hai - sync clients ko read state milti hai
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+        index=True,
+    )
 
     # Relationships
     user = relationship("User", backref="notifications")
     issue = relationship("Issue", backref="notifications")
+
+    __table_args__ = (
+        # Unread badge count: sirf unread rows index mein, count index se hi
+        Index(
+            "ix_notifications_user_unread",
+            "user_id",
+            postgresql_where=read.is_(False),
+        ),
+        # List endpoint: WHERE user_id ORDER BY created_at DESC (+ keyset cursor)
+        Index("ix_notifications_user_created", user_id, created_at.desc()),
+        # Retention task: purane read rows batch mein dhoondhna
+        Index(
+            "ix_notifications_read_created",
+            created_at,
+            postgresql_where=read.is_(True),
+        ),
+    )
+
+
+class NotificationArchive(Base):
+    """
+    Retention task (NOTIFICATION_RETENTION_MODE=archive) purane read
+    notifications yahan move karta hai. Koi FK nahi - user/issue delete
+    hone pe bhi archive rehta hai.
+    """
+
+    __tablename__ = "notifications_archive"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    title = Column(String(255), nullable=False)
+    message = Column(String(1000), nullable=False)
+    type = Column(String(50), nullable=False)
+    issue_id = Column(UUID(as_uuid=True), nullable=True)
+    read = Column(Boolean, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
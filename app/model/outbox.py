@@ -0,0 +1,31 @@
+from sqlalchemy import BigInteger, Column, DateTime, Identity, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+from ..lib.database import Base
+
+
+class OutboxEvent(Base):
+    """
+    Transactional outbox - domain change ke saath same transaction mein likha
+    jaata hai. OutboxDispatcher baad mein side effects (WebSocket, email) karta hai,
+    isliye commit hua toh event kabhi lost nahi hota.
+    """
+
+    __tablename__ = "outbox_events"
+
+    id = Column(BigInteger, Identity(always=True), primary_key=True)
+    event_type = Column(String(50), nullable=False)  # issue.created, comment.created ...
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    processed_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, default=0, server_default="0", nullable=False)
+    last_error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        # Dispatcher sirf pending rows padhta hai - chhota partial index
+        Index(
+            "ix_outbox_events_pending",
+            "id",
+            postgresql_where=processed_at.is_(None),
+        ),
+    )
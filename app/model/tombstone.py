@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, DateTime, Identity, Index, String
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from datetime import datetime
+from ..lib.database import Base
+
+
+class SyncTombstone(Base):
+    """
+    Deleted rows ka record - delta sync clients apne local store se hata sakein.
+    Row delete ho chuki hai, isliye visibility `topics` mein save hoti hai
+    (wahi team:/project:/user: topics jo WebSocket events use karte hain).
+    """
+
+    __tablename__ = "sync_tombstones"
+
+    id = Column(BigInteger, Identity(always=True), primary_key=True)
+    entity_type = Column(String(20), nullable=False)  # issue, comment, notification
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    topics = Column(ARRAY(String), nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    __table_args__ = (
+        Index("ix_sync_tombstones_topics", "topics", postgresql_using="gin"),
+    )
@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, String, ForeignKey, DateTime
+from sqlalchemy import Column, String, ForeignKey, DateTime, Integer
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -25,6 +25,8 @@ class User(Base):
     role = Column(SQLAlchemyEnum(UserRole), default=UserRole.MEMBER, nullable=False)
     team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id"), nullable=True)
     avatar_url = Column(String, nullable=True)
+    # Role/team change ya delete pe badhta hai - purane JWT claims invalid ho jaate hain
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
 
     # Relationships
     created_issues = relationship(
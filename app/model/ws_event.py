@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, DateTime, Identity, Index, String
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from datetime import datetime
+from ..lib.database import Base
+
+
+class WsEvent(Base):
+    """
+    Durable WebSocket event log - resumable /ws stream ke liye.
+    `seq` saare workers mein globally monotonic hai (identity column).
+    """
+
+    __tablename__ = "ws_events"
+
+    seq = Column(BigInteger, Identity(always=True), primary_key=True)
+    # Event kin topics pe gaya tha ("*" = sabko, broadcast_to_all)
+    topics = Column(ARRAY(String), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    __table_args__ = (
+        # Replay query: topics && ARRAY[...] (client ke subscribed topics)
+        Index("ix_ws_events_topics", "topics", postgresql_using="gin"),
+    )
@@ -1,5 +1,8 @@
 from jose import JWTError, jwt
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
 import os
 from dotenv import load_dotenv
 from fastapi import Depends, status, HTTPException
@@ -7,7 +10,8 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from .lib.database import get_db
-from .model import User  # Refactored: direct import instead of model.User
+from .lib.cache import user_cache, token_version_cache
+from .model import User, UserRole  # Refactored: direct import instead of model.User
 
 # .env file se environment variables load karo
 load_dotenv()
@@ -47,32 +51,160 @@ def create_access_token(data: dict):
     return encoded_jwt
 
 
-# Protect  route  the code
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
-):
-    # 1. Pehle ek standard error message bana lo
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Bhai, tera token sahi nahi hai ya expire ho gaya!",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str) -> dict:
     try:
-        # 2 Token ko decode (Unlock) karo
+        # Token ko decode (Unlock) karo
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        # 3. Payload se ID nikaalo (Humne login mein 'sub' mein ID/Email dali thi)
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
     except JWTError:
         # Agar token kisi ne tampered kiya ya algorithm galat hai
-        raise credentials_exception
-    # 4. Database mein check karo ki ye user asali hai ya nahi
-    query = select(User).where(User.email == user_id)
-    result = await db.execute(query)
-    user = result.scalars().first()
-    if user is None:
-        raise credentials_exception
-
-    # 5. Sab sahi raha toh 'user' ka pura object return kar do
-    return user
+        raise _credentials_exception()
+    # Payload se ID nikaalo (Humne login mein 'sub' mein Email dali thi)
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+    return payload
+
+
+# Protect  route  the code
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+) -> "AuthenticatedUser":
+    """
+    Read-only authenticated user (session mein attach nahi hota).
+    Write paths ko User row chahiye toh khud load karein (e.g. UserService).
+    """
+    # 1. Token decode karo
+    payload = _decode_token(token)
+    user_id: str = payload["sub"]
+
+    # 2. Cache check karo, warna Database mein check karo ki ye user asali hai ya nahi
+    snapshot = user_cache.get(user_id)
+    if snapshot is None:
+        query = select(User).where(User.email == user_id)
+        result = await db.execute(query)
+        user = result.scalars().first()
+        if user is None:
+            raise _credentials_exception()
+        snapshot = asdict(AuthenticatedUser.from_user(user))
+        user_cache.set(user_id, snapshot)
+
+    # 3. Har request ko apna immutable instance
+    return AuthenticatedUser(**snapshot)
+
+
+# ============================================================================
+# Claims-based auth (read-only endpoints) - DB lookup ke bina authorize karo
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Lightweight authenticated identity built from token claims.
+    Has the attributes check_permission/policies need (id, role, team_id),
+    so read-only endpoints can use it instead of the ORM User.
+    """
+
+    id: UUID
+    email: str
+    role: UserRole
+    team_id: Optional[UUID] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, email=user.email, role=user.role, team_id=user.team_id)
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser(Principal):
+    """
+    get_current_user ka result (aur user_cache mein yahi fields jaate hain).
+    Whitelist: authorization fields + profile fields jo /users/me aur
+    notifications dikhate hain. hashed_password / token_version kabhi cache nahi.
+    """
+
+    full_name: Optional[str] = None
+    avatar_url: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthenticatedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=UserRole(user.role),
+            team_id=user.team_id,
+            full_name=user.full_name,
+            avatar_url=user.avatar_url,
+        )
+
+
+def build_token_claims(user: User) -> dict:
+    """Login pe token mein daalne wale claims (create_access_token ko pass karo)"""
+    return {
+        "sub": user.email,
+        "uid": str(user.id),
+        "role": UserRole(user.role).value,
+        "team_id": str(user.team_id) if user.team_id else None,
+        "ver": user.token_version or 0,
+    }
+
+
+async def _get_token_version(db: AsyncSession, user_id: UUID) -> Optional[int]:
+    """
+    Current token version (revocation counter) - cached, sirf miss pe
+    ek chhota SELECT. Role change / delete pe UserService invalidate karta hai.
+    """
+    key = str(user_id)
+    version = token_version_cache.get(key)
+    if version is not None:
+        return version
+
+    result = await db.execute(select(User.token_version).where(User.id == user_id))
+    version = result.scalar_one_or_none()
+    if version is not None:
+        token_version_cache.set(key, version)
+    return version
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+) -> Principal:
+    return await authenticate_token(token, db)
+
+
+async def authenticate_token(token: str, db: AsyncSession) -> Principal:
+    """
+    Token -> Principal (claims + token_version check). HTTP dependencies aur
+    /ws dono yahi use karte hain - revoke hua token kahin bhi kaam na kare.
+    Raises HTTPException 401.
+    """
+    payload = _decode_token(token)
+
+    # Purana token (sirf 'sub') - full user load karke principal banao
+    if "uid" not in payload:
+        user = await get_current_user(token=token, db=db)
+        return Principal.from_user(user)
+
+    try:
+        principal = Principal(
+            id=UUID(payload["uid"]),
+            email=payload["sub"],
+            role=UserRole(payload["role"]),
+            team_id=UUID(payload["team_id"]) if payload.get("team_id") else None,
+        )
+    except (KeyError, ValueError):
+        raise _credentials_exception()
+
+    # Role/team change ke baad purane claims reject karo (re-login required)
+    current_version = await _get_token_version(db, principal.id)
+    if current_version is None or current_version != payload.get("ver", 0):
+        raise _credentials_exception()
+
+    return principal
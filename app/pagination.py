@@ -0,0 +1,131 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+from uuid import UUID
+
+from fastapi import HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse
+
+
+class InvalidCursorError(ValueError):
+    """Cursor tampered hai ya kisi aur listing (keyset columns) ka hai"""
+
+
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    """CRUD layer cursor reject kare toh 400 (CursorParams wala hi response)"""
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST, content={"detail": "Invalid cursor"}
+    )
+
+
+def encode_cursor(item: Any) -> str:
+    """
+    Opaque cursor banata hai last row ki (created_at, id) position se.
+    Models without created_at (users, teams, projects) sirf id use karte hain.
+    """
+    created_at = getattr(item, "created_at", None)
+    payload = {
+        "created_at": created_at.isoformat() if created_at else None,
+        "id": str(item.id),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Cursor ko wapas position dict mein convert karta hai: {"created_at", "id"},
+    ya sirf {"id"} un models ke liye jinke paas created_at nahi hai.
+    Raises InvalidCursorError agar cursor tampered/invalid hai.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        position = {"id": UUID(payload["id"])}
+        created_at = payload.get("created_at")
+        if created_at:
+            position["created_at"] = datetime.fromisoformat(created_at)
+        return position
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+# (changed_at, id) of the last row sent - tombstones ki id bigint hai, baaki UUID
+SyncPosition = Tuple[datetime, Union[UUID, int]]
+
+
+def encode_sync_cursor(
+    since: Optional[datetime], after: Optional[Dict[str, SyncPosition]] = None
+) -> str:
+    """
+    Delta sync cursor - opaque, client sirf wapas bhejta hai.
+    `since` None = initial full sync abhi chal raha hai.
+    `after`: entity -> last (changed_at, id) jo bheja ja chuka (has_more paging);
+    jis entity ki position nahi wo `since` se (inclusive) padhi jaati hai.
+    """
+    payload = {"since": since.isoformat() if since else None}
+    if after:
+        payload["after"] = {
+            name: [
+                changed_at.isoformat(),
+                row_id if isinstance(row_id, int) else str(row_id),
+            ]
+            for name, (changed_at, row_id) in after.items()
+        }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_sync_cursor(
+    cursor: str,
+) -> Tuple[Optional[datetime], Dict[str, SyncPosition]]:
+    """(since, after) - raises ValueError agar cursor tampered/invalid hai"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        after = {
+            str(name): (
+                datetime.fromisoformat(changed_at),
+                row_id if isinstance(row_id, int) else UUID(row_id),
+            )
+            for name, (changed_at, row_id) in payload.get("after", {}).items()
+        }
+        since = payload["since"]
+        return (datetime.fromisoformat(since) if since else None), after
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+class CursorParams:
+    """
+    Keyset pagination dependency.
+    - `cursor` missing: legacy offset mode (skip/limit), plain list response
+    - `cursor=` (empty): first page in cursor mode
+    - `cursor=<next_cursor>`: page after the given position
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(
+            None,
+            description="Opaque keyset cursor. Pass empty for the first page, "
+            "then the previous response's next_cursor.",
+        ),
+    ):
+        self.enabled = cursor is not None
+        # {} = first page, None = offset mode
+        self.after: Optional[dict] = None
+        if self.enabled:
+            try:
+                self.after = decode_cursor(cursor) if cursor else {}
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+                )
+
+    @staticmethod
+    def page(items: List[Any], limit: int) -> dict:
+        # Full page mila toh aage aur rows ho sakti hain
+        next_cursor = encode_cursor(items[-1]) if items and len(items) >= limit else None
+        return {"items": items, "next_cursor": next_cursor}
@@ -29,7 +29,7 @@ async def create_attachment(
 async def get_attachments_by_issue(
     issue_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: model.User = Depends(oauth2.get_current_user),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
 ):
     return await AttachmentService.get_by_issue(db, issue_id=issue_id)
 
@@ -38,7 +38,7 @@ async def get_attachments_by_issue(
 async def get_attachment(
     attachment_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: model.User = Depends(oauth2.get_current_user),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
 ):
     return await AttachmentService.get(db, attachment_id=attachment_id)
 
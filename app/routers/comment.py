@@ -28,7 +28,7 @@ async def create_comment(
 async def get_all_comments(
     issue_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: model.User = Depends(oauth2.get_current_user),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
 ):
     return await CommentService.get_all_by_issue(db, issue_id=issue_id)
 
@@ -42,7 +42,7 @@ async def get_comment_by_id(
     issue_id: UUID,
     comment_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: model.User = Depends(oauth2.get_current_user),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
 ):
     return await CommentService.get(db, id=comment_id, issue_id=issue_id)
 
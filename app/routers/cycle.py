@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -6,23 +6,32 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, schemas
 from app.lib.database import get_db
+from app.pagination import CursorParams
 
 router = APIRouter(prefix="/cycles", tags=["Cycles"])
 
 
-@router.get("/", response_model=List[schemas.CycleOut])
+@router.get(
+    "/",
+    response_model=Union[List[schemas.CycleOut], schemas.Page[schemas.CycleOut]],
+)
 async def read_cycles(
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
     team_id: Optional[UUID] = None,
+    pagination: CursorParams = Depends(),
 ):
     if team_id:
         cycles = await crud.cycle.get_multi_by_team(
-            db, team_id=team_id, skip=skip, limit=limit
+            db, team_id=team_id, skip=skip, limit=limit, cursor=pagination.after
         )
     else:
-        cycles = await crud.cycle.get_multi(db, skip=skip, limit=limit)
+        cycles = await crud.cycle.get_multi(
+            db, skip=skip, limit=limit, cursor=pagination.after
+        )
+    if pagination.enabled:
+        return pagination.page(cycles, limit)
     return cycles
 
 
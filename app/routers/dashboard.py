@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, status, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
 from .. import model, oauth2
 from ..lib.database import get_db
 from ..model.issue import Issue
-from ..schemas.dashboard import DashboardOut
-from ..schemas.issue import IssueStatus
-from ..crud.issue import issue
+from ..schemas.dashboard import DashboardOut, ScopedDashboardOut
+from ..crud.issue_stats import issue_stats
+from ..services.dashboard import DashboardService
 
 # api router for dashboard
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
@@ -13,26 +14,36 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 @router.get("/", response_model=DashboardOut)
 async def get_dashboard(db: AsyncSession = Depends(get_db)):
-    # get stats from crud
-    stats = await issue.get_stats(db)
+    # Incrementally maintained counters (issue_stats) - issues table scan nahi
+    stats = await issue_stats.get(db)
 
-    # Extract data safely
-    total_count = stats.get("total_count", 0)
-    status_counts = stats.get("status_counts", {})
-    priority_counts = stats.get("priority_counts", {})
+    return DashboardOut(**DashboardService.summarize(stats))
 
-    # Calculate completed issues safely using Enum
-    completed_issues = status_counts.get(IssueStatus.DONE.value, 0)
 
-    # Linear calculation (Complexity 1)
-    progress_percentage = (
-        (completed_issues / total_count * 100) if total_count > 0 else 0.0
+@router.get("/teams/{team_id}", response_model=ScopedDashboardOut)
+async def get_team_dashboard(
+    team_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
+):
+    """
+    Team dashboard: stats + recently updated / overdue / high priority issues.
+    Visibility get_issues_for_user wali (SQL mein); short TTL cache per team.
+    """
+    return await DashboardService.get_team_dashboard(
+        db, team_id=team_id, current_user=current_user
     )
 
-    return DashboardOut(
-        status_counts=status_counts,
-        priority_counts=priority_counts,
-        total_issues=total_count,
-        completed_issues=completed_issues,
-        progress_percentage=round(progress_percentage, 2),
+
+@router.get("/projects/{project_id}", response_model=ScopedDashboardOut)
+async def get_project_dashboard(
+    project_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
+):
+    """
+    Project dashboard - same shape as the team dashboard.
+    """
+    return await DashboardService.get_project_dashboard(
+        db, project_id=project_id, current_user=current_user
     )
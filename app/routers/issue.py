@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Request
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
@@ -8,9 +8,9 @@ from app.permission import check_permission
 from ..lib.database import get_db
 from ..services.issue import IssueService
 from ..filters import IssueFilters
-from app.connectionManager import connection_manager
+from ..pagination import CursorParams
+from typing import List, Literal, Union
 from app.middleware.rate_limiter import limiter
-import json
 
 router = APIRouter(prefix="/issues", tags=["Issues"])
 
@@ -29,49 +29,48 @@ async def create_issue(
     """
     check_permission(current_user, "issue", "create")
     new_issue = await IssueService.create(db, issue_in=issue, current_user=current_user)
-
-    # Broadcast notification to ALL connected users
-    print(f"🔔 Broadcasting ISSUE_CREATED for issue {new_issue.id} to all users")
-    await connection_manager.broadcast_to_all(
-        json.dumps(
-            {
-                "event": "ISSUE_CREATED",
-                "issue_id": str(new_issue.id),
-                "title": new_issue.title,
-                "project_id": (
-                    str(new_issue.project_id) if new_issue.project_id else None
-                ),
-            }
-        ),
-    )
-
+    # WebSocket event outbox dispatcher bhejta hai (commit ke baad)
     return new_issue
 
 
-@router.get("/", status_code=status.HTTP_200_OK, response_model=list[schemas.IssueOut])
+@router.get(
+    "/",
+    status_code=status.HTTP_200_OK,
+    response_model=Union[list[schemas.IssueOut], schemas.Page[schemas.IssueOut]],
+)
 @limiter.limit("100/minute")  # Generous for reads
 async def get_all_issues(
     request: Request,
     filters: IssueFilters = Depends(),
+    pagination: CursorParams = Depends(),
     skip: int = 0,
     limit: int = 10,
     db: AsyncSession = Depends(get_db),
-    current_user: model.User = Depends(oauth2.get_current_user),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
 ):
     """
     Retrieve a list of issues with optional filtering and pagination.
+    Pass `cursor` for keyset pagination ({items, next_cursor} response).
     Delegates to IssueService.get_all
     """
-    return await IssueService.get_all(
-        db, filters=filters, skip=skip, limit=limit, current_user=current_user
+    issues = await IssueService.get_all(
+        db,
+        filters=filters,
+        skip=skip,
+        limit=limit,
+        cursor=pagination.after,
+        current_user=current_user,
     )
+    if pagination.enabled:
+        return pagination.page(issues, limit)
+    return issues
 
 
 @router.get("/export", status_code=status.HTTP_200_OK)
 async def export_issues(
     filters: IssueFilters = Depends(),
     db: AsyncSession = Depends(get_db),
-    current_user: model.User = Depends(oauth2.get_current_user),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
 ):
     """
     Export filtered issues to a CSV file.
@@ -81,7 +80,9 @@ async def export_issues(
 
 
 @router.get(
-    "/search", status_code=status.HTTP_200_OK, response_model=list[schemas.IssueOut]
+    "/search",
+    status_code=status.HTTP_200_OK,
+    response_model=list[schemas.IssueSearchResult],
 )
 @limiter.limit("50/minute")  # Moderate limit for search
 async def search_issues(
@@ -89,14 +90,36 @@ async def search_issues(
     q: str,
     skip: int = 0,
     limit: int = 20,
+    include_comments: bool = False,
     db: AsyncSession = Depends(get_db),
-    current_user: model.User = Depends(oauth2.get_current_user),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
 ):
     """
-    Global search for issues.
+    Global ranked full-text search for issues (prefix matching, highlights).
     Delegates to IssueService.search
     """
-    return await IssueService.search(db, q=q, skip=skip, limit=limit)
+    return await IssueService.search(
+        db, q=q, skip=skip, limit=limit, include_comments=include_comments
+    )
+
+
+@router.get("/stats", response_model=schemas.IssueStats)
+async def get_issue_stats(
+    dimension: List[Literal["team", "project", "assignee", "cycle"]] = Query(
+        [],
+        description="Extra breakdowns, e.g. ?dimension=team&dimension=assignee",
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
+):
+    """
+    Get aggregated statistics.
+    Declared before GET /{id} so "stats" is not parsed as an id.
+    Delegates to IssueService.get_stats
+    """
+    return await IssueService.get_stats(
+        db, current_user=current_user, dimensions=list(dict.fromkeys(dimension))
+    )
 
 
 @router.get(
@@ -105,7 +128,7 @@ async def search_issues(
 async def get_issue_by_id(
     id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: model.User = Depends(oauth2.get_current_user),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
 ):
     """
     Get detailed information about a specific issue.
@@ -116,6 +139,36 @@ async def get_issue_by_id(
     return issue
 
 
+@router.patch(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.IssueBulkUpdateResult,
+)
+@limiter.limit("30/minute")
+async def bulk_update_issues(
+    request: Request,
+    body: schemas.IssueBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: model.User = Depends(oauth2.get_current_user),
+):
+    """
+    Apply one change set to many issues (triage).
+    All-or-nothing: any missing id -> 404, any forbidden issue -> 403.
+    Declared before PATCH /{id} so "bulk" is not parsed as an id.
+    Delegates to IssueService.bulk_update
+    """
+    issues = await IssueService.get_many_for_write(
+        db, ids=list(dict.fromkeys(body.ids))
+    )
+    for issue in issues:
+        check_permission(current_user, "issue", "update", resource=issue)
+
+    updated = await IssueService.bulk_update(
+        db, issues=issues, issue_in=body.changes, current_user=current_user
+    )
+    return {"affected": len(updated), "issues": updated}
+
+
 @router.patch("/{id}", status_code=status.HTTP_200_OK, response_model=schemas.IssueOut)
 async def update_issue(
     id: UUID,
@@ -127,26 +180,13 @@ async def update_issue(
     Update an existing issue.
     Delegates to IssueService.update
     """
-    # Fetch first to check permission
-    issue = await IssueService.get(db, id=id, current_user=current_user)
+    # Fetch first to check permission (plain row, no relations)
+    issue = await IssueService.get_for_write(db, id=id)
     check_permission(current_user, "issue", "update", resource=issue)
 
     updated = await IssueService.update(
         db, id=id, issue_in=updated_issue, current_user=current_user
     )
-
-    # Broadcast notification to ALL connected users
-    print(f"🔔 Broadcasting ISSUE_UPDATED for issue {updated.id} to all users")
-    await connection_manager.broadcast_to_all(
-        json.dumps(
-            {
-                "event": "ISSUE_UPDATED",
-                "issue_id": str(updated.id),
-                "title": updated.title,
-            }
-        ),
-    )
-
     return updated
 
 
@@ -160,34 +200,9 @@ async def delete_issue(
     Delete an issue.
     Delegates to IssueService.delete
     """
-    # Fetch first to check permission
-    issue = await IssueService.get(db, id=id, current_user=current_user)
+    # Fetch first to check permission (plain row, no relations)
+    issue = await IssueService.get_for_write(db, id=id)
     check_permission(current_user, "issue", "delete", resource=issue)
 
     await IssueService.delete(db, id=id, current_user=current_user)
-
-    # Broadcast notification to ALL connected users
-    print(f"🔔 Broadcasting ISSUE_DELETED for issue {issue.id} to all users")
-    await connection_manager.broadcast_to_all(
-        json.dumps(
-            {
-                "event": "ISSUE_DELETED",
-                "issue_id": str(issue.id),
-                "title": issue.title,
-            }
-        ),
-    )
-
     return None
-
-
-@router.get("/stats", response_model=schemas.IssueStats)
-async def get_issue_stats(
-    db: AsyncSession = Depends(get_db),
-    current_user: model.User = Depends(oauth2.get_current_user),
-):
-    """
-    Get aggregated statistics.
-    Delegates to IssueService.get_stats
-    """
-    return await IssueService.get_stats(db, current_user=current_user)
@@ -1,34 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from datetime import datetime, timedelta
+from typing import List, Union
 from uuid import UUID
 
+from app import crud
+from app.lib.cache import unread_count_cache
 from app.lib.database import get_db
 from app.model.notification import Notification
-from app.schemas.notification import NotificationResponse
-from app.oauth2 import get_current_user
+from app.pagination import CursorParams
+from app.schemas.notification import (
+    NotificationBulkResult,
+    NotificationIdsIn,
+    NotificationResponse,
+    UnreadCountResponse,
+)
+from app.schemas.pagination import Page
+from app.oauth2 import get_current_user, get_current_principal, Principal
 from app.model.user import User
+from app.utils.notification import invalidate_unread_count
 
 router = APIRouter()
 
-@router.get("/", response_model=List[NotificationResponse])
+@router.get(
+    "/",
+    response_model=Union[List[NotificationResponse], Page[NotificationResponse]],
+)
 async def get_notifications(
-    db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)
+    pagination: CursorParams = Depends(),
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
-    Get all notifications for the current user.
+    Get notifications for the current user.
     Ordered by most recent first.
+    Pass `cursor` for keyset pagination ({items, next_cursor} response).
     """
-    query = (
-        select(Notification)
-        .filter(Notification.user_id == current_user.id)
-        .order_by(Notification.created_at.desc())
+    notifications = await crud.notification.get_multi_by_user(
+        db, user_id=current_user.id, skip=skip, limit=limit, cursor=pagination.after
     )
-    result = await db.execute(query)
-    notifications = result.scalars().all()
+    if pagination.enabled:
+        return pagination.page(notifications, limit)
     return notifications
 
+@router.get("/unread-count", response_model=UnreadCountResponse)
+async def get_unread_count(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Unread badge count for the current user.
+    Cached per user; notification create/read endpoints invalidate it.
+    """
+    key = str(current_user.id)
+    unread_count = unread_count_cache.get(key)
+    if unread_count is None:
+        unread_count = await crud.notification.count_unread(db, user_id=current_user.id)
+        unread_count_cache.set(key, unread_count)
+    return {"unread_count": unread_count}
+
 @router.post("/{notification_id}/read", response_model=NotificationResponse)
 async def mark_as_read(
     notification_id: UUID,
@@ -52,27 +85,57 @@ async def mark_as_read(
             status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found"
         )
 
+    was_unread = not notification.read
     notification.read = True
     await db.commit()
-    await db.refresh(notification)
+    if was_unread:
+        await invalidate_unread_count(current_user.id)
     return notification
 
-@router.post("/read-all", status_code=status.HTTP_204_NO_CONTENT)
+@router.post("/read-all", response_model=NotificationBulkResult)
 async def mark_all_as_read(
     db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)
 ):
     """
     Mark all unread notifications as read for the current user.
+    Single set-based UPDATE; returns the number of notifications marked.
     """
-    query = (
-        select(Notification)
-        .filter(Notification.user_id == current_user.id, Notification.read == False)
+    affected = await crud.notification.mark_read(db, user_id=current_user.id)
+    # Sab read ho gaye - baaki workers invalidate, is worker mein seedha 0
+    await invalidate_unread_count(current_user.id)
+    unread_count_cache.set(str(current_user.id), 0)
+    return {"affected": affected}
+
+@router.post("/read", response_model=NotificationBulkResult)
+async def mark_many_as_read(
+    body: NotificationIdsIn,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Mark a list of notifications as read (one UPDATE).
+    IDs belonging to other users or already read are skipped.
+    """
+    affected = await crud.notification.mark_read(
+        db, user_id=current_user.id, ids=body.ids
     )
-    result = await db.execute(query)
-    notifications = result.scalars().all()
-    
-    for notification in notifications:
-        notification.read = True
-        
-    await db.commit()
-    return None
+    if affected:
+        await invalidate_unread_count(current_user.id)
+    return {"affected": affected}
+
+@router.delete("/read", response_model=NotificationBulkResult)
+async def delete_read_notifications(
+    older_than_days: int = Query(30, ge=0, le=3650),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Delete the current user's read notifications older than N days.
+    Unread notifications are never deleted, so the unread count is unchanged.
+    """
+    affected = await crud.notification.delete_read_before(
+        db,
+        user_id=current_user.id,
+        before=datetime.utcnow() - timedelta(days=older_than_days),
+    )
+    return {"affected": affected}
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Union
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -9,35 +9,47 @@ from app.model.user import UserRole
 from .. import model, oauth2, schemas
 from ..lib.database import get_db
 from ..services.project import ProjectService
+from ..pagination import CursorParams
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
 
 @router.get(
-    "/", status_code=status.HTTP_200_OK, response_model=List[schemas.ProjectOut]
+    "/",
+    status_code=status.HTTP_200_OK,
+    response_model=Union[List[schemas.ProjectOut], schemas.Page[schemas.ProjectOut]],
 )
 async def get_projects(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    pagination: CursorParams = Depends(),
     db: AsyncSession = Depends(get_db),
-    current_user: model.User = Depends(oauth2.get_current_user),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
 ):
+    projects = []
     if current_user.role == UserRole.ADMIN:
-        return await ProjectService.get_all(db, skip=skip, limit=limit)
-
-    if current_user.team_id:
-        return await ProjectService.get_by_team(
-            db, team_id=current_user.team_id, skip=skip, limit=limit
+        projects = await ProjectService.get_all(
+            db, skip=skip, limit=limit, cursor=pagination.after
+        )
+    elif current_user.team_id:
+        projects = await ProjectService.get_by_team(
+            db,
+            team_id=current_user.team_id,
+            skip=skip,
+            limit=limit,
+            cursor=pagination.after,
         )
 
-    return []
+    if pagination.enabled:
+        return pagination.page(projects, limit)
+    return projects
 
 
 @router.get("/{id}", status_code=status.HTTP_200_OK, response_model=schemas.ProjectOut)
 async def get_project_by_id(
     id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: model.User = Depends(oauth2.get_current_user),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
 ):
     return await ProjectService.get(db, id=id)
 
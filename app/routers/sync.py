@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from .. import schemas, oauth2
+from ..lib.database import get_db
+from ..pagination import decode_sync_cursor
+from ..services.sync import SyncService
+from app.middleware.rate_limiter import limiter
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+@router.get("/", response_model=schemas.SyncOut)
+@limiter.limit("120/minute")  # Clients poll karte hain, lekin response chhota hai
+async def sync_changes(
+    request: Request,
+    since: Optional[str] = Query(
+        None,
+        description="Previous response's next_cursor. Omit for a full initial sync.",
+    ),
+    limit: int = Query(500, ge=1, le=2000),
+    db: AsyncSession = Depends(get_db),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
+):
+    """
+    Delta sync for client-side caches.
+    Returns issues, comments, activities and notifications changed since the
+    cursor, plus tombstones for deleted rows. Delegates to SyncService.get_changes
+    """
+    try:
+        since_ts, after = decode_sync_cursor(since) if since else (None, {})
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+    return await SyncService.get_changes(
+        db, since=since_ts, after=after, limit=limit, current_user=current_user
+    )
@@ -1,26 +1,40 @@
+from typing import Union
 from uuid import UUID
 from fastapi import APIRouter, status, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from .. import schemas, model, oauth2
 from ..lib.database import get_db
 from ..services.team import TeamService
+from ..pagination import CursorParams
 
 router = APIRouter(prefix="/teams", tags=["Teams"])
 
 
-@router.get("/", status_code=status.HTTP_200_OK, response_model=list[schemas.TeamOut])
+@router.get(
+    "/",
+    status_code=status.HTTP_200_OK,
+    response_model=Union[list[schemas.TeamOut], schemas.Page[schemas.TeamOut]],
+)
 async def get_teams(
+    skip: int = 0,
+    limit: int = 100,
+    pagination: CursorParams = Depends(),
     db: AsyncSession = Depends(get_db),
-    current_user: model.User = Depends(oauth2.get_current_user),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
 ):
-    return await TeamService.get_all(db)
+    teams = await TeamService.get_all(
+        db, skip=skip, limit=limit, cursor=pagination.after
+    )
+    if pagination.enabled:
+        return pagination.page(teams, limit)
+    return teams
 
 
 @router.get("/{id}", status_code=status.HTTP_200_OK, response_model=schemas.TeamOut)
 async def get_team_by_id(
     id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: model.User = Depends(oauth2.get_current_user),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
 ):
     return await TeamService.get(db, id=id)
 
@@ -7,6 +7,8 @@ from app.model.user import UserRole
 from .. import schemas, model, oauth2
 from ..lib.database import get_db
 from ..services.user import UserService
+from ..pagination import CursorParams
+from typing import Union
 from app.middleware.rate_limiter import limiter
 
 router = APIRouter(prefix="/users", tags=["Users"])
@@ -22,15 +24,24 @@ ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
 MAX_AVATAR_SIZE = 5 * 1024 * 1024  # 5 MB
 
 
-@router.get("/", response_model=list[schemas.UserOut])
+@router.get(
+    "/",
+    response_model=Union[list[schemas.UserOut], schemas.Page[schemas.UserOut]],
+)
 # @limiter.limit("100/minute")
 async def get_users(
     skip: int = 0,
     limit: int = 100,
+    pagination: CursorParams = Depends(),
     db: AsyncSession = Depends(get_db),
-    current_user: model.User = Depends(oauth2.get_current_user),
+    current_user: oauth2.Principal = Depends(oauth2.get_current_principal),
 ):
-    return await UserService.get_all(db, skip=skip, limit=limit)
+    users = await UserService.get_all(
+        db, skip=skip, limit=limit, cursor=pagination.after
+    )
+    if pagination.enabled:
+        return pagination.page(users, limit)
+    return users
 
 
 @router.get("/verify_this")
@@ -114,12 +125,10 @@ async def upload_avatar(
     # Using forward slashes for URL compatibility
     avatar_url = f"/static/avatars/{final_filename}"
 
-    current_user.avatar_url = avatar_url
-    db.add(current_user)
-    await db.commit()
-    await db.refresh(current_user)
-
-    return current_user
+    # Service cached user ko bhi invalidate karta hai
+    return await UserService.update_avatar(
+        db, user_id=current_user.id, avatar=avatar_url
+    )
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=schemas.UserOut)
@@ -1,7 +1,9 @@
-import time
-from typing import Dict, Tuple
+import json
+from typing import List, Optional
+from uuid import UUID
 from fastapi import (
     APIRouter,
+    HTTPException,
     WebSocket,
     WebSocketDisconnect,
     Depends,
@@ -9,76 +11,142 @@ from fastapi import (
     status,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from jose import JWTError, jwt
 from .. import model, oauth2
 from ..lib.database import get_db
-from ..connectionManager import connection_manager
+from ..connectionManager import (
+    connection_manager,
+    TOPIC_KINDS,
+    team_topic,
+    user_topic,
+)
+from ..lib.ws_frames import ENCODINGS, supported_encodings
+from ..lib.event_log import LoggedEvent, ResyncRequired, event_log
 
 router = APIRouter()
 
-# Simple in-memory cache for user auth: {token: (user_obj, timestamp)}
-_user_auth_cache: Dict[str, Tuple[model.User, float]] = {}
-CACHE_TTL = 60  # seconds
-
 
-async def get_cached_user(token: str, db: AsyncSession) -> model.User | None:
+async def _can_subscribe(db: AsyncSession, user: oauth2.Principal, topic: str) -> bool:
     """
-    Retrieve user from cache or DB based on token.
-    Prevents DB hammering on repeated WebSocket reconnections.
+    Topic subscription authorization - wahi visibility rules jo
+    get_issues_for_user mein hain (team OR creator OR assignee).
     """
-    now = time.time()
-
-    # Check cache
-    if token in _user_auth_cache:
-        user, timestamp = _user_auth_cache[token]
-        if now - timestamp < CACHE_TTL:
-            return user
-        else:
-            del _user_auth_cache[token]  # Expired
+    kind, _, raw_id = topic.partition(":")
+    if kind not in TOPIC_KINDS:
+        return False
+    try:
+        topic_id = UUID(raw_id)
+    except ValueError:
+        return False
 
-    user_id: str | None = None
+    if user.role == model.UserRole.ADMIN:
+        return True
+    if kind == "user":
+        return topic_id == user.id
+    if kind == "team":
+        return topic_id == user.team_id
+    if kind == "project":
+        project = await db.get(model.Project, topic_id)
+        return bool(project and user.team_id and project.team_id == user.team_id)
+
+    issue = await db.get(model.Issue, topic_id)
+    if not issue:
+        return False
+    return user.id in (issue.creator_id, issue.assignee_id) or bool(
+        user.team_id and issue.team_id == user.team_id
+    )
+
+
+async def _fetch_backlog(
+    last_seq: Optional[int], topics: Optional[List[str]]
+) -> Optional[List[LoggedEvent]]:
+    """Missed events jo ring buffer mein nahi hain (None = full resync required)"""
+    if last_seq is None:
+        return []
     try:
-        # Decode Token
-        payload = jwt.decode(token, oauth2.SECRET_KEY, algorithms=[oauth2.ALGORITHM])
-        user_id = payload.get("sub")
-    except JWTError:
-        print(f"WS Auth Failed: Invalid JWT for token endpoint")
+        return await event_log.fetch_since(last_seq, topics)
+    except ResyncRequired:
         return None
 
-    if not user_id:
-        return None
 
-    # DB Lookup
-    # print(f"WS Auth DB Lookup: {user_id}")  # Commented out to reduce noise
-    result = await db.execute(select(model.User).where(model.User.email == user_id))
-    user = result.scalars().first()
+async def _handle_client_message(
+    db: AsyncSession, token: str, websocket: WebSocket, raw: str
+) -> None:
+    """
+    Client protocol:
+    {"action": "subscribe" | "unsubscribe", "topics": ["project:<id>", "issue:<id>"]}
+    Subscribe accepts an optional "last_seq" to replay missed events for those topics.
+    Replies go through the socket's send queue (never concurrent with broadcasts).
+    """
+    try:
+        data = json.loads(raw)
+        action = data["action"]
+        topics = [str(topic) for topic in data["topics"]]
+        last_seq = data.get("last_seq")
+        last_seq = int(last_seq) if last_seq is not None else None
+    except (ValueError, KeyError, TypeError):
+        reply = {"event": "ERROR", "detail": "Bad message"}
+        connection_manager.send_personal(websocket, reply)
+        return
 
-    if user:
-        # Update Cache
-        _user_auth_cache[token] = (user, now)
+    if action == "unsubscribe":
+        connection_manager.unsubscribe(websocket, topics)
+        reply = {"event": "UNSUBSCRIBED", "topics": topics}
+    elif action == "subscribe":
+        # Har subscribe pe current claims - revoke/role change ke baad purana
+        # role topics authorize na kare (HTTPException -> socket close)
+        user = await oauth2.authenticate_token(token, db)
+        allowed, denied = [], []
+        for topic in topics:
+            if await _can_subscribe(db, user, topic):
+                allowed.append(topic)
+            else:
+                denied.append(topic)
+        # Backlog pehle (await), phir subscribe + replay bina await ke - order bana rahe
+        backlog = await _fetch_backlog(last_seq, allowed) if allowed else []
+        connection_manager.subscribe(websocket, allowed)
+        reply = {"event": "SUBSCRIBED", "topics": allowed, "denied": denied}
+        connection_manager.send_personal(websocket, reply)
+        if last_seq is not None and allowed:
+            connection_manager.resume(websocket, last_seq, backlog, allowed)
+        return
+    else:
+        reply = {"event": "ERROR", "detail": "Unknown action"}
 
-    return user
+    connection_manager.send_personal(websocket, reply)
 
 
 @router.websocket("/ws")
 async def websocket_endpoint(
     websocket: WebSocket,
     token: str = Query(...),
+    encoding: str = Query("json", pattern=f"^({'|'.join(ENCODINGS)})$"),
+    last_seq: Optional[int] = Query(None, ge=0),
     db: AsyncSession = Depends(get_db),
 ):
     """
     WebSocket Endpoint for Real-time Updates.
     - Explicitly accepts connection first to avoid 1006 errors.
-    - Manually verifies token (cached).
-    - Connects user to their Team channel.
+    - Verifies the token like get_current_principal (claims + token_version).
+    - Auto-subscribes to the user's inbox (user:<id>) and team (team:<id>).
+    - Clients can subscribe/unsubscribe to project:<id> / issue:<id> topics.
+    - Admins receive every event.
+    - `encoding`: json (text frames), msgpack or deflate (binary frames).
+    - `last_seq`: resume after a drop - events with seq > last_seq are replayed
+      first, or RESYNC_REQUIRED is sent if the gap is no longer retained.
     """
     await websocket.accept()
+
+    if encoding not in supported_encodings():
+        print(f"WS Rejected: encoding '{encoding}' not available on this server")
+        await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+        return
     # print(f"WS Accepted. Verifying Token: {token[:10]}...")
 
     user = None
     try:
-        user = await get_cached_user(token, db)
+        user = await oauth2.authenticate_token(token, db)
+    except HTTPException:
+        pass  # Invalid/expired/revoked token - close below
     except Exception as e:
         print(f"WS Auth Exception: {e}")
         # Fall through to close
@@ -89,29 +157,33 @@ async def websocket_endpoint(
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
 
-    # Check for Admin Role
-    # print(f"DEBUG: Checking Role for {user.email}") # Reduced noise
-
-    if user.role == model.UserRole.ADMIN:
-        # print(f"WS Connecting GLOBAL ADMIN: {user.email}")
-        connection_manager.register_admin(websocket)
+    # 4. Connect (+ resume). Backlog register se pehle fetch hota hai, replay
+    # register ke turant baad bina await - taaki live events replay ke baad aayein
+    is_admin = user.role == model.UserRole.ADMIN
+    default_topics: Optional[List[str]] = None
+    if not is_admin:
+        default_topics = [user_topic(user.id)]
+        if user.team_id:
+            default_topics.append(team_topic(user.team_id))
+    backlog = await _fetch_backlog(last_seq, default_topics)
+
+    if is_admin:
+        connection_manager.register_admin(websocket, encoding=encoding)
     else:
-        # Standard Member Logic
-        # print(f"DEBUG: Not Admin. Checking Team ID: {user.team_id}")
-        if not user.team_id:
-            print(f"WS Rejected: No team for {user.email}")
-            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-            return
-
-        # 4. Connect
-        connection_manager.register(user.team_id, websocket)
+        connection_manager.register(websocket, default_topics, encoding=encoding)
+    if last_seq is not None:
+        connection_manager.resume(websocket, last_seq, backlog, default_topics)
 
     try:
         while True:
-            await websocket.receive_text()
+            raw = await websocket.receive_text()
+            await _handle_client_message(db, token, websocket, raw)
     except WebSocketDisconnect:
         # print(f"WS Disconnected: {user.email}")
         pass  # Normal disconnection
+    except HTTPException:
+        # Token revoke ho gaya (role/team change) - re-login required
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
     except Exception as e:
         print(f"WS Error (unexpected) for {user.email}: {e}")
         # Add more details if possible, e.g. traceback
@@ -120,7 +192,4 @@ async def websocket_endpoint(
         traceback.print_exc()
     finally:
         # Ensure clean disconnect logic
-        if user.role == model.UserRole.ADMIN:
-            connection_manager.disconnect_admin(websocket)
-        elif user and user.team_id:  # Check user exists and has team_id
-            connection_manager.disconnect(user.team_id, websocket)
+        connection_manager.disconnect(websocket)
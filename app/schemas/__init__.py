@@ -11,7 +11,10 @@ from .issue import (
     IssueBase,
     IssueCreate,
     IssueUpdate,
+    IssueBulkUpdate,
+    IssueBulkUpdateResult,
     IssueOut,
+    IssueSearchResult,
     IssueDetailOut,
     IssueStats,
 )
@@ -19,7 +22,9 @@ from .comment import CommentCreate, CommentOut
 from .activity import ActivityOut
 from .attached import AttachmentOut
 from .cycle import CycleOut, CycleCreate, CycleUpdate
-from .dashboard import DashboardOut
+from .dashboard import DashboardOut, DashboardIssue, ScopedDashboardOut
+from .pagination import Page
+from .sync import SyncOut, TombstoneOut
 
 __all__ = [
     # User
@@ -39,7 +44,10 @@ __all__ = [
     "IssueBase",
     "IssueCreate",
     "IssueUpdate",
+    "IssueBulkUpdate",
+    "IssueBulkUpdateResult",
     "IssueOut",
+    "IssueSearchResult",
     "IssueDetailOut",
     # Comment
     "CommentCreate",
@@ -50,4 +58,11 @@ __all__ = [
     "AttachmentOut",
     # Dashboard
     "DashboardOut",
+    "DashboardIssue",
+    "ScopedDashboardOut",
+    # Pagination
+    "Page",
+    # Sync
+    "SyncOut",
+    "TombstoneOut",
 ]
@@ -16,6 +16,7 @@ class ActivityOut(BaseModel):
     old_value: str | None
     new_value: str
     created_at: datetime
+    updated_at: datetime | None = None
 
     # Nested user data - Kisne change kiya
     user: UserOut
@@ -27,6 +27,7 @@ class CommentOut(BaseModel):
     issue_id: UUID
     author_id: UUID
     created_at: datetime
+    updated_at: datetime | None = None
 
     # Nested author data
     author: UserOut
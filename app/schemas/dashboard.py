@@ -1,3 +1,7 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
 from pydantic import BaseModel
 
 class DashboardOut(BaseModel):
@@ -6,4 +10,23 @@ class DashboardOut(BaseModel):
     # total issues and completed issues
     total_issues: int
     completed_issues: int
-    progress_percentage: float
\ No newline at end of file
+    progress_percentage: float
+
+class DashboardIssue(BaseModel):
+    id: UUID
+    identifier: Optional[str] = None
+    title: str
+    status: Optional[str] = None
+    priority: Optional[int] = None
+    assignee_id: Optional[UUID] = None
+    updated_at: Optional[datetime] = None
+    due_date: Optional[datetime] = None  # Issue ki cycle ka end_date
+
+
+class ScopedDashboardOut(DashboardOut):
+    # Team/project dashboard - stats + top-N lists (sirf caller ko visible issues)
+    team_id: Optional[UUID] = None
+    project_id: Optional[UUID] = None
+    recently_updated: list[DashboardIssue]
+    overdue: list[DashboardIssue]
+    high_priority: list[DashboardIssue]
@@ -1,5 +1,5 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime
 from enum import Enum
@@ -49,6 +49,13 @@ class IssueUpdate(BaseModel):
     assignee_id: Optional[UUID] = None
 
 
+class IssueBulkUpdate(BaseModel):
+    """PATCH /issues/bulk - same change set for every id (triage)"""
+
+    ids: List[UUID] = Field(..., min_length=1, max_length=500)
+    changes: IssueUpdate
+
+
 from .user import UserOut
 from .team import TeamOut
 from .activity import ActivityOut
@@ -59,6 +66,7 @@ class IssueOut(IssueBase):
     id: UUID
     creator_id: UUID
     created_at: datetime
+    updated_at: Optional[datetime] = None
     assignee: Optional[UserOut] = None
     team: Optional[TeamOut] = None
 
@@ -66,6 +74,17 @@ class IssueOut(IssueBase):
         from_attributes = True
 
 
+class IssueSearchResult(IssueOut):
+    """
+    Search hit - IssueOut + relevance rank aur highlighted text
+    (matches wrapped in <mark>...</mark>)
+    """
+
+    rank: float
+    title_highlight: str
+    snippet: str
+
+
 # Enhanced Issue Detail Schema with nested data
 class IssueDetailOut(IssueBase):
     """
@@ -92,3 +111,13 @@ class IssueStats(BaseModel):
     total_count: int
     status_counts: dict[str, int]
     priority_counts: dict[str, int]
+    # Sirf jab ?dimension= maanga ho (id -> count, bina team/assignee wale "none")
+    team_counts: Optional[dict[str, int]] = None
+    project_counts: Optional[dict[str, int]] = None
+    assignee_counts: Optional[dict[str, int]] = None
+    cycle_counts: Optional[dict[str, int]] = None
+
+
+class IssueBulkUpdateResult(BaseModel):
+    affected: int
+    issues: list[IssueOut]
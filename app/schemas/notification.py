@@ -1,5 +1,5 @@
 from pydantic import BaseModel, UUID4, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class NotificationBase(BaseModel):
@@ -16,6 +16,21 @@ class NotificationResponse(NotificationBase):
     user_id: UUID4
     read: bool
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+
+class UnreadCountResponse(BaseModel):
+    unread_count: int
+
+
+class NotificationIdsIn(BaseModel):
+    ids: List[UUID4] = Field(..., min_length=1, max_length=1000)
+
+
+class NotificationBulkResult(BaseModel):
+    """Bulk operations kitni rows pe lage"""
+
+    affected: int
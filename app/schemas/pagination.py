@@ -0,0 +1,14 @@
+from typing import Generic, Optional, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """
+    Cursor mode response - items + next page ka cursor
+    next_cursor None matlab last page
+    """
+
+    items: list[T]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+from typing import List, Optional
+from .issue import IssueOut
+from .comment import CommentOut
+from .activity import ActivityOut
+from .notification import NotificationResponse
+
+
+class TombstoneOut(BaseModel):
+    """
+    Deleted row - client apne local store se `id` hata de.
+    Issue delete hone pe uske comments/activities bhi hata do (cascade).
+    """
+
+    entity_type: str  # issue, comment, notification
+    id: UUID
+    deleted_at: datetime
+
+
+class SyncOut(BaseModel):
+    """
+    Delta sync response - `since` ke baad create/update/delete hue rows.
+    - has_more: true ho toh turant next_cursor ke saath dobara call karo
+    - resync_required: cursor tombstone retention se purana hai, local store
+      clear karke bina `since` ke full sync karo
+    Boundary rows dobara aa sakte hain - client id se upsert kare.
+    """
+
+    issues: List[IssueOut] = []
+    comments: List[CommentOut] = []
+    activities: List[ActivityOut] = []
+    notifications: List[NotificationResponse] = []
+    deleted: List[TombstoneOut] = []
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    resync_required: bool = False
@@ -66,8 +66,8 @@ class AttachmentService:
         )
 
         db.add(new_attachment)
+        # created_at (server default) flush ke INSERT ... RETURNING se aa jaata hai
         await db.commit()
-        await db.refresh(new_attachment)
 
         return new_attachment
 
@@ -24,6 +24,7 @@ class AuthService:
             )
 
         # 4. Create Token
-        access_token = oauth2.create_access_token(data={"sub": user.email})
+        # Claims mein id/role/team bhi daalo taaki read endpoints DB hit na karein
+        access_token = oauth2.create_access_token(data=oauth2.build_token_claims(user))
 
         return {"access_token": access_token, "token_type": "bearer"}
@@ -1,12 +1,17 @@
 from typing import List
 from uuid import UUID
+import uuid
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, model
 from app.schemas.comment import CommentCreate, CommentCreate as CommentUpdate
-from app.utils.notification import create_notification
+from app.utils.notification import NotificationBatch
+from app.utils.tombstone import add_tombstone
+from app.utils.outbox import add_outbox_event
+from app.services.outbox import outbox_dispatcher
+from app.connectionManager import topics_for_issue
 
 
 class CommentService:
@@ -50,8 +55,12 @@ class CommentService:
         # Let's do it manually here or prepare clean dict for CRUD
 
         # Better approach: Create object manually to ensure IDs are set correctly
+        # id abhi set karo - outbox event flush se pehle comment_id padhta hai
         new_comment = model.Comment(
-            content=comment_in.content, issue_id=issue_id, author_id=current_user.id
+            id=uuid.uuid4(),
+            content=comment_in.content,
+            issue_id=issue_id,
+            author_id=current_user.id,
         )
         db.add(new_comment)
 
@@ -72,18 +81,38 @@ class CommentService:
         if issue.creator_id and issue.creator_id != current_user.id:
             users_to_notify.add(issue.creator_id)
 
+        notifications = NotificationBatch()
         for uid in users_to_notify:
-            await create_notification(
-                db=db,
+            notifications.add(
                 user_id=uid,
                 title="New Comment on Issue",
-                message=f"{current_user.username or current_user.email} commented on: {issue.title}",
+                message=f"{current_user.full_name or current_user.email} commented on: {issue.title}",
                 type="comment_created",
                 issue_id=issue.id,
             )
+        # Ek multi-row INSERT, comment ke saath same transaction mein
+        await notifications.flush(db)
+
+        # 5. Outbox: WebSocket/email side effects commit ke baad
+        add_outbox_event(
+            db,
+            "comment.created",
+            topics=topics_for_issue(issue),
+            data={
+                "issue_id": str(issue.id),
+                "comment_id": str(new_comment.id),
+                "title": issue.title,
+            },
+            actor=current_user.full_name or current_user.email,
+            emails=[
+                {"user_id": str(uid), "action": "Commented on"}
+                for uid in users_to_notify
+            ],
+        )
 
         await db.commit()
-        await db.refresh(new_comment)
+        await notifications.invalidate_unread_counts()
+        outbox_dispatcher.wake()
 
         # Fetch with author for response
         return await crud.comment.get_with_author(db, id=new_comment.id)
@@ -123,4 +152,6 @@ class CommentService:
                 detail="Not authorized to delete this comment",
             )
 
+        issue = await crud.issue.get(db, id=issue_id)
+        add_tombstone(db, "comment", comment.id, topics_for_issue(issue))
         await crud.comment.remove(db, id=comment_id)
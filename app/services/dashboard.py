@@ -0,0 +1,115 @@
+import os
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, model
+from app.lib.cache import dashboard_cache
+from app.oauth2 import Principal
+from app.schemas.issue import IssueStatus
+
+load_dotenv()
+
+DASHBOARD_TOP_N = int(os.getenv("DASHBOARD_TOP_N", "5"))
+
+
+class DashboardService:
+    @staticmethod
+    def summarize(stats: dict) -> dict:
+        """get_stats shape -> DashboardOut fields (completed + progress %)"""
+        total_count = stats.get("total_count", 0)
+        status_counts = stats.get("status_counts", {})
+        completed_issues = status_counts.get(IssueStatus.DONE.value, 0)
+        progress_percentage = (
+            (completed_issues / total_count * 100) if total_count > 0 else 0.0
+        )
+        return {
+            "status_counts": status_counts,
+            "priority_counts": stats.get("priority_counts", {}),
+            "total_issues": total_count,
+            "completed_issues": completed_issues,
+            "progress_percentage": round(progress_percentage, 2),
+        }
+
+    @staticmethod
+    async def _get_scoped(
+        db: AsyncSession,
+        *,
+        cache_key: str,
+        not_found: str,
+        user_id: Optional[UUID],
+        user_team_id: Optional[UUID],
+        team_id: Optional[UUID] = None,
+        project_id: Optional[UUID] = None,
+    ) -> dict:
+        dashboard = dashboard_cache.get(cache_key)
+        if dashboard is not None:
+            return dashboard
+
+        data = await crud.issue.get_dashboard(
+            db,
+            team_id=team_id,
+            project_id=project_id,
+            user_id=user_id,
+            user_team_id=user_team_id,
+            top_n=DASHBOARD_TOP_N,
+            now=datetime.utcnow(),
+        )
+        if data is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+
+        dashboard = {
+            **DashboardService.summarize(data),
+            "team_id": team_id,
+            "project_id": project_id,
+            "recently_updated": data["recently_updated"],
+            "overdue": data["overdue"],
+            "high_priority": data["high_priority"],
+        }
+        dashboard_cache.set(cache_key, dashboard)
+        return dashboard
+
+    @staticmethod
+    async def get_team_dashboard(
+        db: AsyncSession, *, team_id: UUID, current_user: Principal
+    ) -> dict:
+        """
+        Admin aur team members poori team dekhte hain - ek shared cache entry.
+        Baaki users ko sirf apne created/assigned issues (per-user entry).
+        """
+        full_view = (
+            current_user.role == model.UserRole.ADMIN
+            or current_user.team_id == team_id
+        )
+        viewer = "all" if full_view else str(current_user.id)
+        return await DashboardService._get_scoped(
+            db,
+            cache_key=f"team:{team_id}:{viewer}",
+            not_found="Team not found",
+            user_id=None if full_view else current_user.id,
+            user_team_id=current_user.team_id,
+            team_id=team_id,
+        )
+
+    @staticmethod
+    async def get_project_dashboard(
+        db: AsyncSession, *, project_id: UUID, current_user: Principal
+    ) -> dict:
+        """
+        Project ki team query se pehle pata nahi, isliye non-admin ke liye
+        visibility hamesha SQL mein lagti hai aur cache entry per-user hai.
+        """
+        is_admin = current_user.role == model.UserRole.ADMIN
+        viewer = "all" if is_admin else str(current_user.id)
+        return await DashboardService._get_scoped(
+            db,
+            cache_key=f"project:{project_id}:{viewer}",
+            not_found="Project not found",
+            user_id=None if is_admin else current_user.id,
+            user_team_id=current_user.team_id,
+            project_id=project_id,
+        )
@@ -1,16 +1,38 @@
-from typing import List, Optional
+import os
+import uuid
+from typing import List, Optional, Sequence
 from uuid import UUID
 
 from fastapi import HTTPException, status
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 import csv
 import io
 from fastapi.responses import StreamingResponse
 
 from app import model, crud
-from app.schemas.issue import IssueCreate, IssueUpdate
+from app.schemas.issue import IssueCreate, IssueUpdate, IssueOut, IssueSearchResult
 from app.filters import IssueFilters
-from app.utils.notification import create_notification
+from app.utils.notification import NotificationBatch
+from app.utils.tombstone import add_tombstone
+from app.utils.outbox import add_outbox_event
+from app.services.outbox import outbox_dispatcher
+from app.connectionManager import topics_for_issue
+from app.lib.database import AsyncSessionLocal
+from app.crud.issue_stats import ALL_SCOPE, creator_scope
+
+
+# CSV export: server-side cursor se itne rows per fetch / per yielded chunk
+ISSUE_EXPORT_CHUNK_SIZE = int(os.getenv("ISSUE_EXPORT_CHUNK_SIZE", "1000"))
+
+# Activity log + notifications in fields ke change pe
+TRACKED_FIELDS = ["status", "priority", "title", "assignee_id"]
+
+MISSING_REFERENCE_DETAILS = {
+    "project": "Project not found",
+    "assignee": "Assignee user not found",
+    "team": "Team not found",
+}
 
 
 class IssueService:
@@ -21,27 +43,15 @@ class IssueService:
         assignee_id: Optional[UUID] = None,
         team_id: Optional[UUID] = None,
     ):
-        if project_id:
-            project = await db.get(model.Project, project_id)
-            if not project:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
-                )
-
-        if assignee_id:
-            assignee = await db.get(model.User, assignee_id)
-            if not assignee:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Assignee user not found",
-                )
-
-        if team_id:
-            team = await db.get(model.Team, team_id)
-            if not team:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND, detail="Team not found"
-                )
+        # Teeno references ek query mein; pehla missing wala 404 deta hai
+        missing = await crud.issue.get_missing_references(
+            db, project_id=project_id, assignee_id=assignee_id, team_id=team_id
+        )
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=MISSING_REFERENCE_DETAILS[missing[0]],
+            )
 
     @staticmethod
     async def create(
@@ -66,7 +76,10 @@ class IssueService:
         # Let's override create in CRUD? No, base create is generic.
         # Let's use lower-level model creation here or update schema data.
 
-        db_obj = model.Issue(**issue_in.model_dump(), creator_id=current_user.id)
+        # id pehle se: activity/notification/outbox rows flush se pehle hi sahi issue_id pakdein
+        db_obj = model.Issue(
+            id=uuid.uuid4(), **issue_in.model_dump(), creator_id=current_user.id
+        )
         db.add(db_obj)
 
         # 3. Activity Log
@@ -79,21 +92,45 @@ class IssueService:
         )
         db.add(creation_log)
 
-        await db.commit()
-        
-        # 4. In-App Notification (Assignment)
+        # 4. In-App Notification (Assignment) - issue ke saath same transaction
+        # Flush pehle: issue row notification FK se pehle insert ho
+        await db.flush()
+        notifications = NotificationBatch()
         if issue_in.assignee_id and issue_in.assignee_id != current_user.id:
-            await create_notification(
-                db=db,
+            notifications.add(
                 user_id=issue_in.assignee_id,
                 title="New Issue Assigned",
                 message=f"You have been assigned to issue: {db_obj.title}",
                 type="issue_assigned",
                 issue_id=db_obj.id,
             )
+        await notifications.flush(db)
+        await crud.issue_stats.apply_change(db, new=crud.issue_stats.snapshot(db_obj))
+
+        # 5. Outbox: WebSocket/email side effects commit ke baad dispatcher karega
+        add_outbox_event(
+            db,
+            "issue.created",
+            topics=topics_for_issue(db_obj),
+            data={
+                "issue_id": str(db_obj.id),
+                "title": db_obj.title,
+                "project_id": str(db_obj.project_id) if db_obj.project_id else None,
+            },
+            actor=current_user.email,
+            emails=(
+                [{"user_id": str(issue_in.assignee_id), "action": "Assigned"}]
+                if issue_in.assignee_id and issue_in.assignee_id != current_user.id
+                else []
+            ),
+        )
 
-        # Re-fetch to load relationships (e.g. assignee)
-        return await crud.issue.get_with_relations(db, id=db_obj.id)
+        await db.commit()
+        await notifications.invalidate_unread_counts()
+        outbox_dispatcher.wake()
+
+        # Server defaults flush ke RETURNING se aa chuke - sirf response relations
+        return await crud.issue.get_for_response(db, id=db_obj.id)
 
     @staticmethod
     async def get_all(
@@ -102,6 +139,7 @@ class IssueService:
         filters: IssueFilters,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[dict] = None,
         current_user: model.User,
     ) -> List[model.Issue]:
         # RBAC Logic
@@ -117,7 +155,9 @@ class IssueService:
                     "status": filters.status,
                     "priority": filters.priority,
                     "search": filters.search,
+                    "search_mode": filters.search_mode,
                 },
+                cursor=cursor,
             )
 
         # Admin Logic (Global Access)
@@ -132,6 +172,8 @@ class IssueService:
             project_id=filters.project_id,
             assignee_id=filters.assignee_id,
             search=filters.search,
+            search_mode=filters.search_mode,
+            cursor=cursor,
         )
 
     @staticmethod
@@ -148,6 +190,20 @@ class IssueService:
             )
         return issue
 
+    @staticmethod
+    async def get_for_write(db: AsyncSession, *, id: UUID) -> model.Issue:
+        """
+        Permission check ke liye plain issue (1 query, relations nahi).
+        update/delete baad mein db.get se identity map se hi uthate hain.
+        """
+        issue = await db.get(model.Issue, id)
+        if not issue:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Issue not found",
+            )
+        return issue
+
     @staticmethod
     async def update(
         db: AsyncSession,
@@ -156,8 +212,8 @@ class IssueService:
         issue_in: IssueUpdate,
         current_user: model.User,
     ) -> model.Issue:
-        # 1. Get existing issue
-        issue = await crud.issue.get(db, id)
+        # 1. Get existing issue (router ne load kiya hai toh identity map se, no query)
+        issue = await db.get(model.Issue, id)
         if not issue:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -179,12 +235,164 @@ class IssueService:
             team_id=issue_in.team_id if issue_in.team_id != issue.team_id else None,
         )
 
-        # 3. Track changes for activity log
-        await IssueService._track_changes(db, current_user, issue, issue_in)
+        # _track_changes issue ko mutate karta hai - purane topics/assignee pehle lo
+        old_topics = topics_for_issue(issue)
+        old_assignee_id = issue.assignee_id
+        old_stats = crud.issue_stats.snapshot(issue)
+
+        # 3. Track changes for activity log (+ notifications, ek INSERT mein)
+        notifications = NotificationBatch()
+        await IssueService._track_changes(
+            db, current_user, issue, issue_in, notifications
+        )
+        await notifications.flush(db)
+        await crud.issue_stats.apply_change(
+            db, old=old_stats, new=crud.issue_stats.snapshot(issue)
+        )
+
+        # 4. Outbox: old + new topics (team/project badle toh purane subscribers bhi)
+        reassigned = (
+            issue.assignee_id
+            and issue.assignee_id != old_assignee_id
+            and issue.assignee_id != current_user.id
+        )
+        add_outbox_event(
+            db,
+            "issue.updated",
+            topics=list(dict.fromkeys(old_topics + topics_for_issue(issue))),
+            data={"issue_id": str(issue.id), "title": issue.title},
+            actor=current_user.email,
+            emails=(
+                [{"user_id": str(issue.assignee_id), "action": "Assigned"}]
+                if reassigned
+                else []
+            ),
+        )
 
         await db.commit()
-        # Re-fetch to load relationships
-        return await crud.issue.get_with_relations(db, id=issue.id)
+        await notifications.invalidate_unread_counts()
+        outbox_dispatcher.wake()
+        # UPDATE ke values object pe hain - sirf response relations load karo
+        return await crud.issue.get_for_response(db, id=issue.id)
+
+    @staticmethod
+    async def get_many_for_write(
+        db: AsyncSession, *, ids: Sequence[UUID]
+    ) -> List[model.Issue]:
+        """
+        Bulk update ke liye issues FOR UPDATE lock ke saath (ek query) - old
+        values aur concurrent single PATCH ek doosre ko overwrite na karein.
+        Koi bhi id missing ho toh 404 (partial update nahi).
+        """
+        issues = await crud.issue.get_many_for_update(db, ids=ids)
+        missing = set(ids) - {issue.id for issue in issues}
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Issues not found: {', '.join(sorted(map(str, missing)))}",
+            )
+        return issues
+
+    @staticmethod
+    async def bulk_update(
+        db: AsyncSession,
+        *,
+        issues: List[model.Issue],
+        issue_in: IssueUpdate,
+        current_user: model.User,
+    ) -> List[model.Issue]:
+        """
+        Same change set for many issues (triage). Permission router check karta hai.
+        Referenced entities ek baar validate, ek set-based UPDATE, activities +
+        notifications + stats ek-ek multi-row statement, aur ek coalesced
+        outbox event (ISSUES_BULK_UPDATED) saare affected topics pe.
+        """
+        update_data = issue_in.model_dump(exclude_unset=True)
+        if not update_data:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="No changes given"
+            )
+
+        # 1. Validate referenced entities once (sab issues ke liye same values)
+        await IssueService.validate_issue_entities(
+            db,
+            project_id=update_data.get("project_id"),
+            assignee_id=update_data.get("assignee_id"),
+            team_id=update_data.get("team_id"),
+        )
+
+        # 2. UPDATE se pehle old state (objects RETURNING se sync ho jaate hain)
+        before = {
+            issue.id: (
+                {key: getattr(issue, key) for key in update_data},
+                topics_for_issue(issue),
+                crud.issue_stats.snapshot(issue),
+            )
+            for issue in issues
+        }
+
+        # 3. One set-based UPDATE ... RETURNING (caller ka transaction)
+        ids = [issue.id for issue in issues]
+        await crud.issue.update_many(db, obj_in=update_data, ids=ids, commit=False)
+
+        # 4. Activities + notifications (bulk) + stats deltas
+        activities = []
+        notifications = NotificationBatch()
+        topics = []
+        reassigned = set()
+        for issue in issues:
+            old_values, old_topics, _ = before[issue.id]
+            topics.extend(old_topics + topics_for_issue(issue))
+            for key, new_value in update_data.items():
+                old_value = old_values[key]
+                if key not in TRACKED_FIELDS or old_value == new_value:
+                    continue
+                activities.append(
+                    {
+                        "issue_id": issue.id,
+                        "user_id": current_user.id,
+                        "attribute": key,
+                        "old_value": "None" if old_value is None else str(old_value),
+                        "new_value": "None" if new_value is None else str(new_value),
+                    }
+                )
+                IssueService._notify_change(
+                    notifications, current_user, issue, key, new_value
+                )
+                if key == "assignee_id" and new_value and new_value != current_user.id:
+                    reassigned.add(new_value)
+        if activities:
+            await db.execute(insert(model.Activity).values(activities))
+        await notifications.flush(db)
+        await crud.issue_stats.apply_changes(
+            db,
+            [
+                (before[issue.id][2], crud.issue_stats.snapshot(issue))
+                for issue in issues
+            ],
+        )
+
+        # 5. Ek coalesced event - per-issue broadcasts nahi
+        add_outbox_event(
+            db,
+            "issue.bulk_updated",
+            topics=list(dict.fromkeys(topics)),
+            data={
+                "issue_ids": [str(issue_id) for issue_id in ids],
+                "changes": sorted(update_data),
+                "title": f"{len(ids)} issues",
+            },
+            actor=current_user.email,
+            emails=[
+                {"user_id": str(user_id), "action": "Assigned"}
+                for user_id in reassigned
+            ],
+        )
+
+        await db.commit()
+        await notifications.invalidate_unread_counts()
+        outbox_dispatcher.wake()
+        return await crud.issue.get_many_for_response(db, ids=ids)
 
     @staticmethod
     async def _track_changes(
@@ -192,12 +400,13 @@ class IssueService:
         current_user: model.User,
         issue: model.Issue,
         issue_in: IssueUpdate,
+        notifications: NotificationBatch,
     ) -> None:
         """
         Track changes for activity log.
+        Notifications `notifications` batch mein jaate hain - caller flush karega.
         Complexity: 1 (Linear flow with helper)
         """
-        tracked_fields = ["status", "priority", "title", "assignee_id"]
         update_data = issue_in.model_dump(exclude_unset=True)
 
         for key, new_value in update_data.items():
@@ -206,7 +415,7 @@ class IssueService:
             setattr(issue, key, new_value)
 
             # Log change if tracked field and value changed
-            if key in tracked_fields and old_value != new_value:
+            if key in TRACKED_FIELDS and old_value != new_value:
                 new_log = model.Activity(
                     issue_id=issue.id,
                     user_id=current_user.id,
@@ -217,54 +426,100 @@ class IssueService:
                 db.add(new_log)
 
                 # Generate In-App notification
-                if key == "assignee_id" and new_value is not None:
-                    # Notify new assignee
-                    if new_value != current_user.id:
-                        await create_notification(
-                            db=db,
-                            user_id=new_value,
-                            title="Issue Assigned",
-                            message=f"You have been assigned to issue: {issue.title}",
-                            type="issue_assigned",
-                            issue_id=issue.id,
-                        )
-                elif key == "status":
-                    # Notify assignee and creator of status change
-                    users_to_notify = set()
-                    if issue.assignee_id and issue.assignee_id != current_user.id:
-                        users_to_notify.add(issue.assignee_id)
-                    if issue.creator_id and issue.creator_id != current_user.id:
-                        users_to_notify.add(issue.creator_id)
-
-                    for uid in users_to_notify:
-                        await create_notification(
-                            db=db,
-                            user_id=uid,
-                            title="Issue Status Updated",
-                            message=f"Status changed to '{new_value}' for issue: {issue.title}",
-                            type="issue_status_changed",
-                            issue_id=issue.id,
-                        )
+                IssueService._notify_change(
+                    notifications, current_user, issue, key, new_value
+                )
+
+    @staticmethod
+    def _notify_change(
+        notifications: NotificationBatch,
+        current_user: model.User,
+        issue: model.Issue,
+        key: str,
+        new_value,
+    ) -> None:
+        """Tracked field change -> in-app notifications (issue already has new values)"""
+        if key == "assignee_id" and new_value is not None:
+            # Notify new assignee
+            if new_value != current_user.id:
+                notifications.add(
+                    user_id=new_value,
+                    title="Issue Assigned",
+                    message=f"You have been assigned to issue: {issue.title}",
+                    type="issue_assigned",
+                    issue_id=issue.id,
+                )
+        elif key == "status":
+            # Notify assignee and creator of status change
+            users_to_notify = set()
+            if issue.assignee_id and issue.assignee_id != current_user.id:
+                users_to_notify.add(issue.assignee_id)
+            if issue.creator_id and issue.creator_id != current_user.id:
+                users_to_notify.add(issue.creator_id)
+
+            for uid in users_to_notify:
+                notifications.add(
+                    user_id=uid,
+                    title="Issue Status Updated",
+                    message=f"Status changed to '{new_value}' for issue: {issue.title}",
+                    type="issue_status_changed",
+                    issue_id=issue.id,
+                )
 
     @staticmethod
     async def delete(db: AsyncSession, *, id: UUID, current_user: model.User) -> None:
-        issue = await crud.issue.get(db, id)
+        issue = await db.get(model.Issue, id)
         if not issue:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Issue not found",
             )
         # Permission checked in Router
-        await crud.issue.remove(db, id=id)
+        # Comments/activities cascade hote hain - sync clients issue ke saath hata dete hain
+        add_tombstone(db, "issue", issue.id, topics_for_issue(issue))
+        await crud.issue_stats.apply_change(db, old=crud.issue_stats.snapshot(issue))
+        add_outbox_event(
+            db,
+            "issue.deleted",
+            topics=topics_for_issue(issue),
+            data={"issue_id": str(issue.id), "title": issue.title},
+            actor=current_user.email,
+        )
+        # Core DELETE: comments/activities/notifications DB ke ondelete=CASCADE se
+        # jaate hain - ORM delete() pehle saari relationships lazy-load karta tha
+        await crud.issue.remove_many(db, ids=[id], commit=False)
+        await db.commit()
+        outbox_dispatcher.wake()
 
     @staticmethod
     async def search(
-        db: AsyncSession, *, q: str, skip: int, limit: int
-    ) -> List[model.Issue]:
-        return await crud.issue.search_global(db, q=q, skip=skip, limit=limit)
+        db: AsyncSession,
+        *,
+        q: str,
+        skip: int,
+        limit: int,
+        include_comments: bool = False,
+    ) -> List[IssueSearchResult]:
+        rows = await crud.issue.search_global(
+            db, q=q, skip=skip, limit=limit, include_comments=include_comments
+        )
+        return [
+            IssueSearchResult(
+                **IssueOut.model_validate(issue).model_dump(),
+                rank=rank,
+                title_highlight=title_highlight,
+                snippet=snippet,
+            )
+            for issue, rank, title_highlight, snippet in rows
+        ]
 
     @staticmethod
-    async def get_stats(db: AsyncSession, *, current_user: model.User) -> dict:
+    async def get_stats(
+        db: AsyncSession,
+        *,
+        current_user: model.User,
+        dimensions: Sequence[str] = (),
+    ) -> dict:
         creator_id = None
         if current_user.role != model.UserRole.ADMIN:
             # Basic stat logic: Show stats for own created issues if not admin?
@@ -276,7 +531,15 @@ class IssueService:
             # Admin sees all.
             creator_id = current_user.id
 
-        return await crud.issue.get_stats(db, creator_id=creator_id)
+        if dimensions:
+            # Extra breakdowns counters mein nahi hain - ek GROUPING SETS scan
+            return await crud.issue.get_stats(
+                db, creator_id=creator_id, dimensions=dimensions
+            )
+
+        # Counters (issue_stats) se - issues table scan nahi
+        scope = creator_scope(creator_id) if creator_id else ALL_SCOPE
+        return await crud.issue_stats.get(db, scope=scope)
 
     @staticmethod
     async def export_csv(
@@ -293,8 +556,7 @@ class IssueService:
             if not team_id:
                 creator_id = current_user.id
 
-        issues = await crud.issue.get_all_for_export(
-            db,
+        export_filters = dict(
             creator_id=creator_id,
             status=filters.status,
             priority=filters.priority,
@@ -302,10 +564,14 @@ class IssueService:
             project_id=filters.project_id,
             assignee_id=filters.assignee_id,
             search=filters.search,
+            search_mode=filters.search_mode,
         )
 
-        # Generator for StreamingResponse
-        def iter_csv():
+        # Async generator for StreamingResponse - constant memory:
+        # server-side cursor se ISSUE_EXPORT_CHUNK_SIZE rows aate hain, CSV chunk
+        # likh ke yield, agla chunk. Request ka `db` session response stream hone
+        # se pehle band ho jaata hai, isliye generator apna session kholta hai.
+        async def iter_csv():
             output = io.StringIO()
             writer = csv.writer(output)
             # Header
@@ -325,22 +591,26 @@ class IssueService:
             output.seek(0)
             output.truncate(0)
 
-            for issue in issues:
-                writer.writerow(
-                    [
-                        issue.identifier,
-                        issue.title,
-                        issue.status,
-                        issue.priority,
-                        issue.assignee.email if issue.assignee else "Unassigned",
-                        issue.project.name if issue.project else "No Project",
-                        issue.team.name if issue.team else "No Team",
-                        issue.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                    ]
-                )
-                yield output.getvalue()
-                output.seek(0)
-                output.truncate(0)
+            async with AsyncSessionLocal() as session:
+                async for rows in crud.issue.stream_for_export(
+                    session, chunk_size=ISSUE_EXPORT_CHUNK_SIZE, **export_filters
+                ):
+                    writer.writerows(
+                        [
+                            row.identifier,
+                            row.title,
+                            row.status,
+                            row.priority,
+                            row.assignee_email or "Unassigned",
+                            row.project_name or "No Project",
+                            row.team_name or "No Team",
+                            row.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                        ]
+                        for row in rows
+                    )
+                    yield output.getvalue()
+                    output.seek(0)
+                    output.truncate(0)
 
         return StreamingResponse(
             iter_csv(),
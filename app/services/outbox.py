@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import List
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, select
+
+from app import model
+from app.connectionManager import connection_manager
+from app.lib.database import AsyncSessionLocal
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+# Wake signal miss ho jaye (doosre worker ka commit) tab bhi itni der mein poll
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1"))  # seconds
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_RETENTION_HOURS = float(os.getenv("OUTBOX_RETENTION_HOURS", "24"))
+OUTBOX_ENABLE_EMAIL = os.getenv("OUTBOX_ENABLE_EMAIL", "false").lower() == "true"
+
+# Outbox event_type -> WebSocket event name
+WS_EVENT_NAMES = {
+    "issue.created": "ISSUE_CREATED",
+    "issue.updated": "ISSUE_UPDATED",
+    "issue.deleted": "ISSUE_DELETED",
+    "issue.bulk_updated": "ISSUES_BULK_UPDATED",
+    "comment.created": "COMMENT_CREATED",
+}
+
+
+class OutboxDispatcher:
+    """
+    Background task (har worker mein) jo outbox_events drain karta hai.
+
+    FOR UPDATE SKIP LOCKED se saare workers parallel drain kar sakte hain bina
+    ek event do baar uthaye. Delivery at-least-once hai: handler fail hua toh
+    event OUTBOX_MAX_ATTEMPTS tak retry hota hai, phir last_error ke saath
+    pending chhod diya jaata hai (manual inspection ke liye).
+    """
+
+    def __init__(self):
+        self._wakeup = asyncio.Event()
+        self.dispatched = 0
+        self.failed = 0
+
+    def wake(self) -> None:
+        """Commit ke baad call karo - event turant dispatch hota hai, poll ka wait nahi"""
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        last_prune = datetime.utcnow()
+        while True:
+            try:
+                processed = await self.drain_once()
+                if datetime.utcnow() - last_prune > timedelta(hours=1):
+                    await self.prune()
+                    last_prune = datetime.utcnow()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbox dispatcher error: {e}")
+                processed = 0
+
+            if processed < OUTBOX_BATCH_SIZE:
+                # Backlog khatam - agle commit ya poll interval tak ruko
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), OUTBOX_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def drain_once(self) -> int:
+        """One batch: lock pending rows, run side effects, mark processed"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(model.OutboxEvent)
+                .where(
+                    model.OutboxEvent.processed_at.is_(None),
+                    model.OutboxEvent.attempts < OUTBOX_MAX_ATTEMPTS,
+                )
+                .order_by(model.OutboxEvent.id)
+                .limit(OUTBOX_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+            events = result.scalars().all()
+            if not events:
+                return 0
+
+            emails = await self._load_emails(db, events)
+            for event in events:
+                try:
+                    await self._dispatch(event, emails)
+                    event.processed_at = datetime.utcnow()
+                    self.dispatched += 1
+                except Exception as e:
+                    event.attempts += 1
+                    event.last_error = str(e)[:1000]
+                    self.failed += 1
+                    logger.error(
+                        f"Outbox event {event.id} ({event.event_type}) failed: {e}"
+                    )
+            await db.commit()
+            return len(events)
+
+    @staticmethod
+    async def _load_emails(db, events: List[model.OutboxEvent]) -> dict:
+        """Poore batch ke email recipients ek query mein (user_id -> email)"""
+        if not OUTBOX_ENABLE_EMAIL:
+            return {}
+        user_ids = {
+            recipient["user_id"]
+            for event in events
+            for recipient in event.payload.get("emails", [])
+        }
+        if not user_ids:
+            return {}
+        result = await db.execute(
+            select(model.User.id, model.User.email).where(model.User.id.in_(user_ids))
+        )
+        return {str(user_id): email for user_id, email in result.all()}
+
+    async def _dispatch(self, event: model.OutboxEvent, emails: dict) -> None:
+        payload = event.payload
+        ws_event = WS_EVENT_NAMES.get(event.event_type)
+        if ws_event:
+            await connection_manager.publish(
+                payload["topics"], {"event": ws_event, **payload["data"]}
+            )
+
+        if OUTBOX_ENABLE_EMAIL:
+            title = payload["data"].get("title", "")
+            actor = payload.get("actor") or ""
+            for recipient in payload.get("emails", []):
+                email = emails.get(recipient["user_id"])
+                if email:
+                    await self._queue_email(email, title, recipient["action"], actor)
+
+    @staticmethod
+    async def _queue_email(email: str, issue_title: str, action: str, actor: str):
+        # Celery sirf email enabled hone pe import hota hai; .delay() broker I/O karta hai
+        from app.workers.email_tasks import send_issue_notification
+
+        await asyncio.to_thread(
+            send_issue_notification.delay, email, issue_title, action, actor
+        )
+
+    async def prune(self) -> int:
+        cutoff = datetime.utcnow() - timedelta(hours=OUTBOX_RETENTION_HOURS)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(model.OutboxEvent).where(model.OutboxEvent.processed_at < cutoff)
+            )
+            await db.commit()
+            return result.rowcount
+
+    def stats(self) -> dict:
+        return {"dispatched": self.dispatched, "failed": self.failed}
+
+
+outbox_dispatcher = OutboxDispatcher()
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
@@ -11,16 +11,30 @@ from app.schemas.project import ProjectCreate, ProjectCreate as ProjectUpdate
 class ProjectService:
     @staticmethod
     async def get_all(
-        db: AsyncSession, skip: int = 0, limit: int = 100
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[dict] = None,
     ) -> List[model.Project]:
-        return await crud.project.get_multi(db, skip=skip, limit=limit)
+        return await crud.project.get_multi(
+            db, skip=skip, limit=limit, cursor=cursor
+        )
 
     @staticmethod
     async def get_by_team(
-        db: AsyncSession, team_id: UUID, skip: int = 0, limit: int = 100
+        db: AsyncSession,
+        team_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[dict] = None,
     ) -> List[model.Project]:
         return await crud.project.get_multi_by_owner(
-            db, owner_id=team_id, skip=skip, limit=limit, owner_field="team_id"
+            db,
+            owner_id=team_id,
+            skip=skip,
+            limit=limit,
+            owner_field="team_id",
+            cursor=cursor,
         )
 
     @staticmethod
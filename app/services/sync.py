@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, model
+from app.connectionManager import team_topic, user_topic
+from app.lib.database import AsyncSessionLocal
+from app.oauth2 import Principal
+from app.pagination import SyncPosition, encode_sync_cursor
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Late-committing transactions ke rows miss na hon - cursor itna peeche rakho
+SYNC_SAFETY_WINDOW = timedelta(seconds=float(os.getenv("SYNC_SAFETY_WINDOW", "5")))
+SYNC_TOMBSTONE_RETENTION = timedelta(
+    days=int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+)
+SYNC_PRUNE_INTERVAL = int(os.getenv("SYNC_PRUNE_INTERVAL", "3600"))  # seconds
+
+
+def _changed_at(row) -> datetime:
+    return row.deleted_at if isinstance(row, model.SyncTombstone) else row.updated_at
+
+
+def _position(row) -> SyncPosition:
+    return _changed_at(row), row.id
+
+
+class SyncService:
+    @staticmethod
+    async def get_changes(
+        db: AsyncSession,
+        *,
+        since: Optional[datetime],
+        limit: int,
+        current_user: Principal,
+        after: Optional[Dict[str, SyncPosition]] = None,
+    ) -> dict:
+        """
+        Issues/comments/activities/notifications + tombstones changed since cursor.
+        has_more paging: har entity apni (changed_at, id) position se aage
+        (keyset) - ek hi timestamp wale limit se zyada rows pe bhi loop nahi.
+        Paging khatam hone pe cursor wapas `since` (inclusive, safety window)
+        pe aata hai, isliye boundary rows dobara aa sakte hain.
+        Response shape: schemas.SyncOut
+        """
+        now = datetime.utcnow()
+        if since is not None and since < now - SYNC_TOMBSTONE_RETENTION:
+            # Deletes ka record ab nahi hai - partial sync galat store chhod dega
+            return {"resync_required": True}
+
+        since_ts = since or datetime.min
+        after = after or {}
+        is_admin = current_user.role == model.UserRole.ADMIN
+        # Admin ke liye None = no visibility filter
+        user_id = None if is_admin else current_user.id
+        topics = None
+        if not is_admin:
+            topics = [user_topic(current_user.id)]
+            if current_user.team_id:
+                topics.append(team_topic(current_user.team_id))
+
+        # limit + 1: overflow se pata chalta hai ki aur rows baaki hain
+        fetch = dict(
+            since=since_ts,
+            limit=limit + 1,
+            user_id=user_id,
+            team_id=current_user.team_id,
+        )
+        changes = {
+            "issues": await crud.sync.get_issues(
+                db, after=after.get("issues"), **fetch
+            ),
+            "comments": await crud.sync.get_comments(
+                db, after=after.get("comments"), **fetch
+            ),
+            "activities": await crud.sync.get_activities(
+                db, after=after.get("activities"), **fetch
+            ),
+            "notifications": await crud.sync.get_notifications(
+                db,
+                since=since_ts,
+                after=after.get("notifications"),
+                limit=limit + 1,
+                user_id=current_user.id,
+            ),
+            "deleted": await crud.sync.get_tombstones(
+                db,
+                since=since_ts,
+                after=after.get("deleted"),
+                limit=limit + 1,
+                topics=topics,
+            ),
+        }
+
+        has_more = any(len(rows) > limit for rows in changes.values())
+        if has_more:
+            # Har entity apne last bheje row ke baad se continue kare; jisne
+            # abhi tak kuch nahi bheja wo `since` se hi padhe
+            changes = {name: rows[:limit] for name, rows in changes.items()}
+            positions = {
+                name: _position(rows[-1]) if rows else after.get(name)
+                for name, rows in changes.items()
+            }
+            next_cursor = encode_sync_cursor(
+                since,
+                {name: pos for name, pos in positions.items() if pos is not None},
+            )
+        else:
+            next_cursor = encode_sync_cursor(
+                max(since_ts, now - SYNC_SAFETY_WINDOW)
+            )
+
+        return {
+            **changes,
+            "deleted": [
+                {
+                    "entity_type": tombstone.entity_type,
+                    "id": tombstone.entity_id,
+                    "deleted_at": tombstone.deleted_at,
+                }
+                for tombstone in changes["deleted"]
+            ],
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
+
+    @staticmethod
+    async def prune_tombstones_loop() -> None:
+        """Background loop (startup pe): retention se purane tombstones delete karo"""
+        while True:
+            await asyncio.sleep(SYNC_PRUNE_INTERVAL)
+            try:
+                async with AsyncSessionLocal() as db:
+                    deleted = await crud.sync.prune_tombstones(
+                        db, before=datetime.utcnow() - SYNC_TOMBSTONE_RETENTION
+                    )
+                if deleted:
+                    logger.info(f"Pruned {deleted} sync tombstones")
+            except Exception as e:
+                logger.error(f"Sync tombstone prune failed: {e}")
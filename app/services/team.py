@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
@@ -11,9 +11,12 @@ from app.schemas.team import TeamCreate, TeamCreate as TeamUpdate
 class TeamService:
     @staticmethod
     async def get_all(
-        db: AsyncSession, skip: int = 0, limit: int = 100
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[dict] = None,
     ) -> List[model.Team]:
-        return await crud.team.get_multi(db, skip=skip, limit=limit)
+        return await crud.team.get_multi(db, skip=skip, limit=limit, cursor=cursor)
 
     @staticmethod
     async def get(db: AsyncSession, id: UUID) -> model.Team:
@@ -3,6 +3,7 @@ from uuid import UUID
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, model, utils
+from app.lib.cache import user_cache, token_version_cache
 from app.schemas.user import UserCreate
 
 
@@ -30,7 +31,6 @@ class UserService:
         # Save to DB
         db.add(new_user)
         await db.commit()
-        await db.refresh(new_user)
 
         return new_user
 
@@ -60,10 +60,13 @@ class UserService:
         # Update
         user.role = role
         user.team_id = team_id
+        # Purane tokens ke role/team claims ab stale hain - revoke karo
+        user.token_version = (user.token_version or 0) + 1
 
         db.add(user)
         await db.commit()
-        await db.refresh(user)
+        await user_cache.invalidate(user.email)
+        await token_version_cache.invalidate(str(user.id))
         return user
 
     # api for update user avatar
@@ -78,14 +81,17 @@ class UserService:
         user.avatar_url = avatar
         db.add(user)
         await db.commit()
-        await db.refresh(user)
+        await user_cache.invalidate(user.email)
         return user
 
     @staticmethod
     async def get_all(
-        db: AsyncSession, skip: int = 0, limit: int = 100
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[dict] = None,
     ) -> list[model.User]:
-        return await crud.user.get_multi(db, skip=skip, limit=limit)
+        return await crud.user.get_multi(db, skip=skip, limit=limit, cursor=cursor)
 
     @staticmethod
     async def delete(db: AsyncSession, user_id: UUID) -> None:
@@ -95,3 +101,5 @@ class UserService:
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
         await crud.user.remove(db, id=user_id)
+        await user_cache.invalidate(user.email)
+        await token_version_cache.invalidate(str(user.id))
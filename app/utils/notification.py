@@ -1,7 +1,68 @@
+from typing import List, Set
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from app.lib.cache import unread_count_cache
 from app.model.notification import Notification
 
+
+async def invalidate_unread_count(user_id: UUID) -> None:
+    """Cached unread count hatao (saare workers) - agla read recount karega"""
+    await unread_count_cache.invalidate(str(user_id))
+
+
+class NotificationBatch:
+    """
+    Per-request notification buffer.
+
+    add() sirf memory mein collect karta hai; flush() saare recipients ke liye
+    ek multi-row INSERT karta hai caller ke transaction mein. Commit caller
+    karta hai, isliye issue/comment change aur notifications saath commit hote hain.
+    """
+
+    def __init__(self):
+        self._rows: List[dict] = []
+        self._recipients: Set[UUID] = set()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(
+        self,
+        *,
+        user_id: UUID,
+        title: str,
+        message: str,
+        type: str,
+        issue_id: UUID = None,
+    ) -> None:
+        self._rows.append(
+            {
+                "user_id": user_id,
+                "title": title,
+                "message": message,
+                "type": type,
+                "issue_id": issue_id,
+            }
+        )
+
+    async def flush(self, db: AsyncSession) -> int:
+        """One INSERT ... VALUES (...), (...) for everything added so far"""
+        if not self._rows:
+            return 0
+        rows, self._rows = self._rows, []
+        # Python-side defaults (id, created_at, read) har row ke liye apply hote hain
+        await db.execute(insert(Notification).values(rows))
+        self._recipients.update(row["user_id"] for row in rows)
+        return len(rows)
+
+    async def invalidate_unread_counts(self) -> None:
+        """Commit ke BAAD call karo - warna recount purani value cache kar sakta hai"""
+        recipients, self._recipients = self._recipients, set()
+        for user_id in recipients:
+            await invalidate_unread_count(user_id)
+
+
 async def create_notification(
     db: AsyncSession,
     user_id: UUID,
@@ -11,8 +72,10 @@ async def create_notification(
     issue_id: UUID = None
 ) -> Notification:
     """
-    Utility function to create an in-app notification.
-    
+    Utility function to create a single in-app notification.
+    Caller ke transaction mein flush hota hai - commit caller karega.
+    Multiple recipients ke liye NotificationBatch use karo.
+
     Args:
         db: Database session
         user_id: The ID of the user receiving the notification
@@ -20,7 +83,7 @@ async def create_notification(
         message: Notification descriptive message
         type: Type of notification (issue_assigned, issue_status_changed, comment_created)
         issue_id: (Optional) The related issue ID
-        
+
     Returns:
         The created Notification object
     """
@@ -32,6 +95,6 @@ async def create_notification(
         issue_id=issue_id
     )
     db.add(notification)
-    await db.commit()
-    await db.refresh(notification)
+    await db.flush()
+    await invalidate_unread_count(user_id)
     return notification
@@ -0,0 +1,42 @@
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.model.outbox import OutboxEvent
+
+
+def add_outbox_event(
+    db: AsyncSession,
+    event_type: str,
+    *,
+    topics: List[str],
+    data: dict,
+    actor: Optional[str] = None,
+    emails: Optional[List[dict]] = None,
+) -> None:
+    """
+    Queue side effects for a domain change (transactional outbox).
+
+    Sirf session mein add hota hai - caller ke commit ke saath hi save hota hai.
+    OutboxDispatcher commit ke baad WebSocket publish aur emails karta hai.
+
+    Args:
+        db: Database session
+        event_type: issue.created, issue.updated, issue.bulk_updated,
+            issue.deleted, comment.created
+        topics: WebSocket topics (topics_for_issue)
+        data: WebSocket event body (JSON-safe: UUIDs as str)
+        actor: Email/name of the user who made the change
+        emails: [{"user_id": str, "action": "Assigned"}] - email recipients
+    """
+    db.add(
+        OutboxEvent(
+            event_type=event_type,
+            payload={
+                "topics": topics,
+                "data": data,
+                "actor": actor,
+                "emails": emails or [],
+            },
+        )
+    )
@@ -0,0 +1,24 @@
+from typing import List
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.model.tombstone import SyncTombstone
+
+
+def add_tombstone(
+    db: AsyncSession, entity_type: str, entity_id: UUID, topics: List[str]
+) -> None:
+    """
+    Record a deletion for delta sync clients.
+
+    Sirf session mein add hota hai - delete ke saath same transaction mein
+    commit hota hai, taaki row gayi aur tombstone nahi bana aisa na ho.
+
+    Args:
+        db: Database session
+        entity_type: issue, comment or notification
+        entity_id: ID of the deleted row
+        topics: Visibility topics (team:/project:/user:) of the deleted row
+    """
+    db.add(SyncTombstone(entity_type=entity_type, entity_id=entity_id, topics=topics))
@@ -38,4 +38,8 @@ celery_app.conf.beat_schedule = {
         "task": "cleanup_logs",
         "schedule": crontab(hour=2, minute=0),  # Every day at 2 AM
     },
+    "cleanup-old-notifications": {
+        "task": "cleanup_notifications",
+        "schedule": crontab(hour=2, minute=30),  # Every day at 2:30 AM
+    },
 }
@@ -5,10 +5,23 @@ from fastapi_mail import FastMail, MessageSchema, MessageType
 from app.utils.email import conf
 import logging
 import asyncio
-from datetime import datetime
+import os
+from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Notification retention (cleanup_notifications task)
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+# delete = seedha hatao, archive = notifications_archive mein move karo
+NOTIFICATION_RETENTION_MODE = os.getenv("NOTIFICATION_RETENTION_MODE", "delete")
+NOTIFICATION_RETENTION_BATCH_SIZE = int(
+    os.getenv("NOTIFICATION_RETENTION_BATCH_SIZE", "1000")
+)
+# Ek run mein max itne batches - baaki agli raat (lock/WAL burst bounded rehta hai)
+NOTIFICATION_RETENTION_MAX_BATCHES = int(
+    os.getenv("NOTIFICATION_RETENTION_MAX_BATCHES", "100")
+)
+
 
 # ============================================================================
 # HELPER FUNCTIONS - Complexity 1 each
@@ -194,3 +207,58 @@ def cleanup_logs():
     # Example: Delete logs older than 30 days
 
     return {"status": "completed", "timestamp": str(datetime.now())}
+
+
+async def _purge_read_notifications(before: datetime, archive: bool) -> int:
+    """
+    Batch-by-batch purge, har batch apna transaction.
+    Celery har task pe naya event loop banata hai, isliye web app ka pooled
+    engine nahi - NullPool engine jo task ke end pe dispose hota hai.
+    """
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import NullPool
+
+    from app import crud
+    from app.lib.database import DATABASE_URL
+
+    engine = create_async_engine(DATABASE_URL, poolclass=NullPool)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    removed = 0
+    try:
+        async with session_factory() as db:
+            for _ in range(NOTIFICATION_RETENTION_MAX_BATCHES):
+                count = await crud.notification.purge_read_batch(
+                    db,
+                    before=before,
+                    batch_size=NOTIFICATION_RETENTION_BATCH_SIZE,
+                    archive=archive,
+                )
+                removed += count
+                if count < NOTIFICATION_RETENTION_BATCH_SIZE:
+                    break
+    finally:
+        await engine.dispose()
+    return removed
+
+
+@celery_app.task(name="cleanup_notifications")
+def cleanup_notifications():
+    """
+    Scheduled task: Delete/archive read notifications older than retention window
+    Runs via Celery Beat at 2:30 AM daily
+    Complexity: 1 (linear flow)
+    """
+    archive = NOTIFICATION_RETENTION_MODE == "archive"
+    before = datetime.utcnow() - timedelta(days=NOTIFICATION_RETENTION_DAYS)
+    logger.info(f"🧹 Cleaning up read notifications older than {before}...")
+
+    removed = _run_async_in_sync(_purge_read_notifications(before, archive))
+    logger.info(f"✅ {'Archived' if archive else 'Deleted'} {removed} notifications")
+
+    return {
+        "status": "completed",
+        "mode": "archive" if archive else "delete",
+        "removed": removed,
+        "timestamp": str(datetime.now()),
+    }
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import sys
+import os
+import uuid
+from sqlalchemy import text
+
+# Add the parent directory to sys.path to resolve 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.lib.database import AsyncSessionLocal
+
+# Canonical query shapes (crud/*.py ke listings) - naya listing aaye toh yahan add karo.
+# :params sample values se bharte hain (table khaali ho toh random UUID).
+QUERIES = {
+    "issues by team (keyset)": (
+        "SELECT * FROM issues WHERE team_id = :team_id "
+        "ORDER BY created_at DESC, id DESC LIMIT 100"
+    ),
+    "issues by project (keyset)": (
+        "SELECT * FROM issues WHERE project_id = :project_id "
+        "ORDER BY created_at DESC, id DESC LIMIT 100"
+    ),
+    "issues by assignee (keyset)": (
+        "SELECT * FROM issues WHERE assignee_id = :user_id "
+        "ORDER BY created_at DESC, id DESC LIMIT 100"
+    ),
+    "issues by creator (keyset)": (
+        "SELECT * FROM issues WHERE creator_id = :user_id "
+        "ORDER BY created_at DESC, id DESC LIMIT 100"
+    ),
+    "issues visible to user (get_issues_for_user)": (
+        "SELECT * FROM issues "
+        "WHERE creator_id = :user_id OR assignee_id = :user_id OR team_id = :team_id "
+        "ORDER BY created_at DESC, id DESC LIMIT 100"
+    ),
+    "issues by cycle": "SELECT * FROM issues WHERE cycle_id = :cycle_id",
+    "sub-issues by parent": "SELECT * FROM issues WHERE parent_id = :issue_id",
+    "comments by issue": (
+        "SELECT * FROM comments WHERE issue_id = :issue_id ORDER BY created_at DESC"
+    ),
+    "activities by issue": (
+        "SELECT * FROM activities WHERE issue_id = :issue_id ORDER BY created_at"
+    ),
+    "attachments by issue": "SELECT * FROM attachments WHERE issue_id = :issue_id",
+    "notifications by user": (
+        "SELECT * FROM notifications WHERE user_id = :user_id "
+        "ORDER BY created_at DESC LIMIT 100"
+    ),
+    "unread notification count": (
+        "SELECT count(*) FROM notifications WHERE user_id = :user_id AND read = false"
+    ),
+}
+
+SAMPLES = {
+    "team_id": "SELECT team_id FROM issues WHERE team_id IS NOT NULL LIMIT 1",
+    "project_id": "SELECT project_id FROM issues WHERE project_id IS NOT NULL LIMIT 1",
+    "user_id": "SELECT creator_id FROM issues WHERE creator_id IS NOT NULL LIMIT 1",
+    "cycle_id": "SELECT cycle_id FROM issues WHERE cycle_id IS NOT NULL LIMIT 1",
+    "issue_id": "SELECT id FROM issues LIMIT 1",
+}
+
+
+def _seq_scans(plan: dict) -> list:
+    """Plan tree mein saare Seq Scan nodes ke relation names"""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+async def _explain(session, sql: str, params: dict) -> dict:
+    result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def index_advisor() -> int:
+    """
+    Har canonical query ka EXPLAIN do baar:
+    1. normal - planner abhi kya chun raha hai (chhoti tables pe Seq Scan theek hai)
+    2. enable_seqscan = off - phir bhi Seq Scan hai matlab koi usable index hi nahi
+    Case 2 wale queries MISSING INDEX report hote hain (exit code 1, CI ke liye).
+    """
+    missing = 0
+    async with AsyncSessionLocal() as session:
+        params = {}
+        for name, sql in SAMPLES.items():
+            value = (await session.execute(text(sql))).scalar()
+            params[name] = value or uuid.uuid4()
+
+        for label, sql in QUERIES.items():
+            plan = await _explain(session, sql, params)
+            await session.execute(text("SET LOCAL enable_seqscan = off"))
+            forced = await _explain(session, sql, params)
+            await session.execute(text("RESET enable_seqscan"))
+
+            if _seq_scans(forced):
+                missing += 1
+                tables = ", ".join(sorted(set(_seq_scans(forced))))
+                print(f"❌ MISSING INDEX  {label}  (seq scan on: {tables})")
+            elif _seq_scans(plan):
+                print(
+                    f"⚠️  seq scan      {label}  (index exists, planner prefers "
+                    f"seq scan - table chhoti hai ya stats purane, ANALYZE karo)"
+                )
+            else:
+                print(f"✅ index         {label}  ({plan.get('Node Type')})")
+        await session.rollback()
+
+    print(f"\n{len(QUERIES)} queries checked, {missing} without a usable index.")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(index_advisor()))
@@ -0,0 +1,29 @@
+import asyncio
+import sys
+import os
+
+# Add the parent directory to sys.path to resolve 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.lib.database import AsyncSessionLocal
+from app import crud
+
+
+async def rebuild_issue_stats():
+    """
+    Dashboard counters (issue_stats) issues table se dobara banao.
+    Deploy ke baad ya counters drift hone pe chalao - app band karne ki zarurat nahi.
+    """
+    async with AsyncSessionLocal() as session:
+        print("Rebuilding issue_stats from issues table...")
+        rows = await crud.issue_stats.rebuild(session)
+        print(f"Done! {rows} counter rows written.")
+
+        stats = await crud.issue_stats.get(session)
+        print(f"Total issues: {stats['total_count']}")
+        print(f"By status:    {stats['status_counts']}")
+        print(f"By priority:  {stats['priority_counts']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_issue_stats())
@@ -0,0 +1,21 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_stats_route_is_not_parsed_as_issue_id(client, seed):
+    response = await client.get(
+        "/issues/stats", params={"dimension": "team"}, headers=seed["headers"]
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["team_counts"][str(seed["team_id"])] == len(seed["issue_ids"])
+    assert body["project_counts"] is None
+
+
+async def test_stats_without_dimensions(client, seed):
+    response = await client.get("/issues/stats", headers=seed["headers"])
+
+    assert response.status_code == 200, response.text
+    assert response.json()["team_counts"] is None
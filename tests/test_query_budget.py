@@ -0,0 +1,78 @@
+"""
+Har budgeted endpoint ke SQL statements gino aur QUERY_BUDGETS se compare karo.
+Auth caches warm (steady state), data caches (unread count, dashboard) cold.
+Endpoint ka kaam badla aur count badha toh budget consciously update karo.
+"""
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+# endpoint name -> (method, path, json body); {issue}/{other}/{team} seed se
+CASES = {
+    "create_issue": ("POST", "/issues/", {"title": "Budget", "team_id": "{team}"}),
+    "update_issue": (
+        "PATCH",
+        "/issues/{issue}",
+        {"title": "Renamed", "status": "done"},
+    ),
+    "delete_issue": ("DELETE", "/issues/{issue}", None),
+    "bulk_update_issues": (
+        "PATCH",
+        "/issues/bulk",
+        {"ids": ["{issue}", "{other}"], "changes": {"priority": 3}},
+    ),
+    "get_all_issues": ("GET", "/issues/?limit=10", None),
+    "get_issue_by_id": ("GET", "/issues/{issue}", None),
+    "get_issue_stats": ("GET", "/issues/stats", None),
+    "create_comment": ("POST", "/issues/{issue}/comments/", {"content": "Budget"}),
+    "get_notifications": ("GET", "/notifications/?limit=10", None),
+    "get_unread_count": ("GET", "/notifications/unread-count", None),
+}
+
+
+def _fill(value, ids: dict):
+    if isinstance(value, str):
+        return value.format(**ids)
+    if isinstance(value, list):
+        return [_fill(item, ids) for item in value]
+    if isinstance(value, dict):
+        return {key: _fill(item, ids) for key, item in value.items()}
+    return value
+
+
+def test_every_budget_has_a_case():
+    # app imports lazy - DATABASE_URL conftest set karta hai (TEST_DATABASE_URL)
+    from app.lib import query_budget
+
+    assert set(CASES) == set(query_budget.QUERY_BUDGETS)
+
+
+@pytest.mark.parametrize("endpoint_name", sorted(CASES))
+async def test_endpoint_within_query_budget(client, seed, monkeypatch, endpoint_name):
+    from app.lib import query_budget
+    from app.lib.cache import dashboard_cache, unread_count_cache
+
+    monkeypatch.setattr(query_budget, "DB_QUERY_COUNT_HEADER", True)
+    headers = seed["headers"]
+    ids = {
+        "issue": seed["issue_ids"][0],
+        "other": seed["issue_ids"][1],
+        "team": seed["team_id"],
+    }
+    method, path, body = CASES[endpoint_name]
+
+    # Warm-up: user (get_current_user) + token version (principal) caches
+    for warm_path in ("/users/me", "/notifications/?limit=1"):
+        assert (await client.get(warm_path, headers=headers)).status_code == 200
+    unread_count_cache.clear()
+    dashboard_cache.clear()
+
+    response = await client.request(
+        method, _fill(path, ids), json=_fill(body, ids), headers=headers
+    )
+
+    assert response.status_code < 400, response.text
+    count = int(response.headers["X-DB-Queries"])
+    budget = query_budget.QUERY_BUDGETS[endpoint_name]
+    assert count <= budget, f"{endpoint_name}: {count} statements (budget {budget})"